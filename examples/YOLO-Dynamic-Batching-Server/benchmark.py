@@ -0,0 +1,113 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+
+import argparse
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from ultralytics import YOLO
+from ultralytics.engine.server import InferenceServer
+from ultralytics.utils import ASSETS
+
+
+def load_clients(fn, clients: int, requests: int) -> tuple:
+    """Call fn from `clients` concurrent threads `requests` times each and return throughput and latencies."""
+    latencies, lock = [], threading.Lock()
+
+    def client():
+        """Send requests sequentially, recording the latency of each."""
+        for _ in range(requests):
+            t = time.perf_counter()
+            fn()
+            with lock:
+                latencies.append(time.perf_counter() - t)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    t = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return clients * requests / (time.perf_counter() - t), np.array(latencies) * 1e3
+
+
+def run(
+    weights: str = "yolo11n.pt",
+    source: str = str(ASSETS / "bus.jpg"),
+    imgsz: int = 640,
+    device: str = "",
+    clients: int = 16,
+    requests: int = 8,
+    max_batch: int = 16,
+    max_wait: float = 0.005,
+    http: bool = False,
+) -> None:
+    """
+    Compare per-request Model.predict with the dynamic micro-batching InferenceServer under concurrent load.
+
+    Args:
+        weights (str): Model weights path.
+        source (str): Image sent by every request.
+        imgsz (int): Inference image size.
+        device (str): Inference device, i.e. 'cpu' or '0'.
+        clients (int): Number of concurrent client threads.
+        requests (int): Number of sequential requests sent by each client.
+        max_batch (int): Maximum server batch size.
+        max_wait (float): Maximum server wait in seconds for a batch to fill.
+        http (bool): Send server requests through the local HTTP stand-in instead of in-process calls.
+    """
+    model = YOLO(weights)
+    model.predict(source, imgsz=imgsz, device=device, verbose=False)  # warmup
+    rows = [("predict", *load_clients(lambda: model.predict(source, imgsz=imgsz, verbose=False), clients, requests))]
+
+    with InferenceServer(model, max_batch=max_batch, max_wait=max_wait, imgsz=imgsz, device=device) as server:
+        server.predict(source)  # warmup
+        if http:
+            httpd = server.http_server(port=0)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{httpd.server_address[1]}/predict"
+            with open(source, "rb") as f:
+                data = f.read()
+
+            def fn():
+                """Send one image to the HTTP stand-in and read the JSON response."""
+                with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+                    return response.read()
+
+        else:
+
+            def fn():
+                """Send one image to the server in-process."""
+                return server.predict(source)
+
+        rows.append(("server-http" if http else "server", *load_clients(fn, clients, requests)))
+        if http:
+            httpd.shutdown()
+        metrics = server.metrics()
+
+    print(f"{clients} clients x {requests} requests, imgsz={imgsz}")
+    print(f"{'mode':<12}{'img/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, throughput, latency in rows:
+        print(f"{mode:<12}{throughput:>10.1f}{np.percentile(latency, 50):>10.1f}{np.percentile(latency, 95):>10.1f}")
+    print(f"server batch sizes: {metrics['batch_sizes']}, max queue depth: {metrics['max_queue_depth']}")
+
+
+def parse_opt() -> argparse.Namespace:
+    """Parse command line arguments for the serving benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weights", type=str, default="yolo11n.pt", help="model weights path")
+    parser.add_argument("--source", type=str, default=str(ASSETS / "bus.jpg"), help="image sent by every request")
+    parser.add_argument("--imgsz", type=int, default=640, help="inference image size")
+    parser.add_argument("--device", default="", help="cuda device, i.e. 0 or cpu")
+    parser.add_argument("--clients", type=int, default=16, help="number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=8, help="requests per client")
+    parser.add_argument("--max-batch", type=int, default=16, help="maximum server batch size")
+    parser.add_argument("--max-wait", type=float, default=0.005, help="maximum server batch wait in seconds")
+    parser.add_argument("--http", action="store_true", help="benchmark the server through its local HTTP stand-in")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(**vars(parse_opt()))
@@ -162,3 +162,25 @@ def test_predict_sam():
 
     # Reset image
     predictor.reset_image()
+
+
+@pytest.mark.skipif(not CUDA_IS_AVAILABLE, reason="CUDA is not available")
+def test_predict_sam_everything():
+    """Test SAM everything mode with crop layers, prompt batches spanning crops and thresholds dropping every mask."""
+    from ultralytics.models.sam import Predictor as SAMPredictor
+
+    overrides = dict(task="segment", mode="predict", imgsz=1024, model=WEIGHTS_DIR / "mobile_sam.pt", device=0)
+    predictor = SAMPredictor(overrides=overrides)
+    source = ASSETS / "zidane.jpg"
+
+    # Prompts of all 5 crops are decoded in fused batches, the batch size must not change the results
+    result = predictor(source, crop_n_layers=1, points_stride=8, points_batch_size=7)[0]
+    ref = predictor(source, crop_n_layers=1, points_stride=8, points_batch_size=1000)[0]
+    assert len(result.boxes) and result.masks.data.shape[1:] == result.orig_shape
+    assert torch.equal(result.masks.data, ref.masks.data)
+    assert torch.allclose(result.boxes.data, ref.boxes.data, atol=1e-4)
+
+    # Masks are filtered on low-resolution logits, thresholds dropping every mask return an empty result
+    for kwargs in {"conf_thres": 1.0}, {"stability_score_thresh": 1.0}:
+        result = predictor(source, crop_n_layers=1, points_stride=8, **kwargs)[0]
+        assert result.masks is None and len(result.boxes) == 0
@@ -2,6 +2,8 @@
 
 import contextlib
 import csv
+import json
+import shutil
 import urllib
 from copy import copy
 from pathlib import Path
@@ -137,6 +139,120 @@ def test_predict_visualize(model):
     YOLO(WEIGHTS_DIR / model)(SOURCE, imgsz=32, visualize=True)
 
 
+def test_predict_pipeline():
+    """Test that pipelined prediction returns the same results in the same order as sequential prediction."""
+    model = YOLO(MODEL)
+    sources = [ASSETS / "bus.jpg", ASSETS / "zidane.jpg"] * 3
+    results = model(sources, imgsz=160, batch=2)
+    pipelined = model(sources, imgsz=160, batch=2, pipeline=True)
+    assert [r.path for r in pipelined] == [r.path for r in results]
+    for a, b in zip(results, pipelined):
+        assert torch.allclose(a.boxes.data, b.boxes.data)
+        assert set(b.speed) == {"preprocess", "inference", "postprocess"}
+
+
+def test_predict_batch_pre_transform():
+    """Test that fused and on-device batch letterboxing match the per-image pre_transform path."""
+    model = YOLO(MODEL)
+    model(SOURCE, imgsz=160)
+    predictor = model.predictor
+    ims = [cv2.imread(str(SOURCE)), cv2.imread(str(ASSETS / "zidane.jpg")), np.zeros((333, 517, 3), dtype=np.uint8)]
+    for batch in ims, ims[::-1], ims[1:2] * 2:
+        ref = np.stack(predictor.pre_transform(batch))[..., ::-1].transpose(0, 3, 1, 2)
+        assert np.array_equal(predictor.batch_pre_transform(batch).numpy(), ref)
+        assert np.abs(predictor.device_pre_transform(batch).cpu().numpy() * 255 - ref).mean() < 2
+    assert len(model(SOURCE, imgsz=160, device_preprocess=True)) == 1
+
+
+def test_inference_server():
+    """Test that the micro-batching InferenceServer batches concurrent requests and matches per-image predictions."""
+    from ultralytics.engine.server import InferenceServer
+
+    model = YOLO(MODEL)
+    ref = model(SOURCE, imgsz=160)[0]
+    with InferenceServer(model, max_batch=4, max_wait=0.05, imgsz=160) as server:
+        futures = [server.submit(SOURCE) for _ in range(8)]
+        results = [f.result() for f in futures]
+        with pytest.raises(FileNotFoundError):
+            server.predict(TMP / "missing.jpg")
+        metrics = server.metrics()
+    assert all(torch.allclose(r.boxes.data, ref.boxes.data, atol=1e-3) for r in results)
+    assert metrics["requests"] == 8 and max(metrics["batch_sizes"]) <= 4 and metrics["batches"] < 8
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_video_prefetch_parallel():
+    """Test threaded video decoding with seek-based striding and parallel decoding of several videos into a batch."""
+    directory = TMP / "videos"
+    directory.mkdir(parents=True, exist_ok=True)
+    for i, (n, fps) in enumerate(((40, 30), (25, 15))):
+        writer = cv2.VideoWriter(str(directory / f"video{i}.mp4"), cv2.VideoWriter_fourcc(*"mp4v"), fps, (64, 48))
+        for _ in range(n):
+            writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+        writer.release()
+
+    def frames(**kwargs):
+        """Return the info strings of all frames loaded from the videos."""
+        return [s for batch in load_inference_source(str(directory), **kwargs) for s in batch[2]]
+
+    sequential = frames(batch=2, vid_stride=4)
+    assert sequential == frames(batch=1, vid_stride=4)  # prefetched frames keep their order
+    assert sorted(frames(batch=2, vid_stride=4, vid_parallel=True)) == sorted(sequential)
+    assert len(frames(vid_stride=20)) == 3  # seek over skipped frames
+    model = YOLO(MODEL)
+    assert len(model.track(directory, imgsz=32, batch=2, vid_parallel=True, save=True)) == 65
+    saved = [cv2.VideoCapture(str(model.predictor.save_dir / f"video{i}.avi")) for i in range(2)]
+    assert [round(cap.get(cv2.CAP_PROP_FPS)) for cap in saved] == [30, 15]  # frame rate of each source video
+
+
+@pytest.mark.skipif(not IS_TMP_WRITEABLE, reason="directory is not writeable")
+def test_stream_scheduler():
+    """Test LoadStreams scheduler subset batching, bounded queue drops, 'skip' waiting and per-stream counters."""
+    import time
+    from types import SimpleNamespace
+
+    from ultralytics.data.loaders import LoadStreams
+
+    directory = TMP / "streams"
+    videos = [directory / "a_b" / "v.mp4", directory / "a" / "b_v.mp4"]  # identical clean source names
+    for f, n in zip(videos, (40, 5)):
+        f.parent.mkdir(parents=True, exist_ok=True)
+        writer = cv2.VideoWriter(str(f), cv2.VideoWriter_fourcc(*"mp4v"), 30, (64, 48))
+        for _ in range(n):
+            writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+        writer.release()
+    streams = directory / "videos.streams"
+    streams.write_text("\n".join(map(str, videos)))
+
+    # 'queue' keeps up to 30 frames per stream, batches hold only the streams with a frame once the short one ends
+    loader = LoadStreams(str(streams), policy="queue")
+    for t in loader.threads:
+        t.join()
+    assert loader.sources[0] == loader.sources[1]
+    assert [len(x) for x in loader.imgs] == [30, 5] and loader.dropped == [10, 0]
+    assert [loader.batch_streams for _ in loader] == [[0, 1]] * 5 + [[0]] * 25
+    stats = loader.stream_stats()
+    assert [x["missed"] for x in stats] == [0, 25] and stats[0]["lag"] > 0 and not stats[0]["alive"]
+
+    # 'skip' stops waiting for a live stream that missed the previous batch, 'latest' keeps waiting for it
+    for policy in "skip", "latest":
+        loader = LoadStreams(str(streams), policy=policy, deadline=0.2)
+        threads = loader.threads
+        for t in threads:
+            t.join()
+        assert loader.dropped == [39, 4]  # only the newest frame of each stream is kept
+        loader.threads = [threads[0], SimpleNamespace(is_alive=lambda: True)]  # stream 1 stalls
+        loader.imgs[1].clear()
+        iter(loader)
+        assert next(loader)[0] == [loader.sources[0]] and loader.missed == [0, 1]
+        loader.imgs[0].append((time.perf_counter(), np.zeros((48, 64, 3), dtype=np.uint8)))
+        t = time.perf_counter()
+        next(loader)
+        assert (time.perf_counter() - t < 0.2) == (policy == "skip") and loader.batch_streams == [0]
+        loader.threads = threads
+        loader.close()
+
+
 def test_predict_grey_and_4ch():
     """Test YOLO prediction on SOURCE converted to greyscale and 4-channel images with various filenames."""
     im = Image.open(SOURCE)
@@ -199,11 +315,150 @@ def test_track_stream():
         model.track(video_url, imgsz=160, tracker=tracker)
 
 
+@pytest.mark.parametrize("tracker_type", ["bytetrack", "botsort"])
+def test_array_tracker(tracker_type):
+    """Test that array-backed trackers, tracker groups and gated association match BYTETracker and BOTSORT tracks."""
+    from types import SimpleNamespace
+
+    from ultralytics.trackers.array_tracker import TrackerGroup
+    from ultralytics.trackers.track import ARRAY_TRACKER_MAP, TRACKER_MAP
+    from ultralytics.utils import IterableSimpleNamespace, yaml_load
+
+    cfg = IterableSimpleNamespace(**yaml_load(ROOT / f"cfg/trackers/{tracker_type}.yaml"))
+    rng = np.random.default_rng(0)
+    xywh, v, frames = rng.uniform(20, 400, (40, 4)), rng.normal(0, 3, (40, 4)), []
+    for _ in range(50):  # 40 moving objects, randomly missed or with low confidence
+        xywh += v * [1, 1, 0, 0] + rng.normal(0, 1, (40, 4))
+        i = rng.random(40) > 0.2
+        frames.append(SimpleNamespace(conf=rng.uniform(0.05, 1, i.sum()), xywh=xywh[i], cls=np.zeros(i.sum())))
+    img = np.zeros((64, 64, 3), dtype=np.uint8)
+    outputs = []
+    for tracker in TRACKER_MAP[tracker_type](cfg), ARRAY_TRACKER_MAP[tracker_type](cfg):
+        tracker.reset_id()
+        outputs.append([tracker.update(det, img) for det in frames])
+    group = TrackerGroup([ARRAY_TRACKER_MAP[tracker_type](cfg) for _ in range(3)])  # e.g. 3 camera streams
+    group.trackers[0].reset_id()
+    outputs.append([group.update([det] * 3, [img] * 3)[2] for det in frames])  # batched updates of all streams
+    cfg.gated_association = True  # match overlapping boxes only
+    tracker = ARRAY_TRACKER_MAP[tracker_type](cfg)
+    tracker.reset_id()
+    outputs.append([tracker.update(det, img) for det in frames])
+    for a, b, c, d in zip(*outputs):
+        assert a.shape == b.shape and np.array_equal(a[:, 4:], b[:, 4:]) and np.allclose(a, b, atol=1e-3)
+        assert c.shape == b.shape and np.array_equal(c[:, 5:], b[:, 5:]) and np.allclose(c[:, :4], b[:, :4])
+        assert np.array_equal(d, b)
+
+
+def test_reid_cache():
+    """Test that the ReID encoder embeds detections in one batch and reuses embeddings of unmoved detections."""
+    from ultralytics.trackers.bot_sort import ReID
+
+    encoder = ReID(str(WEIGHTS_DIR / "yolo11n-cls.pt"), cache=True)
+    img = cv2.imread(str(SOURCE))
+    dets = np.array([[400, 500, 200, 450], [150, 600, 120, 400]], dtype=np.float32)
+    feats = encoder(img, dets)
+    assert feats.ndim == 2 and len(feats) == 2
+    moved = dets + [[1, 1, 0, 0], [0, -200, 0, 0]]  # first detection barely moved, second one did
+    cached = encoder(img.copy(), moved)
+    assert np.array_equal(cached[0], feats[0]) and not np.array_equal(cached[1], feats[1])
+
+
+def test_gmc_fast_optflow():
+    """Test that strided 'fastOptFlow' motion compensation recovers a camera pan and reports its time per frame."""
+    from ultralytics.trackers.utils.gmc import GMC
+
+    img = cv2.imread(str(SOURCE))
+    frames = [np.ascontiguousarray(img[100 + 2 * k : 500 + 2 * k, 3 * k : 600 + 3 * k]) for k in range(10)]
+    gmc, total = GMC("fastOptFlow", stride=2), np.eye(3)
+    for frame in frames:
+        total = np.vstack([gmc.apply(frame), [0, 0, 1]]) @ total
+    assert np.allclose(total[:2, 2], [-27, -18], atol=2)  # content moves by (-3, -2) pixels per frame
+    assert set(GMC.benchmark(frames, methods=("sparseOptFlow", "fastOptFlow"))) == {"sparseOptFlow", "fastOptFlow"}
+
+
 def test_val():
     """Test the validation mode of the YOLO model."""
     YOLO(MODEL).val(data="coco8.yaml", imgsz=32)
 
 
+def test_val_stream_ap():
+    """Test that binned, mergeable AP statistics match the exact metrics and run inside validation."""
+    from ultralytics.utils.metrics import APAccumulator, ap_per_class
+
+    rng = np.random.default_rng(0)
+    conf, pred_cls, target_cls = rng.random(5000), rng.integers(0, 5, 5000), rng.integers(0, 5, 1000)
+    tp = rng.random((5000, 1)) < conf[:, None] * np.linspace(1, 0.3, 10)
+    accs = [APAccumulator(nc=5) for _ in range(2)]  # e.g. two worker processes, each with half of the images
+    for acc, i, t in zip(accs, np.array_split(np.arange(5000), 2), np.array_split(target_cls, 2)):
+        acc.update({"tp": tp[i], "conf": conf[i], "pred_cls": pred_cls[i], "target_cls": t, "target_img": t[:0]})
+    ap = ap_per_class(tp, conf, pred_cls, target_cls)[5]
+    assert np.allclose(ap_per_class(**accs[0].merge(accs[1]).stats())[5], ap, atol=1e-2)
+    YOLO(MODEL).val(data="coco8.yaml", imgsz=32, stream_ap=True)
+
+
+def test_coco_evaluator():
+    """Test that the vectorized COCO evaluator reproduces pycocotools bbox and segm metrics on a synthetic dataset."""
+    checks.check_requirements("pycocotools>=2.0.6")
+    from pycocotools import mask as mask_utils
+    from pycocotools.coco import COCO
+    from pycocotools.cocoeval import COCOeval
+
+    from ultralytics.utils.cocoeval import COCOEvaluator
+
+    rng = np.random.default_rng(0)
+    images, anns, preds = [], [], []
+    for i in range(1, 31):
+        images.append({"id": i, "height": 120, "width": 160})
+        n = rng.integers(0, 8)
+        for x, y, w, h in np.concatenate([rng.uniform(0, 60, (n, 2)), rng.uniform(2, 60, (n, 2))], 1):
+            poly = [x, y, x + w, y, x + w / 2, y + h]  # triangles, some small and some crowd regions
+            area = float(mask_utils.area(mask_utils.frPyObjects([poly], 120, 160))[0])
+            c, crowd = int(rng.integers(1, 4)), int(rng.random() < 0.1)
+            anns.append({"id": len(anns) + 1, "image_id": i, "category_id": c, "bbox": [x, y, w, h], "area": area})
+            anns[-1].update(iscrowd=crowd, segmentation=[poly])
+            for b in np.array([x, y, w, h]) + rng.normal(0, 4, (rng.integers(0, 4), 4)):  # noisy detections
+                b = [round(float(v), 3) for v in np.maximum(b, 1)]
+                mask = np.zeros((120, 160), dtype=np.uint8, order="F")
+                mask[int(b[1]) : int(b[1] + b[3]), int(b[0]) : int(b[0] + b[2])] = 1
+                rle = mask_utils.encode(mask)
+                rle["counts"] = rle["counts"].decode()
+                preds.append({"image_id": i, "category_id": c, "bbox": b, "score": round(float(rng.random()), 5)})
+                preds[-1]["segmentation"] = rle
+    file = TMP / "coco_eval.json"
+    file.write_text(json.dumps({"images": images, "annotations": anns, "categories": [{"id": c} for c in (1, 2, 3)]}))
+    for iou_type in "bbox", "segm":
+        results = COCOEvaluator(file, iou_type).evaluate(preds, img_ids=list(range(1, 26)))
+        gt = COCO(str(file))
+        dt = gt.loadRes([{k: v for k, v in p.items() if iou_type == "segm" or k != "segmentation"} for p in preds])
+        coco_eval = COCOeval(gt, dt, iou_type)
+        coco_eval.params.imgIds = list(range(1, 26))
+        coco_eval.evaluate()
+        coco_eval.accumulate()
+        coco_eval.summarize()
+        assert np.array_equal(list(results.values()), coco_eval.stats)
+
+
+def _val_shard(rank, world_size, port, results):
+    """Validate on one rank of a CPU 'gloo' process group, recording the results of every rank."""
+    import torch.distributed as dist
+
+    dist.init_process_group("gloo", init_method=f"tcp://127.0.0.1:{port}", rank=rank, world_size=world_size)
+    results[rank] = YOLO(MODEL).val(data="coco8.yaml", imgsz=32, batch=2, workers=0, plots=False).results_dict
+    dist.destroy_process_group()
+
+
+def test_val_distributed():
+    """Test that validation sharded across distributed ranks reduces to the same metrics as a single process."""
+    import torch.multiprocessing as mp
+
+    from ultralytics.utils.dist import find_free_network_port
+
+    metrics = YOLO(MODEL).val(data="coco8.yaml", imgsz=32, batch=2, workers=0, plots=False).results_dict
+    results = mp.Manager().dict()
+    mp.spawn(_val_shard, args=(2, find_free_network_port(), results), nprocs=2)
+    assert all(np.allclose(list(r.values()), list(metrics.values())) for r in results.values())
+
+
 def test_train_scratch():
     """Test training the YOLO model from scratch using the provided configuration."""
     model = YOLO(CFG)
@@ -339,6 +594,160 @@ def test_data_converter():
     coco80_to_coco91_class()
 
 
+def test_data_cache_mmap():
+    """Test that cache='mmap' returns the same resized images as uncached loading from a shared packed file."""
+    from ultralytics.data.dataset import YOLODataset
+
+    shutil.copytree(ASSETS, TMP / "mmap" / "images", dirs_exist_ok=True)
+    kwargs = dict(img_path=TMP / "mmap" / "images", data={"names": {0: "person"}}, imgsz=320, augment=False)
+    dataset, cached = YOLODataset(cache=False, **kwargs), YOLODataset(cache="mmap", **kwargs)
+    assert cached.mmap_file is not None and cached.mmap_file.exists()
+    for i in range(len(dataset)):
+        im, hw0, hw = dataset.load_image(i)
+        im_mmap, hw0_mmap, hw_mmap = cached.load_image(i)
+        assert hw0 == hw0_mmap and hw == hw_mmap and np.array_equal(im, im_mmap)
+
+
+@pytest.mark.parametrize("cache", [False, "ram", "mmap"])
+def test_data_set_imgsz(cache):
+    """Test that progressive resizing loads cached and uncached images at the new image size."""
+    from ultralytics.data.dataset import YOLODataset
+
+    shutil.copytree(ASSETS, TMP / "set_imgsz" / "images", dirs_exist_ok=True)
+    dataset = YOLODataset(
+        img_path=TMP / "set_imgsz" / "images", data={"names": {0: "person"}}, imgsz=320, cache=cache, hyp=DEFAULT_CFG
+    )
+    for imgsz in 160, 320:
+        dataset.set_imgsz(imgsz)
+        dataset.transforms = dataset.build_transforms(hyp=copy(DEFAULT_CFG))
+        for i in range(len(dataset)):
+            im, _, hw = dataset.load_image(i)
+            assert max(im.shape[:2]) == max(hw) == imgsz
+        assert dataset[0]["img"].shape[1:] == (imgsz, imgsz)
+
+
+def test_trainer_progressive():
+    """Test the progressive resizing schedule and the dataset, batch size and optimizer updates at stage boundaries."""
+    from ultralytics.cfg import get_cfg
+    from ultralytics.data.build import build_dataloader
+    from ultralytics.data.dataset import YOLODataset
+    from ultralytics.models.yolo.detect import DetectionTrainer
+
+    trainer = DetectionTrainer.__new__(DetectionTrainer)  # schedule state only, no model or dataset checks
+    trainer.args = get_cfg(overrides={"imgsz": 640, "progressive": 0.5, "close_mosaic": 2, "workers": 0})
+    trainer.epochs, trainer.stride = 16, 32
+    sizes = [trainer._progressive_imgsz(epoch) for epoch in range(16)]
+    assert sizes == [320] * 2 + [416] * 2 + [480] * 2 + [576] * 2 + [640] * 8  # stages rounded up to the stride
+
+    directory = TMP / "progressive" / "images"
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(8):
+        shutil.copy(ASSETS / "bus.jpg", directory / f"{i}.jpg")
+    dataset = YOLODataset(img_path=directory, data={"names": {0: "person"}}, imgsz=640, hyp=trainer.args)
+    trainer.train_loader = build_dataloader(dataset, 8, 0)
+    decay, no_decay = torch.zeros(1, requires_grad=True), torch.zeros(1, requires_grad=True)
+    trainer.optimizer = torch.optim.SGD([{"params": [decay], "weight_decay": 5e-4}, {"params": [no_decay]}], lr=0.01)
+    trainer.device, trainer.batch_size, trainer.accumulate, trainer.autobatch = torch.device("cpu"), 8, 8, 0.6
+    trainer.auto_batch = lambda: {320: 8, 416: 5}[trainer.train_imgsz]  # batch size fitting in memory
+
+    trainer.epoch = 0
+    trainer._set_train_imgsz(320)  # same batch size, same loader
+    assert dataset.imgsz == 320 and trainer.train_loader.batch_size == 8 and trainer.accumulate == 8
+    assert dataset[0]["img"].shape[1:] == (320, 320)
+    trainer.epoch = 15
+    trainer._set_train_imgsz(416)  # smaller batch, nominal batch size kept by accumulation
+    assert dataset.imgsz == 416 and trainer.train_loader.batch_size == 5 and trainer.accumulate == 13
+    assert [g["weight_decay"] for g in trainer.optimizer.param_groups] == [5e-4 * 5 * 13 / 64, 0.0]
+    assert dataset[0]["img"].shape[1:] == (416, 416)
+    assert dataset.transforms.transforms[0].transforms[0].p == 0  # mosaic stays closed after close_mosaic
+
+
+def test_data_cache_labels_incremental():
+    """Test that the columnar labels.cache only re-verifies label files that changed since it was written."""
+    from ultralytics.data.dataset import YOLODataset
+    from ultralytics.data.utils import load_dataset_cache_arrays
+
+    shutil.copytree(ASSETS, TMP / "labels_cache" / "images", dirs_exist_ok=True)
+    (TMP / "labels_cache" / "labels").mkdir(exist_ok=True)
+    (TMP / "labels_cache" / "labels" / "bus.txt").write_text("0 0.5 0.5 0.2 0.2\n0 0.3 0.3 0.1 0.1\n")
+    kwargs = dict(img_path=TMP / "labels_cache" / "images", data={"names": {0: "person"}}, augment=False)
+    assert [len(lb["cls"]) for lb in YOLODataset(**kwargs).labels] == [2, 0]
+    cache = load_dataset_cache_arrays(TMP / "labels_cache" / "labels.cache")
+    assert cache["offsets"].tolist() == [0, 2, 2] and cache["bboxes"].shape == (2, 4)
+
+    (TMP / "labels_cache" / "labels" / "zidane.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+    dataset = YOLODataset(**kwargs)
+    assert [len(lb["cls"]) for lb in dataset.labels] == [2, 1]
+    assert np.allclose(dataset.labels[0]["bboxes"], [[0.5, 0.5, 0.2, 0.2], [0.3, 0.3, 0.1, 0.1]])
+
+
+def test_data_verify_imap(monkeypatch):
+    """Test that verifying images on a process pool gives the same labels, counts and messages as a thread pool."""
+    from functools import partial
+
+    from ultralytics.data import dataset
+    from ultralytics.data.utils import load_dataset_cache_file, verify_imap
+
+    root = TMP / "verify_imap"
+    shutil.copytree(ASSETS, root / "images", dirs_exist_ok=True)
+    shutil.copytree(ASSETS, root / "classify" / "person", dirs_exist_ok=True)
+    (root / "classify" / "person" / "corrupt.jpg").write_text("not an image")
+    (root / "labels").mkdir(exist_ok=True)
+    (root / "labels" / "bus.txt").write_text("0 0.5 0.5 0.2 0.2\n0 0.5 0.5 0.2 0.2\n")  # duplicate label, no zidane.txt
+    detect = dataset.YOLODataset(img_path=root / "images", data={"names": {0: "person"}}, augment=False)
+    dataset.ClassificationDataset(root / "classify", args=DEFAULT_CFG)
+    threads = detect.cache_labels(root / "threads.cache"), load_dataset_cache_file(root / "classify.cache")
+
+    monkeypatch.setattr(dataset, "verify_imap", partial(verify_imap, threshold=1, workers=2))  # process pool
+    (root / "classify.cache").unlink()
+    dataset.ClassificationDataset(root / "classify", args=DEFAULT_CFG)
+    processes = detect.cache_labels(root / "processes.cache"), load_dataset_cache_file(root / "classify.cache")
+    assert processes[0]["counts"].tolist() == [[0, 1, 0, 0], [1, 0, 0, 0]]  # missing, found, empty, corrupt
+    assert "duplicate labels removed" in bytes(processes[0]["msgs"]).decode()
+    assert all(np.array_equal(v, processes[0][k]) for k, v in threads[0].items())
+    assert processes[1]["results"][:3] == (2, 1, 2) and len(processes[1]["msgs"]) == 1  # found, corrupt, kept
+    assert threads[1]["results"] == processes[1]["results"] and threads[1]["msgs"] == processes[1]["msgs"]
+
+
+def test_data_shards():
+    """Test writing a dataset to compressed shards and streaming it back with shard-level shuffling."""
+    from ultralytics.data.build import ShardSampler, build_yolo_dataset
+    from ultralytics.data.dataset import YOLODataset, YOLOShardDataset
+
+    shutil.copytree(ASSETS, TMP / "shards" / "images", dirs_exist_ok=True)
+    kwargs = dict(data={"names": {0: "person"}}, imgsz=DEFAULT_CFG.imgsz, augment=False)
+    dataset = YOLODataset(img_path=TMP / "shards" / "images", **kwargs)
+    files = dataset.save_shards(TMP / "shards" / "train", shard_size=1)
+    assert len(files) == len(dataset)
+    sharded = build_yolo_dataset(DEFAULT_CFG, TMP / "shards" / "train", 2, kwargs["data"], mode="val")
+    assert isinstance(sharded, YOLOShardDataset) and len(sharded) == len(dataset)
+    sampler = ShardSampler(sharded)
+    assert sorted(sampler) == list(range(len(dataset)))
+    assert list(sampler) == list(sampler)  # the order only changes with set_epoch
+    for i in range(len(dataset)):
+        im, hw0, _ = dataset.load_image(i)
+        j = sharded.im_files.index(dataset.im_files[i])
+        im_shard, hw0_shard, _ = sharded.load_image(j)
+        assert hw0 == hw0_shard and np.array_equal(im, im_shard)
+
+
+def test_data_prefetcher():
+    """Test that BatchPrefetcher yields every batch once, moved to the device and normalized."""
+    from ultralytics.data.build import BatchPrefetcher
+
+    device = torch.device("cpu")  # CPU double-buffering fallback, the CUDA stream path is used on GPU
+    loader = [
+        {"img": torch.randint(0, 256, (2, 3, 8, 8), dtype=torch.uint8), "cls": torch.ones(3, 1)} for _ in range(3)
+    ]
+    expected = [b["img"].float() / 255 for b in loader]
+    prefetcher = BatchPrefetcher(loader, device)
+    batches = list(prefetcher)
+    assert len(batches) == len(prefetcher) == 3
+    for batch, img in zip(batches, expected):
+        assert batch["img"].device == batch["cls"].device == device
+        assert torch.equal(batch["img"].cpu(), img)
+
+
 def test_data_annotator():
     """Test automatic annotation of data using detection and segmentation models."""
     from ultralytics.data.annotator import auto_annotate
@@ -415,6 +824,55 @@ def test_utils_torchutils():
     time_sync()
 
 
+def test_utils_torchutils_checkpoint_writer():
+    """Test that CheckpointWriter snapshots tensors before training continues and writes FP16 checkpoints."""
+    from ultralytics.nn.modules.conv import Conv
+    from ultralytics.utils.patches import torch_load
+    from ultralytics.utils.torch_utils import CheckpointWriter
+
+    m = Conv(8, 8)
+    optimizer = torch.optim.Adam(m.parameters())
+    m(torch.rand(1, 8, 4, 4)).sum().backward()
+    optimizer.step()
+    writer = CheckpointWriter()
+    files = [TMP / "writer_last.pt", TMP / "writer_epoch0.pt"]
+    for epoch in range(2):
+        expected = m.conv.weight.detach().half().clone()
+        writer.save({"epoch": epoch, "ema": m, "optimizer": optimizer.state_dict()}, files)
+        m.conv.weight.data += 1  # modified while the save is in flight
+    writer.wait()
+    for f in files:
+        ckpt = torch_load(f)
+        assert ckpt["epoch"] == 1 and torch.equal(ckpt["ema"].conv.weight, expected)
+        assert all(
+            v.dtype == (torch.float32 if k == "step" else torch.float16)
+            for k, v in ckpt["optimizer"]["state"][0].items()
+        )
+    assert writer.saves == 2 and not list(TMP.glob("writer_*.tmp"))
+
+
+def test_utils_torchutils_ema():
+    """Test that the foreach ModelEMA update matches the per-tensor EMA formula, also when updating every n steps."""
+    from ultralytics.nn.modules.conv import Conv
+    from ultralytics.utils.benchmarks import benchmark_ema
+    from ultralytics.utils.torch_utils import ModelEMA
+
+    m = Conv(8, 8)
+    ema, ema2 = ModelEMA(m), ModelEMA(m, every=2)
+    expected = {k: v.clone() for k, v in m.state_dict().items() if v.is_floating_point()}
+    for i in range(1, 5):
+        for v in m.state_dict().values():
+            v += 0.1 if v.is_floating_point() else 1
+        d = ema.decay(i)
+        for k, v in expected.items():
+            v.mul_(d).add_(m.state_dict()[k], alpha=1 - d)
+        ema.update(m)
+        ema2.update(m)
+    assert all(torch.allclose(v, ema.ema.state_dict()[k]) for k, v in expected.items())
+    assert ema2.updates == 4 and not torch.equal(ema2.ema.conv.weight, ema.ema.conv.weight)
+    benchmark_ema(models=("yolo11n.yaml",), every=(2,), runs=1)
+
+
 def test_utils_ops():
     """Test utility operations for coordinate transformations and normalizations."""
     from ultralytics.utils.ops import (
@@ -444,6 +902,76 @@ def test_utils_ops():
     torch.allclose(boxes, xyxyxyxy2xywhr(xywhr2xyxyxyxy(boxes)), rtol=1e-3)
 
 
+def test_utils_ops_batched_nms():
+    """Test that batched NMS returns the same detections and indices as per-image NMS."""
+    from ultralytics.utils.benchmarks import benchmark_nms
+    from ultralytics.utils.ops import batched_non_max_suppression, non_max_suppression
+
+    preds = torch.rand(4, 84 + 32, 1000)  # boxes, 80 classes and 32 mask coefficients
+    preds[:, :2] *= 640
+    preds[:, 2:4] = preds[:, 2:4] * 100 + 5
+    preds[:, 4:84] **= 40
+    for kwargs in {}, {"multi_label": True}, {"agnostic": True}, {"classes": [0, 5]}, {"max_det": 7, "max_nms": 50}:
+        output, idxs = non_max_suppression(preds.clone(), nc=80, return_idxs=True, **kwargs)
+        batched, batched_idxs = batched_non_max_suppression(preds.clone(), nc=80, return_idxs=True, **kwargs)
+        for a, b, ai, bi in zip(output, batched, idxs, batched_idxs):
+            assert a.shape == b.shape and torch.allclose(a, b)
+            assert torch.equal(ai.long().view(-1), bi)
+    benchmark_nms(batch_sizes=(2,), candidates=(10,), anchors=100, runs=1)
+
+
+def test_utils_tal_sparse_assigner():
+    """Test that the chunked sparse task-aligned assignment matches the dense assignment."""
+    from ultralytics.utils.tal import TaskAlignedAssigner, make_anchors
+
+    anchors, strides = make_anchors([torch.zeros(1, 1, 320 // s, 320 // s) for s in (8, 16, 32)], [8, 16, 32])
+    anchors = anchors * strides
+    xy = anchors[None] + torch.rand(4, len(anchors), 2) * 8 - 4
+    wh = torch.rand(4, len(anchors), 2) * 60 + 4
+    gt_xy, gt_wh = torch.rand(4, 50, 2) * 200 + 60, torch.rand(4, 50, 2) * 80 + 8
+    mask_gt = (torch.arange(50) < torch.tensor([[50], [30], [1], [0]])).float()[..., None]
+    args = (
+        torch.rand(4, len(anchors), 80),
+        torch.cat((xy - wh / 2, xy + wh / 2), -1),
+        anchors,
+        torch.randint(0, 80, (4, 50, 1)).float(),
+        torch.cat((gt_xy - gt_wh / 2, gt_xy + gt_wh / 2), -1) * mask_gt,
+        mask_gt,
+    )
+    assigner = TaskAlignedAssigner(topk=10, num_classes=80, alpha=0.5, beta=6.0)
+    assigner.bs, assigner.n_max_boxes, assigner.chunk_size = 4, 50, len(anchors) * 7  # several chunks
+    dense, sparse = assigner._forward(*args), assigner._forward_sparse(*args)
+    for a, b in zip(dense, sparse):
+        assert a.dtype == b.dtype and torch.allclose(a, b)
+    assert torch.equal(dense[3], sparse[3]) and torch.equal(dense[4], sparse[4])
+
+
+def test_utils_metrics_sparse_mask_iou():
+    """Test that sparse mask IoU on overlap and upsampled ground truth masks matches dense mask IoU."""
+    import torch.nn.functional as F
+
+    from ultralytics.models.yolo.segment.val import SegmentationValidator
+    from ultralytics.utils.metrics import mask_iou, sparse_mask_iou
+
+    nl = 6
+    gt = torch.zeros(1, 20, 24)
+    for i, (y, x) in enumerate(torch.randint(0, 16, (nl, 2)).tolist()):
+        gt[0, y : y + 6, x : x + 8] = i + 1
+    dense = (gt == torch.arange(1, nl + 1).view(-1, 1, 1)).float()
+    pred = (F.interpolate(dense[None], scale_factor=4, mode="bilinear")[0].roll(2, dims=2) > 0.3).float()
+    for overlap, masks in (True, gt), (False, dense):
+        for shape in (20, 24), (80, 96):
+            p = pred if shape == (80, 96) else F.interpolate(pred[None], shape)[0]
+            d = F.interpolate(dense[None], shape, mode="bilinear")[0].gt(0.5).float() if shape == (80, 96) else dense
+            iou = sparse_mask_iou(
+                *SegmentationValidator._mask_pixels(masks, nl, overlap, shape),
+                *p.flatten(1).nonzero(as_tuple=True),
+                nl,
+                nl,
+            )
+            assert torch.equal(iou, mask_iou(d.flatten(1), p.flatten(1)))
+
+
 def test_utils_files():
     """Test file handling utilities including file age, date, and paths with spaces."""
     from ultralytics.utils.files import file_age, file_date, get_latest_run, spaces_in_path
@@ -185,6 +185,7 @@ CFG_FRACTION_KEYS = frozenset(
         "conf",
         "iou",
         "fraction",
+        "progressive",
     }
 )
 CFG_INT_KEYS = frozenset(
@@ -200,6 +201,7 @@ CFG_INT_KEYS = frozenset(
         "line_width",
         "nbs",
         "save_period",
+        "ema_steps",
     }
 )
 CFG_BOOL_KEYS = frozenset(
@@ -237,6 +239,10 @@ CFG_BOOL_KEYS = frozenset(
         "nms",
         "profile",
         "multi_scale",
+        "pipeline",
+        "vid_parallel",
+        "device_preprocess",
+        "stream_ap",
     }
 )
 
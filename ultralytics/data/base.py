@@ -14,7 +14,7 @@ import numpy as np
 import psutil
 from torch.utils.data import Dataset
 
-from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS, check_file_speeds
+from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS, check_file_speeds, get_hash
 from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
 from ultralytics.utils.patches import imread
 
@@ -46,15 +46,20 @@ class BaseDataset(Dataset):
         im_hw0 (list): List of original image dimensions (h, w).
         im_hw (list): List of resized image dimensions (h, w).
         npy_files (List[Path]): List of numpy file paths.
-        cache (str): Cache images to RAM or disk during training.
+        mmap_file (Path | None): Path of the packed memory-mapped image cache when cache='mmap'.
+        cache (str): Cache images to RAM, disk or a shared memory-mapped file during training.
         transforms (callable): Image transformation function.
 
     Methods:
         get_img_files: Read image files from the specified path.
         update_labels: Update labels to include only specified classes.
+        read_image: Read and resize an image from disk.
         load_image: Load an image from the dataset.
+        resize_cached: Resize a cached image to the current image size.
+        set_imgsz: Change the image size images are loaded at.
         cache_images: Cache images to memory or disk.
         cache_images_to_disk: Save an image as an *.npy file for faster loading.
+        cache_images_to_mmap: Pack resized images into a single memory-mapped file shared across processes.
         check_cache_disk: Check image caching requirements vs available disk space.
         check_cache_ram: Check image caching requirements vs available memory.
         set_rectangle: Set the shape of bounding boxes as rectangles.
@@ -86,7 +91,7 @@ class BaseDataset(Dataset):
         Args:
             img_path (str): Path to the folder containing images.
             imgsz (int, optional): Image size for resizing.
-            cache (bool | str, optional): Cache images to RAM or disk during training.
+            cache (bool | str, optional): Cache images to RAM, disk or a shared memory-mapped file during training.
             augment (bool, optional): If True, data augmentation is applied.
             hyp (dict, optional): Hyperparameters to apply data augmentation.
             prefix (str, optional): Prefix to print in log messages.
@@ -121,9 +126,10 @@ class BaseDataset(Dataset):
         self.buffer = []  # buffer size = batch size
         self.max_buffer_length = min((self.ni, self.batch_size * 8, 1000)) if self.augment else 0
 
-        # Cache images (options are cache = True, False, None, "ram", "disk")
+        # Cache images (options are cache = True, False, None, "ram", "disk", "mmap")
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
+        self.mmap_file, self.mmap_index, self._mmap = None, None, None
         self.cache = cache.lower() if isinstance(cache, str) else "ram" if cache is True else None
         if self.cache == "ram" and self.check_cache_ram():
             if hyp.deterministic:
@@ -134,6 +140,8 @@ class BaseDataset(Dataset):
             self.cache_images()
         elif self.cache == "disk" and self.check_cache_disk():
             self.cache_images()
+        elif self.cache == "mmap" and self.check_cache_disk():
+            self.cache_images_to_mmap()
 
         # Transforms
         self.transforms = self.build_transforms(hyp=hyp)
@@ -200,6 +208,44 @@ class BaseDataset(Dataset):
             if self.single_cls:
                 self.labels[i]["cls"][:, 0] = 0
 
+    def read_image(self, i, rect_mode=True):
+        """
+        Read an image from disk (or its *.npy cache) and resize it for dataset index 'i'.
+
+        Args:
+            i (int): Index of the image to read.
+            rect_mode (bool, optional): Whether to use rectangular resizing.
+
+        Returns:
+            (np.ndarray): Resized image as a NumPy array.
+            (Tuple[int, int]): Original image dimensions in (height, width) format.
+
+        Raises:
+            FileNotFoundError: If the image file is not found.
+        """
+        f, fn = self.im_files[i], self.npy_files[i]
+        if fn.exists():  # load npy
+            try:
+                im = np.load(fn)
+            except Exception as e:
+                LOGGER.warning(f"{self.prefix}Removing corrupt *.npy image file {fn} due to: {e}")
+                Path(fn).unlink(missing_ok=True)
+                im = imread(f)  # BGR
+        else:  # read image
+            im = imread(f)  # BGR
+        if im is None:
+            raise FileNotFoundError(f"Image Not Found {f}")
+
+        h0, w0 = im.shape[:2]  # orig hw
+        if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
+            r = self.imgsz / max(h0, w0)  # ratio
+            if r != 1:  # if sizes are not equal
+                w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+                im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
+            im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
+        return im, (h0, w0)
+
     def load_image(self, i, rect_mode=True):
         """
         Load an image from dataset index 'i'.
@@ -216,28 +262,13 @@ class BaseDataset(Dataset):
         Raises:
             FileNotFoundError: If the image file is not found.
         """
-        im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
+        im = self.ims[i]
         if im is None:  # not cached in RAM
-            if fn.exists():  # load npy
-                try:
-                    im = np.load(fn)
-                except Exception as e:
-                    LOGGER.warning(f"{self.prefix}Removing corrupt *.npy image file {fn} due to: {e}")
-                    Path(fn).unlink(missing_ok=True)
-                    im = imread(f)  # BGR
-            else:  # read image
-                im = imread(f)  # BGR
-            if im is None:
-                raise FileNotFoundError(f"Image Not Found {f}")
-
-            h0, w0 = im.shape[:2]  # orig hw
-            if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
-                r = self.imgsz / max(h0, w0)  # ratio
-                if r != 1:  # if sizes are not equal
-                    w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
-                    im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
-            elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
-                im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
+            if self.mmap_file is not None and rect_mode:  # zero-copy view into shared memory-mapped cache
+                offset, shape, (h0, w0) = self.mmap_index[i]
+                im = self.resize_cached(self.mmap[offset : offset + int(np.prod(shape))].reshape(shape))
+            else:
+                im, (h0, w0) = self.read_image(i, rect_mode)
 
             # Add to buffer if training with augmentations
             if self.augment:
@@ -250,8 +281,44 @@ class BaseDataset(Dataset):
 
             return im, (h0, w0), im.shape[:2]
 
+        if rect_mode and max(self.im_hw[i]) != self.imgsz:  # cached in RAM at another imgsz
+            im = self.resize_cached(im)
+            return im, self.im_hw0[i], im.shape[:2]
         return self.ims[i], self.im_hw0[i], self.im_hw[i]
 
+    def resize_cached(self, im):
+        """
+        Resize a cached image to the current imgsz if it was cached at another size, i.e. after `set_imgsz`.
+
+        Args:
+            im (np.ndarray): Cached image resized so that its long side matches the imgsz it was cached at.
+
+        Returns:
+            (np.ndarray): Image with its long side matching imgsz.
+        """
+        h, w = im.shape[:2]
+        r = self.imgsz / max(h, w)
+        if r != 1:
+            w, h = min(math.ceil(w * r), self.imgsz), min(math.ceil(h * r), self.imgsz)
+            im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        return im
+
+    def set_imgsz(self, imgsz):
+        """
+        Change the image size images are loaded at, i.e. for progressive resizing during training.
+
+        Images buffered at the previous size are dropped, images cached in RAM or in the memory-mapped cache are
+        resized when loaded. Transforms depending on the image size must be rebuilt afterwards with `build_transforms`.
+
+        Args:
+            imgsz (int): New image size.
+        """
+        self.imgsz = imgsz
+        if self.cache != "ram":  # the RAM cache keeps its images and buffer for mosaic
+            for j in self.buffer:
+                self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
+            self.buffer.clear()
+
     def cache_images(self):
         """Cache images to memory or disk for faster training."""
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
@@ -274,6 +341,67 @@ class BaseDataset(Dataset):
         if not f.exists():
             np.save(f.as_posix(), imread(self.im_files[i]), allow_pickle=False)
 
+    def cache_images_to_mmap(self):
+        """
+        Cache resized images into a single packed uint8 file that is memory-mapped by every process.
+
+        Images are decoded and resized once, written back-to-back into '<images_dir>.<imgsz>.mmap' and indexed by a
+        '*.mmap.npz' file holding per-image byte offsets, shapes and original sizes. DataLoader workers and DDP ranks on
+        the same node then read zero-copy views of the file through the shared OS page cache instead of each holding a
+        private copy of the images in RAM.
+        """
+        f = Path(self.im_files[0]).parent.with_suffix(f".{self.imgsz}.mmap")  # packed images file
+        index_file = f.with_suffix(".mmap.npz")  # offsets, shapes and original sizes
+        files = sorted(self.im_files)
+        h = get_hash(files + [str(self.imgsz)])
+        try:
+            x = dict(np.load(index_file))
+            assert str(x["hash"]) == h and f.stat().st_size == int(x["offsets"][-1])  # identical hash and complete file
+            LOGGER.info(f"{self.prefix}Loading images from memory-mapped cache {f}")
+        except Exception:
+            if not os.access(f.parent, os.W_OK):
+                self.cache = None
+                LOGGER.warning(f"{self.prefix}Skipping caching images to mmap, directory {f.parent} not writeable")
+                return
+            x = {"hash": np.array(h), "offsets": np.zeros(len(files) + 1, dtype=np.int64)}
+            x["shapes"], x["hw0"] = np.zeros((len(files), 3), dtype=np.int64), np.zeros((len(files), 2), dtype=np.int64)
+            pos = {p: i for i, p in enumerate(self.im_files)}
+            b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
+            tmp = f.with_suffix(f".{os.getpid()}.tmp")  # atomic write in case several ranks build concurrently
+            with ThreadPool(NUM_THREADS) as pool, open(tmp, "wb") as fp:
+                results = pool.imap(lambda p: self.read_image(pos[p]), files)
+                pbar = TQDM(enumerate(results), total=len(files), disable=LOCAL_RANK > 0)
+                for i, (im, hw0) in pbar:
+                    im = np.ascontiguousarray(im.reshape(*im.shape[:2], -1), dtype=np.uint8)
+                    im.tofile(fp)
+                    b += im.nbytes
+                    x["offsets"][i + 1], x["shapes"][i], x["hw0"][i] = b, im.shape, hw0
+                    pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB mmap)"
+                pbar.close()
+            os.replace(tmp, f)
+            tmp = index_file.with_suffix(f".{os.getpid()}.npz")
+            np.savez(tmp, **x)
+            os.replace(tmp, index_file)
+            LOGGER.info(f"{self.prefix}New mmap cache created: {f}")
+
+        j = {p: i for i, p in enumerate(files)}
+        offsets, shapes, hw0 = x["offsets"].tolist(), x["shapes"].tolist(), x["hw0"].tolist()
+        self.mmap_index = [(offsets[j[p]], tuple(shapes[j[p]]), tuple(hw0[j[p]])) for p in self.im_files]
+        self.mmap_file = f
+
+    @property
+    def mmap(self):
+        """Lazily open the memory-mapped image cache, so each process maps the shared file only once."""
+        if self._mmap is None:
+            self._mmap = np.memmap(self.mmap_file, dtype=np.uint8, mode="c")  # copy-on-write protects the cache
+        return self._mmap
+
+    def __getstate__(self):
+        """Drop the open memory map when pickling for spawned workers, which re-open the file lazily."""
+        state = self.__dict__.copy()
+        state["_mmap"] = None
+        return state
+
     def check_cache_disk(self, safety_margin=0.5):
         """
         Check if there's enough disk space for caching images.
@@ -293,7 +421,7 @@ class BaseDataset(Dataset):
             im = imread(im_file)
             if im is None:
                 continue
-            b += im.nbytes
+            b += im.nbytes * (min(self.imgsz / max(im.shape[:2]), 1) ** 2 if self.cache == "mmap" else 1)  # resized
             if not os.access(Path(im_file).parent, os.W_OK):
                 self.cache = None
                 LOGGER.warning(f"{self.prefix}Skipping caching images to disk, directory not writeable")
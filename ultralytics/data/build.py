@@ -1,15 +1,18 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import math
 import os
 import random
+from collections import defaultdict
 from pathlib import Path
 
 import numpy as np
 import torch
+import torch.distributed as dist
 from PIL import Image
 from torch.utils.data import dataloader, distributed
 
-from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset
+from ultralytics.data.dataset import GroundingDataset, YOLODataset, YOLOMultiModalDataset, YOLOShardDataset
 from ultralytics.data.loaders import (
     LOADERS,
     LoadImagesAndVideos,
@@ -96,6 +99,159 @@ class _RepeatSampler:
             yield from iter(self.sampler)
 
 
+class ShardSampler(torch.utils.data.Sampler):
+    """
+    Sampler that reads YOLOShardDataset shards sequentially with shard-level shuffling.
+
+    Every epoch the order of the shards is shuffled and the images within each shard are shuffled, but all images of
+    a shard are visited together so each shard is streamed from storage once per epoch. In distributed training each
+    rank receives a contiguous, equally sized slice of the shuffled order, i.e. a disjoint subset of the shards.
+
+    Attributes:
+        shards (List[List[int]]): Dataset indices grouped by shard.
+        shuffle (bool): Whether to shuffle shards and the images within them.
+        seed (int): Base random seed shared by all ranks.
+        epoch (int): Current epoch, set by `set_epoch` so each epoch uses a new order.
+        rank (int): Process rank in distributed training.
+        world_size (int): Number of processes in distributed training.
+        num_samples (int): Number of samples yielded per rank and epoch.
+    """
+
+    def __init__(self, dataset, shuffle=True, rank=-1, seed=0):
+        """Initialize the ShardSampler from the shard index of a YOLOShardDataset."""
+        shards = defaultdict(list)
+        for i, f in enumerate(dataset.im_files):
+            shards[dataset.shard_index[f][0]].append(i)
+        self.shards = list(shards.values())
+        self.shuffle, self.seed, self.epoch = shuffle, seed, 0
+        self.rank, self.world_size = (rank, dist.get_world_size()) if rank != -1 else (0, 1)
+        self.num_samples = math.ceil(len(dataset) / self.world_size)
+
+    def __iter__(self):
+        """Yield dataset indices shard by shard for the current epoch."""
+        g = torch.Generator()
+        g.manual_seed(self.seed + self.epoch)  # identical order on all ranks
+        indices = []
+        for s in torch.randperm(len(self.shards), generator=g).tolist() if self.shuffle else range(len(self.shards)):
+            shard = self.shards[s]
+            indices += [shard[j] for j in torch.randperm(len(shard), generator=g).tolist()] if self.shuffle else shard
+        indices += indices[: self.num_samples * self.world_size - len(indices)]  # pad to be evenly divisible
+        return iter(indices[self.rank * self.num_samples : (self.rank + 1) * self.num_samples])
+
+    def __len__(self):
+        """Return the number of samples per epoch on this rank."""
+        return self.num_samples
+
+    def set_epoch(self, epoch):
+        """Set the epoch used to seed the shuffle, matching DistributedSampler."""
+        self.epoch = epoch
+
+
+class BatchShardSampler(torch.utils.data.Sampler):
+    """
+    Sampler splitting an unshuffled dataset into whole consecutive batches across distributed ranks for validation.
+
+    Batch i of the dataset goes to rank i % world_size, so batches, and the batch shapes of rectangular validation, are
+    those of single-process validation. No image is padded or repeated, so the statistics of all ranks add up to those
+    of the whole dataset; ranks may therefore receive one batch more than others.
+
+    Attributes:
+        indices (List[int]): Dataset indices of the batches of this rank.
+    """
+
+    def __init__(self, dataset, batch):
+        """Initialize the BatchShardSampler for the rank of the current process."""
+        n, rank, world_size = len(dataset), dist.get_rank(), dist.get_world_size()
+        batches = range(rank, math.ceil(n / batch), world_size)
+        self.indices = [i for b in batches for i in range(b * batch, min(b * batch + batch, n))]
+
+    def __iter__(self):
+        """Yield the dataset indices of the batches of this rank."""
+        return iter(self.indices)
+
+    def __len__(self):
+        """Return the number of samples of this rank."""
+        return len(self.indices)
+
+
+class BatchPrefetcher:
+    """
+    Iterate a dataloader while the next batch is already moved to the training device.
+
+    Batches are moved with `batch_to_device` one step ahead of the training loop. On CUDA the host-to-device copies
+    and the uint8 to float image normalization run on a side stream, so they overlap with the forward and backward
+    pass of the current batch. On other devices the next batch is simply fetched and normalized ahead (double
+    buffering).
+
+    Attributes:
+        loader (Iterable): Dataloader yielding batch dictionaries.
+        device (torch.device): Device the batches are moved to.
+        stream (torch.cuda.Stream | None): Side stream for the copies, None if the device is not CUDA.
+
+    Examples:
+        >>> for batch in BatchPrefetcher(trainer.train_loader, trainer.device):
+        ...     loss, loss_items = model(batch)
+    """
+
+    def __init__(self, loader, device):
+        """Initialize the BatchPrefetcher with a dataloader and the device to move batches to."""
+        self.loader = loader
+        self.device = torch.device(device)
+        self.stream = torch.cuda.Stream(self.device) if self.device.type == "cuda" else None
+
+    def __len__(self):
+        """Return the number of batches of the dataloader."""
+        return len(self.loader)
+
+    def __iter__(self):
+        """Yield device batches while the copy of the following batch is in flight."""
+        iterator = iter(self.loader)
+        batch = self._preload(iterator)
+        while batch is not None:
+            if self.stream is not None:
+                stream = torch.cuda.current_stream(self.device)
+                stream.wait_stream(self.stream)
+                for x in batch.values():
+                    if isinstance(x, torch.Tensor) and x.is_cuda:
+                        x.record_stream(stream)  # memory allocated on the side stream is used on the training stream
+            next_batch = self._preload(iterator)
+            yield batch
+            batch = next_batch
+
+    def _preload(self, iterator):
+        """Fetch the next batch and start moving it to the device, returns None when the iterator is exhausted."""
+        try:
+            batch = next(iterator)
+        except StopIteration:
+            return None
+        if self.stream is None:
+            return batch_to_device(batch, self.device)
+        with torch.cuda.stream(self.stream):
+            return batch_to_device(batch, self.device)
+
+
+def batch_to_device(batch, device):
+    """
+    Move all tensors of a batch to a device and normalize uint8 images to float in range 0-1.
+
+    Tensors already on the device and float images are left untouched, so batches prepared by `BatchPrefetcher` pass
+    through unchanged.
+
+    Args:
+        batch (dict): Batch dictionary as returned by the dataloader.
+        device (torch.device): Target device.
+
+    Returns:
+        (dict): The batch with its tensors on `device`.
+    """
+    for k, v in batch.items():
+        if isinstance(v, torch.Tensor):
+            batch[k] = v.to(device, non_blocking=True)
+    if batch.get("img") is not None and batch["img"].dtype == torch.uint8:
+        batch["img"] = batch["img"].float().div_(255)
+    return batch
+
+
 def seed_worker(worker_id):  # noqa
     """Set dataloader worker seed for reproducibility across worker processes."""
     worker_seed = torch.initial_seed() % 2**32
@@ -106,6 +262,8 @@ def seed_worker(worker_id):  # noqa
 def build_yolo_dataset(cfg, img_path, batch, data, mode="train", rect=False, stride=32, multi_modal=False):
     """Build and return a YOLO dataset based on configuration parameters."""
     dataset = YOLOMultiModalDataset if multi_modal else YOLODataset
+    if not multi_modal and isinstance(img_path, (str, Path)) and any(Path(img_path).glob("shard-*.npz")):
+        dataset = YOLOShardDataset  # pre-decoded shards written by YOLODataset.save_shards()
     return dataset(
         img_path=img_path,
         imgsz=cfg.imgsz,
@@ -146,7 +304,7 @@ def build_grounding(cfg, img_path, json_file, batch, mode="train", rect=False, s
     )
 
 
-def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
+def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1, shard=False):
     """
     Create and return an InfiniteDataLoader or DataLoader for training or validation.
 
@@ -156,6 +314,7 @@ def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
         workers (int): Number of worker threads for loading data.
         shuffle (bool): Whether to shuffle the dataset.
         rank (int): Process rank in distributed training. -1 for single-GPU training.
+        shard (bool): Split the data into whole consecutive batches across distributed ranks, for sharded validation.
 
     Returns:
         (InfiniteDataLoader): A dataloader that can be used for training or validation.
@@ -163,7 +322,12 @@ def build_dataloader(dataset, batch, workers, shuffle=True, rank=-1):
     batch = min(batch, len(dataset))
     nd = torch.cuda.device_count()  # number of CUDA devices
     nw = min(os.cpu_count() // max(nd, 1), workers)  # number of workers
-    sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
+    if shard:  # disjoint, unpadded batches per rank for distributed validation
+        sampler = BatchShardSampler(dataset, batch)
+    elif isinstance(dataset, YOLOShardDataset):  # stream shards sequentially with shard-level shuffling
+        sampler = ShardSampler(dataset, shuffle=shuffle, rank=rank)
+    else:
+        sampler = None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
     generator = torch.Generator()
     generator.manual_seed(6148914691236517205 + RANK)
     return InfiniteDataLoader(
@@ -221,7 +385,7 @@ def check_source(source):
     return source, webcam, screenshot, from_img, in_memory, tensor
 
 
-def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
+def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False, stream_policy=None, vid_parallel=False):
     """
     Load an inference source for object detection and apply necessary transformations.
 
@@ -230,6 +394,8 @@ def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
         batch (int, optional): Batch size for dataloaders.
         vid_stride (int, optional): The frame interval for video sources.
         buffer (bool, optional): Whether stream frames will be buffered.
+        stream_policy (str, optional): Multi-stream scheduler drop policy for streams, 'latest', 'queue' or 'skip'.
+        vid_parallel (bool, optional): Whether to decode several video files in parallel into each batch.
 
     Returns:
         (Dataset): A dataset object for the specified input source with attached source_type attribute.
@@ -243,13 +409,13 @@ def load_inference_source(source=None, batch=1, vid_stride=1, buffer=False):
     elif in_memory:
         dataset = source
     elif stream:
-        dataset = LoadStreams(source, vid_stride=vid_stride, buffer=buffer)
+        dataset = LoadStreams(source, vid_stride=vid_stride, buffer=buffer, policy=stream_policy)
     elif screenshot:
         dataset = LoadScreenshots(source)
     elif from_img:
         dataset = LoadPilAndNumpy(source)
     else:
-        dataset = LoadImagesAndVideos(source, batch=batch, vid_stride=vid_stride)
+        dataset = LoadImagesAndVideos(source, batch=batch, vid_stride=vid_stride, parallel=vid_parallel)
 
     # Attach source types to the dataset
     setattr(dataset, "source_type", source_type)
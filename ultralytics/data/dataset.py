@@ -1,13 +1,18 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import json
+import math
+import os
+import zipfile
 from collections import defaultdict
+from copy import deepcopy
 from itertools import repeat
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 import cv2
 import numpy as np
+import psutil
 import torch
 from PIL import Image
 from torch.utils.data import ConcatDataset
@@ -31,12 +36,16 @@ from .converter import merge_multi_segment
 from .utils import (
     HELP_URL,
     check_file_speeds,
+    get_file_stats,
     get_hash,
     img2label_paths,
+    load_dataset_cache_arrays,
     load_dataset_cache_file,
+    save_dataset_cache_arrays,
     save_dataset_cache_file,
     verify_image,
     verify_image_label,
+    verify_imap,
 )
 
 # Ultralytics dataset *.cache version, >= 1.0.0 for YOLOv8
@@ -59,6 +68,7 @@ class YOLODataset(BaseDataset):
     Methods:
         cache_labels: Cache dataset labels, check images and read shapes.
         get_labels: Returns dictionary of labels for YOLO training.
+        save_shards: Packs resized images and labels into compressed shards for YOLOShardDataset.
         build_transforms: Builds and appends transforms to the list.
         close_mosaic: Sets mosaic, copy_paste and mixup options to 0.0 and builds transformations.
         update_labels_info: Updates label format for different tasks.
@@ -90,70 +100,126 @@ class YOLODataset(BaseDataset):
         """
         Cache dataset labels, check images and read shapes.
 
+        Labels are stored column-wise as flat concatenated arrays with per-image offsets, together with the size and
+        modification time of every image and label file. Entries of an existing cache at `path` whose files are
+        unchanged are reused, so only new or modified image/label pairs are verified again.
+
         Args:
             path (Path): Path where to save the cache file.
 
         Returns:
-            (dict): Dictionary containing cached labels and related information.
+            (dict): Dictionary containing cached label arrays and related information.
         """
-        x = {"labels": []}
-        nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
-        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
-        total = len(self.im_files)
+        n = len(self.im_files)
+        stats = get_file_stats(self.im_files + self.label_files)
         nkpt, ndim = self.data.get("kpt_shape", (0, 0))
         if self.use_keypoints and (nkpt <= 0 or ndim not in {2, 3}):
             raise ValueError(
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
-        with ThreadPool(NUM_THREADS) as pool:
-            results = pool.imap(
-                func=verify_image_label,
-                iterable=zip(
-                    self.im_files,
-                    self.label_files,
-                    repeat(self.prefix),
-                    repeat(self.use_keypoints),
-                    repeat(len(self.data["names"])),
-                    repeat(nkpt),
-                    repeat(ndim),
-                    repeat(self.single_cls),
-                ),
-            )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
-                nm += nm_f
-                nf += nf_f
-                ne += ne_f
-                nc += nc_f
-                if im_file:
-                    x["labels"].append(
-                        {
-                            "im_file": im_file,
-                            "shape": shape,
-                            "cls": lb[:, 0:1],  # n, 1
-                            "bboxes": lb[:, 1:],  # n, 4
-                            "segments": segments,
-                            "keypoints": keypoint,
-                            "normalized": True,
-                            "bbox_format": "xywh",
-                        }
-                    )
-                if msg:
-                    msgs.append(msg)
-                pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
-            pbar.close()
+
+        # Reuse entries of unchanged files from a previous cache
+        rows = [None] * n  # (cls, bboxes, segments, keypoints, shape, counts, msg) per image
+        try:
+            old = load_dataset_cache_arrays(path, mmap_mode=None)
+            assert str(old["version"]) == DATASET_CACHE_VERSION  # matches current version
+            assert ("keypoints" in old) == self.use_keypoints  # same label layout
+            index = {f: j for j, f in enumerate(bytes(old["im_files"]).decode().split("\n"))}
+            old_stats, cur_stats = old["stats"].reshape(2, -1, 2), stats.reshape(2, -1, 2)  # (images, labels)
+            unpack = self._unpack_cache(old)
+            for i, f in enumerate(self.im_files):
+                j = index.get(f)
+                if j is not None and (old_stats[:, j] == cur_stats[:, i]).all():  # same size and mtime
+                    rows[i] = unpack(j)
+        except (FileNotFoundError, AssertionError, KeyError, ValueError, zipfile.BadZipFile):
+            pass
+
+        todo = [i for i in range(n) if rows[i] is None]
+        nm, nf, ne, nc = (int(c) for c in np.array([r[5] for r in rows if r is not None]).reshape(-1, 4).sum(0))
+        desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
+        results = verify_imap(
+            func=verify_image_label,
+            iterable=zip(
+                [self.im_files[i] for i in todo],
+                [self.label_files[i] for i in todo],
+                repeat(self.prefix),
+                repeat(self.use_keypoints),
+                repeat(len(self.data["names"])),
+                repeat(nkpt),
+                repeat(ndim),
+                repeat(self.single_cls),
+            ),
+            total=len(todo),
+        )
+        pbar = TQDM(zip(todo, results), desc=desc, total=len(todo))
+        for i, (im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg) in pbar:
+            nm += nm_f
+            nf += nf_f
+            ne += ne_f
+            nc += nc_f
+            if im_file:
+                rows[i] = (lb[:, 0:1], lb[:, 1:], segments, keypoint, shape, (nm_f, nf_f, ne_f, nc_f), msg)
+            else:  # corrupt, keep the result so the file is not scanned again until it changes
+                rows[i] = (None, None, [], None, (0, 0), (nm_f, nf_f, ne_f, nc_f), msg)
+            pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
+        pbar.close()
+
+        # Pack rows into flat columns with per-image offsets
+        segments = [s for r in rows for s in r[2]]
+        x = {
+            "im_files": np.frombuffer("\n".join(self.im_files).encode(), dtype=np.uint8),
+            "stats": stats,
+            "valid": np.array([r[0] is not None for r in rows], dtype=bool),
+            "shapes": np.array([r[4] for r in rows], dtype=np.int64).reshape(n, 2),
+            "counts": np.array([r[5] for r in rows], dtype=np.uint8).reshape(n, 4),
+            "offsets": np.cumsum([0] + [len(r[0]) if r[0] is not None else 0 for r in rows], dtype=np.int64),
+            "cls": np.concatenate([r[0] for r in rows if r[0] is not None] + [np.zeros((0, 1), np.float32)]),
+            "bboxes": np.concatenate([r[1] for r in rows if r[1] is not None] + [np.zeros((0, 4), np.float32)]),
+            "segment_offsets": np.cumsum([0] + [len(r[2]) for r in rows], dtype=np.int64),
+            "point_offsets": np.cumsum([0] + [len(s) for s in segments], dtype=np.int64),
+            "points": np.concatenate(segments + [np.zeros((0, 2), np.float32)]).astype(np.float32),
+        }
+        if self.use_keypoints:
+            empty = np.zeros((0, nkpt, 3 if ndim == 2 else ndim), np.float32)  # visibility is added to 2D keypoints
+            x["keypoints"] = np.concatenate([r[3] for r in rows if r[3] is not None] + [empty]).astype(np.float32)
+        msgs = [(i, r[6]) for i, r in enumerate(rows) if r[6]]
+        x["msg_index"] = np.array([i for i, _ in msgs], dtype=np.int64)
+        x["msgs"] = np.frombuffer("\n".join(m for _, m in msgs).encode(), dtype=np.uint8)
 
         if msgs:
-            LOGGER.info("\n".join(msgs))
+            LOGGER.info("\n".join(m for _, m in msgs))
         if nf == 0:
             LOGGER.warning(f"{self.prefix}No labels found in {path}. {HELP_URL}")
-        x["hash"] = get_hash(self.label_files + self.im_files)
-        x["results"] = nf, nm, ne, nc, len(self.im_files)
-        x["msgs"] = msgs  # warnings
-        save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
+        save_dataset_cache_arrays(self.prefix, path, x, DATASET_CACHE_VERSION)
         return x
 
+    @staticmethod
+    def _unpack_cache(x):
+        """Return a function unpacking (cls, bboxes, segments, keypoints, shape, counts, msg) of one cached image."""
+        offsets, segment_offsets = x["offsets"].tolist(), x["segment_offsets"].tolist()
+        point_offsets, valid, shapes, counts = (x[k].tolist() for k in ("point_offsets", "valid", "shapes", "counts"))
+        msgs = dict(zip(x["msg_index"].tolist(), bytes(x["msgs"]).decode().split("\n") if len(x["msgs"]) else []))
+        keypoints = x.get("keypoints")
+
+        def unpack(i):
+            """Unpack image i as views into the cached columns."""
+            a, b = offsets[i], offsets[i + 1]
+            segments = [
+                x["points"][point_offsets[k] : point_offsets[k + 1]] for k in range(*segment_offsets[i : i + 2])
+            ]
+            return (
+                x["cls"][a:b] if valid[i] else None,
+                x["bboxes"][a:b] if valid[i] else None,
+                segments,
+                keypoints[a:b] if keypoints is not None and valid[i] else None,
+                tuple(shapes[i]),
+                tuple(counts[i]),
+                msgs.get(i, ""),
+            )
+
+        return unpack
+
     def get_labels(self):
         """
         Returns dictionary of labels for YOLO training.
@@ -166,23 +232,40 @@ class YOLODataset(BaseDataset):
         self.label_files = img2label_paths(self.im_files)
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
         try:
-            cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
-            assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
-        except (FileNotFoundError, AssertionError, AttributeError):
+            cache, exists = load_dataset_cache_arrays(cache_path), True  # attempt to load a *.cache file
+            assert str(cache["version"]) == DATASET_CACHE_VERSION  # matches current version
+            assert ("keypoints" in cache) == self.use_keypoints  # same label layout
+            assert bytes(cache["im_files"]) == "\n".join(self.im_files).encode()  # identical files
+            assert np.array_equal(cache["stats"], get_file_stats(self.im_files + self.label_files))  # unchanged files
+        except (FileNotFoundError, AssertionError, KeyError, ValueError, zipfile.BadZipFile):
             cache, exists = self.cache_labels(cache_path), False  # run cache ops
 
         # Display cache
-        nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
+        nm, nf, ne, nc = (int(c) for c in cache["counts"].sum(0))  # missing, found, empty, corrupt
+        n = len(self.im_files)
         if exists and LOCAL_RANK in {-1, 0}:
             d = f"Scanning {cache_path}... {nf} images, {nm + ne} backgrounds, {nc} corrupt"
             TQDM(None, desc=self.prefix + d, total=n, initial=n)  # display results
-            if cache["msgs"]:
-                LOGGER.info("\n".join(cache["msgs"]))  # display warnings
+            if len(cache["msgs"]):
+                LOGGER.info(bytes(cache["msgs"]).decode())  # display warnings
 
         # Read cache
-        [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
-        labels = cache["labels"]
+        unpack = self._unpack_cache(cache)
+        labels = []
+        for i in np.flatnonzero(cache["valid"]).tolist():
+            cls, bboxes, segments, keypoints, shape, _, _ = unpack(i)
+            labels.append(
+                {
+                    "im_file": self.im_files[i],
+                    "shape": shape,
+                    "cls": cls,  # n, 1
+                    "bboxes": bboxes,  # n, 4
+                    "segments": segments,
+                    "keypoints": keypoints,
+                    "normalized": True,
+                    "bbox_format": "xywh",
+                }
+            )
         if not labels:
             LOGGER.warning(f"No images found in {cache_path}, training may not work correctly. {HELP_URL}")
         self.im_files = [lb["im_file"] for lb in labels]  # update im_files
@@ -202,6 +285,54 @@ class YOLODataset(BaseDataset):
             LOGGER.warning(f"No labels found in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
 
+    def save_shards(self, save_dir, shard_size=1000, compresslevel=1):
+        """
+        Pack resized images and their labels into compressed shards that can be read by YOLOShardDataset.
+
+        Each shard is a zip archive of `*.npy` members ('shard-000000.npz') holding up to `shard_size` images resized
+        to `imgsz` plus a 'labels' member with the label dictionaries of those images. Training from shards replaces
+        millions of small per-image opens with a few large sequential reads, which is what network filesystems and
+        object-storage mounts are good at.
+
+        Args:
+            save_dir (str | Path): Directory to write the shards to.
+            shard_size (int, optional): Maximum number of images per shard.
+            compresslevel (int, optional): Deflate compression level, 1 favours fast decoding over size.
+
+        Returns:
+            (List[Path]): Paths of the written shard files.
+
+        Examples:
+            >>> dataset = YOLODataset(img_path="path/to/images", data={"names": {0: "person"}}, augment=False)
+            >>> dataset.save_shards("path/to/shards")
+        """
+        save_dir = Path(save_dir)
+        save_dir.mkdir(parents=True, exist_ok=True)
+        files = []
+        with ThreadPool(NUM_THREADS) as pool:
+            results = pool.imap(self.read_image, range(self.ni))
+            pbar = TQDM(enumerate(results), total=self.ni, desc=f"{self.prefix}Writing shards to {save_dir}")
+            zf, labels = None, []
+            for i, (im, hw0) in pbar:
+                if i % shard_size == 0:
+                    f = save_dir / f"shard-{i // shard_size:06d}.npz"
+                    zf = zipfile.ZipFile(f.with_suffix(".tmp"), "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel)
+                with zf.open(f"{i % shard_size:06d}.npy", "w", force_zip64=True) as fp:
+                    np.lib.format.write_array(fp, np.ascontiguousarray(im), allow_pickle=False)
+                lb = deepcopy(self.labels[i])
+                lb["shape"] = hw0  # original (h, w) for ratio_pad during evaluation
+                labels.append(lb)
+                if len(labels) == shard_size or i == self.ni - 1:  # close shard
+                    with zf.open("labels.npy", "w", force_zip64=True) as fp:
+                        np.lib.format.write_array(fp, np.array(labels, dtype=object))
+                    zf.close()
+                    os.replace(f.with_suffix(".tmp"), f)  # atomic, partially written shards are never read
+                    files.append(f)
+                    labels = []
+            pbar.close()
+        LOGGER.info(f"{self.prefix}Saved {self.ni} images in {len(files)} shards to {save_dir}")
+        return files
+
     def build_transforms(self, hyp=None):
         """
         Builds and appends transforms to the list.
@@ -409,6 +540,137 @@ class YOLOMultiModalDataset(YOLODataset):
         return [k for k, v in category_freq.items() if v >= threshold]
 
 
+class YOLOShardDataset(YOLODataset):
+    """
+    Dataset class reading pre-decoded images and labels from compressed shards written by YOLODataset.save_shards.
+
+    Images are stored already resized, so loading an image is a single decompression of one shard member. Combined
+    with ShardSampler, shards are streamed sequentially with shard-level shuffling, which keeps training on network
+    filesystems bound by throughput rather than per-file latency.
+
+    Attributes:
+        shard_files (List[Path]): Sorted list of shard files.
+        shard_index (Dict[str, Tuple[int, str, Tuple[int, int]]]): Shard number, member key and original (h, w) of
+            each image file.
+
+    Methods:
+        get_img_files: Returns empty list as image files are read from the shards in get_labels.
+        get_labels: Loads the labels stored in every shard.
+        read_image: Reads a resized image from its shard.
+        check_cache_ram: Checks RAM caching requirements from the image shapes stored in the shards.
+
+    Examples:
+        >>> dataset = YOLOShardDataset(img_path="path/to/shards", data={"names": {0: "person"}}, task="detect")
+        >>> im, hw0, hw = dataset.load_image(0)
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize a YOLOShardDataset.
+
+        Args:
+            *args (Any): Additional positional arguments for the parent class.
+            **kwargs (Any): Additional keyword arguments for the parent class.
+        """
+        self.shard_files, self.shard_index, self._shard = [], {}, (None, None)
+        if str(kwargs.get("cache")).lower() in {"disk", "mmap"}:
+            LOGGER.warning(f"cache='{kwargs['cache']}' is not needed for pre-decoded shards, setting cache=False.")
+            kwargs["cache"] = None
+        super().__init__(*args, **kwargs)
+
+    def get_img_files(self, img_path):
+        """
+        The image files would be read from the shards in `get_labels` function, return empty list here.
+
+        Args:
+            img_path (str): Path to the directory containing the shards.
+
+        Returns:
+            (list): Empty list as image files are read in get_labels.
+        """
+        self.shard_files = sorted(Path(img_path).glob("shard-*.npz"))
+        if not self.shard_files:
+            raise FileNotFoundError(f"{self.prefix}No shards found in {img_path}\n{HELP_URL}")
+        return []
+
+    def get_labels(self):
+        """
+        Load the labels stored in every shard.
+
+        Returns:
+            (List[dict]): List of label dictionaries, each containing information about an image and its annotations.
+        """
+        labels = []
+        for s, f in enumerate(self.shard_files):
+            with np.load(f, allow_pickle=True) as x:
+                for k, lb in enumerate(x["labels"]):
+                    self.shard_index[lb["im_file"]] = (s, f"{k:06d}", tuple(lb["shape"]))
+                    labels.append(lb)
+        if self.fraction < 1:
+            labels = labels[: round(len(labels) * self.fraction)]  # retain a fraction of the dataset
+        self.im_files = [lb["im_file"] for lb in labels]
+        if not labels:
+            LOGGER.warning(f"No images found in {self.shard_files[0].parent}, training may not work correctly.")
+        return labels
+
+    def read_image(self, i, rect_mode=True):
+        """
+        Read a resized image from its shard, resizing it again only if the shards were written at another imgsz.
+
+        Args:
+            i (int): Index of the image to read.
+            rect_mode (bool, optional): Whether to use rectangular resizing.
+
+        Returns:
+            (np.ndarray): Resized image as a NumPy array.
+            (Tuple[int, int]): Original image dimensions in (height, width) format.
+        """
+        s, key, (h0, w0) = self.shard_index[self.im_files[i]]
+        shard = self._shard
+        if shard[0] != s:  # shards are read sequentially, so keep only the current one open
+            shard = self._shard = (s, np.load(self.shard_files[s]))
+        im = shard[1][key]
+        if rect_mode:
+            r = self.imgsz / max(h0, w0)  # ratio
+            h, w = (min(math.ceil(h0 * r), self.imgsz), min(math.ceil(w0 * r), self.imgsz)) if r != 1 else (h0, w0)
+        else:
+            h, w = self.imgsz, self.imgsz
+        if im.shape[:2] != (h, w):
+            im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+        return im, (h0, w0)
+
+    def check_cache_ram(self, safety_margin=0.5):
+        """
+        Check if there's enough RAM for caching images, sizing them from the original shapes stored in the shards.
+
+        Args:
+            safety_margin (float, optional): Safety margin factor for RAM calculation.
+
+        Returns:
+            (bool): True if there's enough RAM, False otherwise.
+        """
+        gb = 1 << 30  # bytes per gigabytes
+        shapes = (self.shard_index[f][2] for f in self.im_files)  # only the images retained by `fraction`
+        b = sum(3 * (self.imgsz / max(hw0)) ** 2 * hw0[0] * hw0[1] for hw0 in shapes)
+        mem_required = b * (1 + safety_margin)  # bytes required to cache dataset into RAM
+        mem = psutil.virtual_memory()
+        if mem_required > mem.available:
+            self.cache = None
+            LOGGER.warning(
+                f"{self.prefix}{mem_required / gb:.1f}GB RAM required to cache images "
+                f"with {int(safety_margin * 100)}% safety margin but only "
+                f"{mem.available / gb:.1f}/{mem.total / gb:.1f}GB available, not caching images"
+            )
+            return False
+        return True
+
+    def __getstate__(self):
+        """Drop the open shard when pickling for spawned workers, which re-open shards lazily."""
+        state = super().__getstate__()
+        state["_shard"] = (None, None)
+        return state
+
+
 class GroundingDataset(YOLODataset):
     """
     Handles object detection tasks by loading annotations from a specified JSON file, supporting YOLO format.
@@ -809,18 +1071,19 @@ class ClassificationDataset:
         except (FileNotFoundError, AssertionError, AttributeError):
             # Run scan if *.cache retrieval failed
             nf, nc, msgs, samples, x = 0, 0, [], [], {}
-            with ThreadPool(NUM_THREADS) as pool:
-                results = pool.imap(func=verify_image, iterable=zip(self.samples, repeat(self.prefix)))
-                pbar = TQDM(results, desc=desc, total=len(self.samples))
-                for sample, nf_f, nc_f, msg in pbar:
-                    if nf_f:
-                        samples.append(sample)
-                    if msg:
-                        msgs.append(msg)
-                    nf += nf_f
-                    nc += nc_f
-                    pbar.desc = f"{desc} {nf} images, {nc} corrupt"
-                pbar.close()
+            results = verify_imap(
+                func=verify_image, iterable=zip(self.samples, repeat(self.prefix)), total=len(self.samples)
+            )
+            pbar = TQDM(results, desc=desc, total=len(self.samples))
+            for sample, nf_f, nc_f, msg in pbar:
+                if nf_f:
+                    samples.append(sample)
+                if msg:
+                    msgs.append(msg)
+                nf += nf_f
+                nc += nc_f
+                pbar.desc = f"{desc} {nf} images, {nc} corrupt"
+            pbar.close()
             if msgs:
                 LOGGER.info("\n".join(msgs))
             x["hash"] = get_hash([x[0] for x in self.samples])
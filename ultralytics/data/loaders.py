@@ -3,10 +3,12 @@
 import glob
 import math
 import os
+import queue
 import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Event, Lock, Thread
 from urllib.parse import urlparse
 
 import cv2
@@ -69,9 +71,17 @@ class LoadStreams:
         shape (List[Tuple[int, int, int]]): List of shapes for each stream.
         caps (List[cv2.VideoCapture]): List of cv2.VideoCapture objects for each stream.
         bs (int): Batch size for processing.
+        policy (str | None): Multi-stream scheduler drop policy, 'latest', 'queue' or 'skip', None to wait for every
+            stream.
+        deadline (float): Maximum time in seconds the scheduler waits for streams to deliver a fresh frame.
+        lag (List[float]): Age in seconds of the last frame batched from each stream.
+        dropped (List[int]): Number of frames of each stream discarded before being batched.
+        missed (List[int]): Number of batches formed without each stream.
+        batch_streams (List[int]): Indices of the streams in the last returned batch.
 
     Methods:
         update: Read stream frames in daemon thread.
+        stream_stats: Return per-stream FPS, lag, drop and miss counters.
         close: Close stream loader and release resources.
         __iter__: Returns an iterator object for the class.
         __next__: Returns source paths, transformed, and original images for processing.
@@ -84,16 +94,39 @@ class LoadStreams:
         ...     pass
         >>> stream_loader.close()
 
+        Batch whichever of 32 cameras delivered a fresh frame within 50 ms, keeping only their latest frames
+        >>> stream_loader = LoadStreams("cameras.streams", policy="latest", deadline=0.05)
+        >>> for sources, imgs, _ in stream_loader:
+        ...     print(len(sources), stream_loader.stream_stats()[0])
+
     Notes:
         - The class uses threading to efficiently load frames from multiple streams simultaneously.
         - It automatically handles YouTube links, converting them to the best available stream URL.
         - The class implements a buffer system to manage frame storage and retrieval.
+        - With a scheduler `policy`, batches contain only the streams that delivered a fresh frame within `deadline`,
+          so their size varies and one slow camera no longer stalls the others. 'latest' keeps only the newest frame of
+          each stream, 'queue' keeps a bounded FIFO queue of up to 30 frames dropping the oldest, and 'skip' keeps the
+          newest frame and stops waiting for streams that missed the previous batch.
     """
 
-    def __init__(self, sources="file.streams", vid_stride=1, buffer=False):
-        """Initialize stream loader for multiple video sources, supporting various stream types."""
+    def __init__(self, sources="file.streams", vid_stride=1, buffer=False, policy=None, deadline=None):
+        """
+        Initialize stream loader for multiple video sources, supporting various stream types.
+
+        Args:
+            sources (str): Stream source, or path to a `*.streams` text file with one source per line.
+            vid_stride (int): Video frame-rate stride.
+            buffer (bool): Whether to buffer input streams, when not using a scheduler `policy`.
+            policy (str | None): Multi-stream scheduler drop policy, 'latest', 'queue' or 'skip', None to wait for a
+                frame of every stream.
+            deadline (float | None): Maximum scheduler wait in seconds, defaults to one frame interval of the fastest
+                stream.
+        """
+        if policy not in {None, "latest", "queue", "skip"}:
+            raise ValueError(f"Invalid stream policy '{policy}', valid policies are 'latest', 'queue' and 'skip'.")
         torch.backends.cudnn.benchmark = True  # faster for fixed-size inference
         self.buffer = buffer  # buffer input streams
+        self.policy = policy
         self.running = True  # running flag for Thread
         self.mode = "stream"
         self.vid_stride = vid_stride  # video frame-rate stride
@@ -106,6 +139,14 @@ class LoadStreams:
         self.threads = [None] * n
         self.caps = [None] * n  # video capture objects
         self.imgs = [[] for _ in range(n)]  # images
+        if policy:  # (capture time, image) queues, appending to a full queue drops its oldest frame
+            self.imgs = [deque(maxlen=30 if policy == "queue" else 1) for _ in range(n)]
+        self.fresh = Condition()  # notified when a scheduler queue receives a frame
+        self.lag = [0.0] * n
+        self.dropped = [0] * n
+        self.missed = [0] * n
+        self.missed_last = [False] * n  # stream missed the previous scheduled batch
+        self.batch_streams = list(range(n))  # stream indices of the last batch
         self.shape = [[] for _ in range(n)]  # image shapes
         self.sources = [ops.clean_str(x).replace(os.sep, "_") for x in sources]  # clean source names for later
         for i, s in enumerate(sources):  # index, source
@@ -134,18 +175,33 @@ class LoadStreams:
             success, im = self.caps[i].read()  # guarantee first frame
             if not success or im is None:
                 raise ConnectionError(f"{st}Failed to read images from {s}")
-            self.imgs[i].append(im)
+            self.imgs[i].append((time.perf_counter(), im) if policy else im)
             self.shape[i] = im.shape
             self.threads[i] = Thread(target=self.update, args=([i, self.caps[i], s]), daemon=True)
             LOGGER.info(f"{st}Success ✅ ({self.frames[i]} frames of shape {w}x{h} at {self.fps[i]:.2f} FPS)")
             self.threads[i].start()
+        self.deadline = 1 / max(self.fps) if deadline is None else deadline
         LOGGER.info("")  # newline
 
     def update(self, i, cap, stream):
         """Read stream frames in daemon thread and update image buffer."""
         n, f = 0, self.frames[i]  # frame number, frame array
         while self.running and cap.isOpened() and n < (f - 1):
-            if len(self.imgs[i]) < 30:  # keep a <=30-image buffer
+            if self.policy:  # scheduler, never block capture on a slow consumer
+                n += 1
+                cap.grab()
+                if n % self.vid_stride == 0:
+                    success, im = cap.retrieve()
+                    if not success:
+                        im = np.zeros(self.shape[i], dtype=np.uint8)
+                        LOGGER.warning("Video stream unresponsive, please check your IP camera connection.")
+                        cap.open(stream)  # re-open stream if signal was lost
+                    with self.fresh:
+                        if len(self.imgs[i]) == self.imgs[i].maxlen:
+                            self.dropped[i] += 1  # oldest frame is discarded by the append
+                        self.imgs[i].append((time.perf_counter(), im))
+                        self.fresh.notify()
+            elif len(self.imgs[i]) < 30:  # keep a <=30-image buffer
                 n += 1
                 cap.grab()  # .read() = .grab() followed by .retrieve()
                 if n % self.vid_stride == 0:
@@ -160,6 +216,28 @@ class LoadStreams:
                         self.imgs[i] = [im]
             else:
                 time.sleep(0.01)  # wait until the buffer is empty
+        with self.fresh:
+            self.fresh.notify()  # wake up the scheduler to notice the ended stream
+
+    def stream_stats(self):
+        """
+        Return per-stream scheduling statistics.
+
+        Returns:
+            (List[dict]): For each stream its source name, FPS, lag in seconds of its last batched frame, number of
+                frames dropped before being batched, number of batches formed without it and whether it is alive.
+        """
+        return [
+            {
+                "source": self.sources[i],
+                "fps": self.fps[i],
+                "lag": self.lag[i],
+                "dropped": self.dropped[i],
+                "missed": self.missed[i],
+                "alive": self.threads[i].is_alive(),
+            }
+            for i in range(self.bs)
+        ]
 
     def close(self):
         """Terminates stream loader, stops threads, and releases video capture resources."""
@@ -182,6 +260,8 @@ class LoadStreams:
     def __next__(self):
         """Returns the next batch of frames from multiple video streams for processing."""
         self.count += 1
+        if self.policy:
+            return self._next_scheduled()
 
         images = []
         for i, x in enumerate(self.imgs):
@@ -204,8 +284,36 @@ class LoadStreams:
                 images.append(x.pop(-1) if x else np.zeros(self.shape[i], dtype=np.uint8))
                 x.clear()
 
+        self.batch_streams = list(range(self.bs))
         return self.sources, images, [""] * self.bs
 
+    def _next_scheduled(self):
+        """Returns a batch of the streams that delivered a fresh frame within the scheduler deadline."""
+        t_end = time.perf_counter() + self.deadline
+        with self.fresh:
+            while True:
+                alive = [i for i, t in enumerate(self.threads) if t.is_alive()]
+                ready = [i for i, x in enumerate(self.imgs) if x]
+                waiting = [i for i in alive if not self.imgs[i] and not (self.policy == "skip" and self.missed_last[i])]
+                remaining = t_end - time.perf_counter()
+                if (ready and (not waiting or remaining <= 0)) or not (alive or ready):
+                    break
+                self.fresh.wait(timeout=max(remaining, 0.01))  # keep polling stream threads past the deadline
+            t, images = time.perf_counter(), []
+            for i in range(self.bs) if ready else ():
+                self.missed_last[i] = not self.imgs[i]
+                if self.missed_last[i]:
+                    self.missed[i] += 1
+                    continue
+                t_frame, im = self.imgs[i].popleft()
+                self.lag[i] = t - t_frame
+                images.append(im)
+        if not ready:  # all streams ended
+            self.close()
+            raise StopIteration
+        self.batch_streams = ready
+        return [self.sources[i] for i in ready], images, [""] * len(ready)
+
     def __len__(self):
         """Return the number of video streams in the LoadStreams object."""
         return self.bs  # 1E12 frames = 32 streams at 30 FPS for 30 years
@@ -299,14 +407,21 @@ class LoadImagesAndVideos:
         cap (cv2.VideoCapture): Video capture object for OpenCV.
         frame (int): Frame counter for video.
         frames (int): Total number of frames in the video.
+        fps (int): Frame rate of the video of the last returned frame.
+        video_fps (Dict[str, int]): Frame rate of every video returned so far, by path.
         count (int): Counter for iteration, initialized at 0 during __iter__().
         ni (int): Number of images.
+        parallel (bool): Whether to decode up to `bs` videos in parallel, one frame of each per batch.
+        seek_stride (int): Minimum `vid_stride` from which skipped frames are seeked over instead of decoded.
+        queues (List[queue.Queue] | None): Prefetch queues of the background video decode threads.
 
     Methods:
         __init__: Initialize the LoadImagesAndVideos object.
         __iter__: Returns an iterator object for VideoStream or ImageFolder.
         __next__: Returns the next batch of images or video frames along with their paths and metadata.
         _new_video: Creates a new video capture object for the given path.
+        _start_decode: Start the background video decode threads.
+        _decode_videos: Decode video frames into a prefetch queue in a background thread.
         __len__: Returns the number of batches in the object.
 
     Examples:
@@ -315,14 +430,29 @@ class LoadImagesAndVideos:
         ...     # Process batch of images or video frames
         ...     pass
 
+        Decode 8 videos in parallel into batches of 8 frames, seeking over the 29 skipped frames out of every 30
+        >>> loader = LoadImagesAndVideos("path/to/videos", batch=8, vid_stride=30, parallel=True)
+
     Notes:
         - Supports various image formats including HEIC.
         - Handles both local files and directories.
         - Can read from a text file containing paths to images and videos.
+        - Video frames are decoded by background threads into bounded prefetch queues, overlapping decoding with the
+          processing of previous batches.
     """
 
-    def __init__(self, path, batch=1, vid_stride=1):
-        """Initialize dataloader for images and videos, supporting various input formats."""
+    def __init__(self, path, batch=1, vid_stride=1, parallel=False, seek_stride=16):
+        """
+        Initialize dataloader for images and videos, supporting various input formats.
+
+        Args:
+            path (str | Path | List): Image or video file, directory, glob pattern, *.txt file or list of them.
+            batch (int): Batch size.
+            vid_stride (int): Video frame-rate stride.
+            parallel (bool): Decode up to `batch` videos in parallel, filling each batch with one frame of each.
+            seek_stride (int): Minimum `vid_stride` from which skipped video frames are seeked over rather than decoded.
+        """
+        self._stop = Event()  # set before any error so __del__ always finds it
         parent = None
         if isinstance(path, str) and Path(path).suffix == ".txt":  # *.txt file with img/vid/dir on each line
             parent = Path(path).parent
@@ -358,6 +488,10 @@ class LoadImagesAndVideos:
         self.mode = "video" if ni == 0 else "image"  # default to video if no images
         self.vid_stride = vid_stride  # video frame-rate stride
         self.bs = batch
+        self.parallel = parallel
+        self.seek_stride = seek_stride
+        self.queues = None  # video prefetch queues, one per decode thread
+        self.video_fps = {}  # {path: fps}, batches of parallel decoded videos mix frames of several videos
         if any(videos):
             self._new_video(videos[0])  # new video
         else:
@@ -368,72 +502,140 @@ class LoadImagesAndVideos:
     def __iter__(self):
         """Iterates through image/video files, yielding source paths, images, and metadata."""
         self.count = 0
+        self._stop.set()  # stop decode threads of a previous iteration
+        self._stop, self.queues = Event(), None
         return self
 
     def __next__(self):
         """Returns the next batch of images or video frames with their paths and metadata."""
         paths, imgs, info = [], [], []
-        while len(imgs) < self.bs:
-            if self.count >= self.nf:  # end of file list
-                if imgs:
-                    return paths, imgs, info  # return last partial batch
-                else:
-                    raise StopIteration
-
+        while len(imgs) < self.bs and self.count < self.ni:
+            # Handle image files (including HEIC)
+            self.mode = "image"
             path = self.files[self.count]
-            if self.video_flag[self.count]:
-                self.mode = "video"
-                if not self.cap or not self.cap.isOpened():
-                    self._new_video(path)
-
-                success = False
-                for _ in range(self.vid_stride):
-                    success = self.cap.grab()
-                    if not success:
-                        break  # end of video or failure
-
-                if success:
-                    success, im0 = self.cap.retrieve()
-                    if success:
-                        self.frame += 1
-                        paths.append(path)
-                        imgs.append(im0)
-                        info.append(f"video {self.count + 1}/{self.nf} (frame {self.frame}/{self.frames}) {path}: ")
-                        if self.frame == self.frames:  # end of video
-                            self.count += 1
-                            self.cap.release()
-                else:
-                    # Move to the next file if the current video ended or failed to open
-                    self.count += 1
-                    if self.cap:
-                        self.cap.release()
-                    if self.count < self.nf:
-                        self._new_video(self.files[self.count])
+            if path.split(".")[-1].lower() == "heic":
+                # Load HEIC image using Pillow with pillow-heif
+                check_requirements("pillow-heif")
+
+                from pillow_heif import register_heif_opener
+
+                register_heif_opener()  # Register HEIF opener with Pillow
+                with Image.open(path) as img:
+                    im0 = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)  # convert image to BGR nparray
+            else:
+                im0 = imread(path)  # BGR
+            if im0 is None:
+                LOGGER.warning(f"Image Read Error {path}")
             else:
-                # Handle image files (including HEIC)
-                self.mode = "image"
-                if path.split(".")[-1].lower() == "heic":
-                    # Load HEIC image using Pillow with pillow-heif
-                    check_requirements("pillow-heif")
+                paths.append(path)
+                imgs.append(im0)
+                info.append(f"image {self.count + 1}/{self.nf} {path}: ")
+            self.count += 1  # move to the next file
+        if imgs or self.count >= self.nf:  # image batch, or end of file list
+            if imgs:
+                return paths, imgs, info  # return last partial batch at the end of the image list
+            raise StopIteration
 
-                    from pillow_heif import register_heif_opener
+        # Video frames from the background decode threads
+        self.mode = "video"
+        if self.queues is None:
+            self._start_decode()
+        while len(imgs) < self.bs and self.queues:
+            for q in list(self.queues) if self.parallel else self.queues[:1]:
+                item = q.get()
+                if item is None:  # decode thread finished its videos
+                    self.queues.remove(q)
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                self.count, path, self.frame, self.frames, self.fps, im0 = item
+                self.video_fps[path] = self.fps
+                paths.append(path)
+                imgs.append(im0)
+                info.append(f"video {self.count + 1}/{self.nf} (frame {self.frame}/{self.frames}) {path}: ")
+            if self.parallel and imgs:
+                break  # one frame per video and batch
+        if not imgs:
+            self.count = self.nf
+            raise StopIteration
+        return paths, imgs, info
 
-                    register_heif_opener()  # Register HEIF opener with Pillow
-                    with Image.open(path) as img:
-                        im0 = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)  # convert image to BGR nparray
-                else:
-                    im0 = imread(path)  # BGR
-                if im0 is None:
-                    LOGGER.warning(f"Image Read Error {path}")
+    def _start_decode(self):
+        """Start background threads decoding the videos, one per video decoded in parallel."""
+        if self.cap:
+            self.cap.release()  # decode threads open their own captures
+        videos = list(range(self.ni, self.nf))
+        lock = Lock()
+
+        def claim():
+            """Return the file index of the next video to decode, or None once all videos are claimed."""
+            with lock:
+                return videos.pop(0) if videos else None
+
+        n = min(self.bs, len(videos)) if self.parallel else 1
+        self.queues = [queue.Queue(maxsize=2 if self.parallel else 2 * self.bs) for _ in range(n)]
+        for q in self.queues:
+            args = (self.files, claim, q, self._stop, self.vid_stride, self.vid_stride >= self.seek_stride)
+            Thread(target=self._decode_videos, args=args, daemon=True).start()
+
+    @staticmethod
+    def _decode_videos(files, claim, q, stop, vid_stride, seek):
+        """
+        Decode frames of the videos returned by `claim` into the bounded prefetch queue `q`.
+
+        Kept free of references to the loader, so that an abandoned loader is garbage collected and its threads exit.
+
+        Args:
+            files (List[str]): File paths.
+            claim (Callable): Returns the file index of the next video to decode, or None when done.
+            q (queue.Queue): Queue receiving (file index, path, frame, frames, fps, image) items, an Exception if a
+                video fails to open and None once done.
+            stop (threading.Event): Event signalling the thread to exit.
+            vid_stride (int): Video frame-rate stride.
+            seek (bool): Seek to every `vid_stride`-th frame instead of decoding the skipped frames.
+        """
+
+        def put(item):
+            """Put an item on the queue, returning False if stopped."""
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        while (k := claim()) is not None:
+            cap = cv2.VideoCapture(files[k])
+            if not cap.isOpened():
+                put(FileNotFoundError(f"Failed to open video {files[k]}"))
+                return
+            fps = int(cap.get(cv2.CAP_PROP_FPS))
+            frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) / vid_stride)
+            frame = 0
+            while frame < frames:
+                if seek and cap.set(cv2.CAP_PROP_POS_FRAMES, (frame + 1) * vid_stride - 1):
+                    success, im0 = cap.read()  # seek to the next strided frame, decoding from its keyframe
+                    if not success:
+                        break
                 else:
-                    paths.append(path)
-                    imgs.append(im0)
-                    info.append(f"image {self.count + 1}/{self.nf} {path}: ")
-                self.count += 1  # move to the next file
-                if self.count >= self.ni:  # end of image list
+                    success = False
+                    for _ in range(vid_stride):
+                        success = cap.grab()
+                        if not success:
+                            break  # end of video or failure
+                    if not success:
+                        break
+                    success, im0 = cap.retrieve()
+                    if not success:
+                        continue
+                frame += 1
+                if not put((k, files[k], frame, frames, fps, im0)):
                     break
-
-        return paths, imgs, info
+            cap.release()
+            if stop.is_set():
+                return
+        put(None)
 
     def _new_video(self, path):
         """Creates a new video capture object for the given path and initializes video-related attributes."""
@@ -448,6 +650,10 @@ class LoadImagesAndVideos:
         """Returns the number of files (images and videos) in the dataset."""
         return math.ceil(self.nf / self.bs)  # number of batches
 
+    def __del__(self):
+        """Stop the background video decode threads when the loader is garbage collected."""
+        self._stop.set()
+
 
 class LoadPilAndNumpy:
     """
@@ -7,7 +7,8 @@ import random
 import subprocess
 import time
 import zipfile
-from multiprocessing.pool import ThreadPool
+from multiprocessing import current_process
+from multiprocessing.pool import Pool, ThreadPool
 from pathlib import Path
 from tarfile import is_tarfile
 
@@ -136,6 +137,48 @@ def get_hash(paths):
     return h.hexdigest()  # return hash
 
 
+def get_file_stats(paths):
+    """Returns an (n, 2) int64 array of file sizes and modification times in ns, -1 for missing files."""
+    stats = np.full((len(paths), 2), -1, dtype=np.int64)
+    for i, p in enumerate(paths):
+        try:
+            s = os.stat(p)
+        except OSError:
+            continue
+        stats[i] = s.st_size, s.st_mtime_ns
+    return stats
+
+
+def verify_imap(func, iterable, total, threshold=4096, workers=NUM_THREADS):
+    """
+    Apply a dataset verification function to every item of iterable, yielding results in order as they complete.
+
+    Verification decodes images with PIL, handles EXIF data and parses labels with NumPy, which mostly holds the GIL,
+    so threads barely scale. Datasets of at least `threshold` items are therefore verified on a process pool with
+    chunked work submission, while smaller datasets keep a thread pool to avoid the process start-up cost.
+
+    Args:
+        func (Callable): Picklable top-level function to apply, i.e. verify_image_label or verify_image.
+        iterable (Iterable): Arguments for func, one item per file.
+        total (int): Number of items in iterable.
+        threshold (int, optional): Minimum number of items for using a process pool.
+        workers (int, optional): Number of worker processes or threads.
+
+    Yields:
+        (Any): Result of func for each item of iterable, in order.
+
+    Examples:
+        >>> for result in TQDM(verify_imap(verify_image, zip(samples, repeat("")), len(samples)), total=len(samples)):
+        ...     pass
+    """
+    if total >= threshold and workers > 1 and not current_process().daemon:  # daemonic processes can't have children
+        pool, chunksize = Pool(workers), max(1, min(256, total // (workers * 16)))  # ~16 chunks per process
+    else:
+        pool, chunksize = ThreadPool(workers), 1
+    with pool:
+        yield from pool.imap(func, iterable, chunksize=chunksize)
+
+
 def exif_size(img: Image.Image):
     """Returns exif-corrected PIL size."""
     s = img.size  # (width, height)
@@ -773,3 +816,56 @@ def save_dataset_cache_file(prefix, path, x, version):
         LOGGER.info(f"{prefix}New cache created: {path}")
     else:
         LOGGER.warning(f"{prefix}Cache directory {path.parent} is not writeable, cache not saved.")
+
+
+def load_dataset_cache_arrays(path, mmap_mode="c"):
+    """
+    Load an Ultralytics columnar *.cache file of named arrays, memory-mapping them instead of reading them into RAM.
+
+    The cache is an uncompressed *.npz archive, so every member is a plain *.npy file at a fixed offset in the archive
+    and can be mapped directly. The default copy-on-write mode lets callers modify label arrays in place without
+    touching the file on disk.
+
+    Args:
+        path (str | Path): Path to the *.cache file.
+        mmap_mode (str | None, optional): Memory-map mode passed to np.memmap, or None to read arrays into memory.
+
+    Returns:
+        (dict): Dictionary of NumPy arrays keyed by member name.
+    """
+    x = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            name = info.filename[:-4]  # strip '.npy'
+            if info.compress_type != zipfile.ZIP_STORED or mmap_mode is None:
+                with zf.open(info) as fp:
+                    x[name] = np.lib.format.read_array(fp, allow_pickle=False)
+                continue
+            f.seek(info.header_offset + 26)  # local file header stores name and extra field lengths at bytes 26-30
+            n, m = np.frombuffer(f.read(4), dtype="<u2")
+            f.seek(info.header_offset + 30 + int(n) + int(m))  # start of the *.npy data
+            version = np.lib.format.read_magic(f)
+            read_header = (
+                np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            )
+            shape, fortran, dtype = read_header(f)
+            if dtype.hasobject:
+                raise ValueError(f"Object arrays are not supported in columnar cache file {path}")
+            if np.prod(shape) == 0:  # zero-size arrays can not be mapped
+                x[name] = np.zeros(shape, dtype=dtype)
+            else:
+                x[name] = np.memmap(f, dtype, mmap_mode, offset=f.tell(), shape=shape, order="F" if fortran else "C")
+    return x
+
+
+def save_dataset_cache_arrays(prefix, path, x, version):
+    """Save an Ultralytics dataset columnar *.cache dictionary of arrays x to path as an uncompressed *.npz archive."""
+    x["version"] = np.array(version)  # add cache version
+    if is_dir_writeable(path.parent):
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(str(tmp), "wb") as file:  # context manager here fixes windows async np.save bug
+            np.savez(file, **x)
+        os.replace(tmp, path)  # atomic, existing memory maps of the old cache stay valid
+        LOGGER.info(f"{prefix}New cache created: {path}")
+    else:
+        LOGGER.warning(f"{prefix}Cache directory {path.parent} is not writeable, cache not saved.")
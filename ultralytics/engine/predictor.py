@@ -33,6 +33,7 @@ Usage - formats:
 """
 
 import platform
+import queue
 import re
 import threading
 from pathlib import Path
@@ -40,6 +41,7 @@ from pathlib import Path
 import cv2
 import numpy as np
 import torch
+import torch.nn.functional as F
 
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
@@ -84,8 +86,12 @@ class BasePredictor:
         seen (int): Number of images processed.
         windows (list): List of window names for visualization.
         batch (tuple): Current batch data.
+        frame (int | None): Source loader count of the current batch.
+        batch_streams (List[int] | None): Stream indices of the current batch for stream sources, None otherwise.
         results (list): Current batch results.
         transforms (callable): Image transforms for classification.
+        im_buffer (torch.Tensor | None): Reused uint8 (N, 3, H, W) input buffer of `batch_pre_transform`.
+        im_buffer_event (torch.cuda.Event | None): Event recorded after the last buffer copy to a CUDA device.
         callbacks (dict): Callback functions for different events.
         txt_path (Path): Path to save text results.
         _lock (threading.Lock): Lock for thread-safe inference.
@@ -93,10 +99,16 @@ class BasePredictor:
     Methods:
         preprocess: Prepare input image before inference.
         inference: Run inference on a given image.
+        build_letterbox: Build the LetterBox transform for input images.
+        pre_transform: Letterbox input images.
+        batch_pre_transform: Letterbox a batch of images into a reused NCHW buffer.
+        device_pre_transform: Letterbox and normalize images on the inference device.
         postprocess: Process raw predictions into structured results.
         predict_cli: Run prediction for command line interface.
         setup_source: Set up input source and inference mode.
         stream_inference: Stream inference on input source.
+        sequential_stages: Read, preprocess and infer source batches on the calling thread.
+        pipelined_stages: Read, preprocess and infer source batches concurrently in background threads.
         setup_model: Initialize and configure the model.
         write_results: Write inference results to files.
         save_predicted_images: Save prediction visualizations.
@@ -134,8 +146,12 @@ class BasePredictor:
         self.seen = 0
         self.windows = []
         self.batch = None
+        self.frame = None
+        self.batch_streams = None
         self.results = None
         self.transforms = None
+        self.im_buffer = None
+        self.im_buffer_event = None
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
         self._lock = threading.Lock()  # for automatic thread-safe inference
@@ -148,16 +164,27 @@ class BasePredictor:
         Args:
             im (torch.Tensor | List(np.ndarray)): Images of shape (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
         """
+        if self.args.device_preprocess and self.pre_transform.__func__ is BasePredictor.pre_transform:
+            im = self.device_pre_transform(im)
+            return im.half() if self.model.fp16 else im
         not_tensor = not isinstance(im, torch.Tensor)
         if not_tensor:
-            im = np.stack(self.pre_transform(im))
-            if im.shape[-1] == 3:
-                im = im[..., ::-1]  # BGR to RGB
-            im = im.transpose((0, 3, 1, 2))  # BHWC to BCHW, (n, 3, h, w)
-            im = np.ascontiguousarray(im)  # contiguous
-            im = torch.from_numpy(im)
-
-        im = im.to(self.device)
+            if self.pre_transform.__func__ is BasePredictor.pre_transform and all(
+                x.ndim == 3 and x.shape[2] == 3 for x in im
+            ):
+                im = self.batch_pre_transform(im)  # fused letterbox, BGR to RGB, BHWC to BCHW
+            else:
+                im = np.stack(self.pre_transform(im))
+                if im.shape[-1] == 3:
+                    im = im[..., ::-1]  # BGR to RGB
+                im = im.transpose((0, 3, 1, 2))  # BHWC to BCHW, (n, 3, h, w)
+                im = np.ascontiguousarray(im)  # contiguous
+                im = torch.from_numpy(im)
+
+        im = im.to(self.device, non_blocking=True)
+        if not_tensor and self.device.type == "cuda":
+            self.im_buffer_event = torch.cuda.Event()  # marks when the buffer may be overwritten again
+            self.im_buffer_event.record()
         im = im.half() if self.model.fp16 else im.float()  # uint8 to fp16/32
         if not_tensor:
             im /= 255  # 0 - 255 to 0.0 - 1.0
@@ -172,26 +199,103 @@ class BasePredictor:
         )
         return self.model(im, augment=self.args.augment, visualize=visualize, embed=self.args.embed, *args, **kwargs)
 
-    def pre_transform(self, im):
+    def build_letterbox(self, same_shapes=False):
         """
-        Pre-transform input image before inference.
+        Build the LetterBox transform used to resize and pad input images.
 
         Args:
-            im (List[np.ndarray]): Images of shape (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
+            same_shapes (bool): Whether all images of the batch have the same shape, allowing minimum rectangle padding.
 
         Returns:
-            (List[np.ndarray]): A list of transformed images.
+            (LetterBox): Letterbox transform for the current model and image size.
         """
-        same_shapes = len({x.shape for x in im}) == 1
-        letterbox = LetterBox(
+        return LetterBox(
             self.imgsz,
             auto=same_shapes
             and self.args.rect
             and (self.model.pt or (getattr(self.model, "dynamic", False) and not self.model.imx)),
             stride=self.model.stride,
         )
+
+    def pre_transform(self, im):
+        """
+        Pre-transform input image before inference.
+
+        Args:
+            im (List[np.ndarray]): Images of shape (N, 3, h, w) for tensor, [(h, w, 3) x N] for list.
+
+        Returns:
+            (List[np.ndarray]): A list of transformed images.
+        """
+        letterbox = self.build_letterbox(same_shapes=len({x.shape for x in im}) == 1)
         return [letterbox(image=x) for x in im]
 
+    def batch_pre_transform(self, im):
+        """
+        Letterbox a batch of images straight into a reused (N, 3, H, W) uint8 buffer.
+
+        Fused equivalent of `pre_transform` followed by stacking and BGR to RGB and HWC to CHW conversion. Each image is
+        resized once and copied once into a preallocated buffer, pinned when inferring on CUDA, that is kept across
+        batches; only its padding borders are refilled.
+
+        Args:
+            im (List[np.ndarray]): BGR images of shape [(h, w, 3) x N].
+
+        Returns:
+            (torch.Tensor): RGB uint8 tensor of shape (N, 3, H, W), a view into the reused buffer.
+        """
+        letterbox = self.build_letterbox(same_shapes=len({x.shape for x in im}) == 1)
+        params = [letterbox.get_params(x.shape[:2]) for x in im]
+        (w, h), (top, bottom, left, right) = params[0][1:]
+        shape = (3, h + top + bottom, w + left + right)
+        if self.im_buffer is None or self.im_buffer.shape[1:] != shape or len(self.im_buffer) < len(im):
+            self.im_buffer = torch.empty((len(im), *shape), dtype=torch.uint8, pin_memory=self.device.type == "cuda")
+        elif self.im_buffer_event is not None:
+            self.im_buffer_event.synchronize()  # wait for the previous batch to be copied to the device
+        for b, x, (_, new_unpad, (top, _, left, _)) in zip(self.im_buffer.numpy(), im, params):
+            if x.shape[1::-1] != new_unpad:  # resize
+                x = cv2.resize(x, new_unpad, interpolation=cv2.INTER_LINEAR)
+            h, w = x.shape[:2]
+            b[:, :top], b[:, top + h :] = 114, 114  # top and bottom padding
+            b[:, top : top + h, :left], b[:, top : top + h, left + w :] = 114, 114  # left and right padding
+            b[:, top : top + h, left : left + w] = x.transpose(2, 0, 1)[::-1]  # HWC to CHW, BGR to RGB
+        return self.im_buffer[: len(im)]
+
+    def device_pre_transform(self, im):
+        """
+        Letterbox and normalize images on the inference device with torch ops.
+
+        Images are uploaded at their original resolution and resized with bilinear interpolation on `self.device`, in a
+        single call when all images of the batch share the same shape. Tensor inputs of any stride-divisible size are
+        letterboxed to `imgsz` as well.
+
+        Args:
+            im (torch.Tensor | List[np.ndarray]): RGB tensor of shape (N, 3, h, w) in range 0.0-1.0, or BGR uint8 images
+                of shape [(h, w, 3) x N].
+
+        Returns:
+            (torch.Tensor): RGB float tensor of shape (N, 3, H, W) in range 0.0-1.0 on `self.device`.
+        """
+        if isinstance(im, torch.Tensor):
+            im = list(im.to(self.device).float())
+        else:
+            im = [torch.from_numpy(x).to(self.device).permute(2, 0, 1) for x in im]  # HWC to CHW
+            im = [(x.flip(0) if len(x) == 3 else x).float() / 255 for x in im]  # BGR to RGB, 0-255 to 0.0-1.0
+        same_shapes = len({x.shape for x in im}) == 1
+        letterbox = self.build_letterbox(same_shapes=same_shapes)
+        params = [letterbox.get_params(x.shape[1:]) for x in im]
+        (w, h), (top, bottom, left, right) = params[0][1:]
+        out = torch.full((len(im), len(im[0]), h + top + bottom, w + left + right), 114 / 255, device=self.device)
+        if same_shapes:
+            batches = [(slice(None), torch.stack(im), params[0])]
+        else:
+            batches = [(slice(i, i + 1), x[None], p) for i, (x, p) in enumerate(zip(im, params))]
+        for i, x, (_, (w, h), (top, _, left, _)) in batches:
+            if x.shape[2:] != (h, w):  # resize
+                x = F.interpolate(x, size=(h, w), mode="bilinear", align_corners=False)
+            out[i, :, top : top + h, left : left + w] = x
+        return out
+
     def postprocess(self, preds, img, orig_imgs):
         """Post-process predictions for an image and return them."""
         return preds
@@ -261,6 +365,8 @@ class BasePredictor:
             batch=self.args.batch,
             vid_stride=self.args.vid_stride,
             buffer=self.args.stream_buffer,
+            stream_policy=self.args.stream_policy,
+            vid_parallel=self.args.vid_parallel,
         )
         self.source_type = self.dataset.source_type
         if not getattr(self, "stream", True) and (
@@ -316,20 +422,15 @@ class BasePredictor:
                 ops.Profile(device=self.device),
             )
             self.run_callbacks("on_predict_start")
-            for self.batch in self.dataset:
-                self.run_callbacks("on_predict_batch_start")
+            if self.args.pipeline and self.args.visualize:
+                LOGGER.warning("'pipeline=True' is not compatible with 'visualize=True', running stages sequentially.")
+                self.args.pipeline = False
+            stages = self.pipelined_stages if self.args.pipeline else self.sequential_stages
+            for im, preds, dt in stages(profilers, *args, **kwargs):
                 paths, im0s, s = self.batch
-
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
-
-                # Inference
-                with profilers[1]:
-                    preds = self.inference(im, *args, **kwargs)
-                    if self.args.embed:
-                        yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
-                        continue
+                if self.args.embed:
+                    yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
+                    continue
 
                 # Postprocess
                 with profilers[2]:
@@ -341,8 +442,8 @@ class BasePredictor:
                 for i in range(n):
                     self.seen += 1
                     self.results[i].speed = {
-                        "preprocess": profilers[0].dt * 1e3 / n,
-                        "inference": profilers[1].dt * 1e3 / n,
+                        "preprocess": dt[0] * 1e3 / n,
+                        "inference": dt[1] * 1e3 / n,
                         "postprocess": profilers[2].dt * 1e3 / n,
                     }
                     if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
@@ -373,6 +474,125 @@ class BasePredictor:
             LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
         self.run_callbacks("on_predict_end")
 
+    def sequential_stages(self, profilers, *args, **kwargs):
+        """
+        Read, preprocess and run inference on source batches one at a time on the calling thread.
+
+        Args:
+            profilers (Tuple[ops.Profile, ...]): Preprocess, inference and postprocess profilers.
+            *args (Any): Additional arguments for the inference method.
+            **kwargs (Any): Additional keyword arguments for the inference method.
+
+        Yields:
+            im (torch.Tensor): Preprocessed image batch, with `self.batch` set to the matching source batch.
+            preds (Any): Raw model predictions.
+            dt (Tuple[float, float]): Preprocess and inference times of this batch in seconds.
+        """
+        for self.batch in self.dataset:
+            self.frame = getattr(self.dataset, "count", None)
+            self.batch_streams = getattr(self.dataset, "batch_streams", None)
+            self.run_callbacks("on_predict_batch_start")
+            with profilers[0]:
+                im = self.preprocess(self.batch[1])
+            with profilers[1]:
+                preds = self.inference(im, *args, **kwargs)
+            yield im, preds, (profilers[0].dt, profilers[1].dt)
+
+    def pipelined_stages(self, profilers, *args, **kwargs):
+        """
+        Read, preprocess and run inference on source batches concurrently in background threads.
+
+        Source reading, preprocessing and inference each run in their own thread, connected by bounded queues of
+        `maxsize=2` so that decoding and letterboxing of upcoming batches overlap with inference, and inference overlaps
+        with postprocessing and saving on the calling thread. Every stage is a single FIFO worker, so batches are
+        yielded in source order. Exceptions raised in a stage are re-raised on the calling thread.
+
+        Args:
+            profilers (Tuple[ops.Profile, ...]): Preprocess, inference and postprocess profilers.
+            *args (Any): Additional arguments for the inference method.
+            **kwargs (Any): Additional keyword arguments for the inference method.
+
+        Yields:
+            im (torch.Tensor): Preprocessed image batch, with `self.batch` set to the matching source batch.
+            preds (Any): Raw model predictions.
+            dt (Tuple[float, float]): Preprocess and inference times of this batch in seconds.
+
+        Notes:
+            The 'on_predict_batch_start' callback runs on the calling thread once a batch leaves the pipeline, i.e.
+            after its preprocessing and inference.
+        """
+        stop, done = threading.Event(), object()  # shutdown flag and end-of-source marker
+        queues = [queue.Queue(maxsize=2) for _ in range(3)]
+
+        def put(q, item):
+            """Put an item on a queue, giving up if the pipeline is stopped."""
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(q):
+            """Get an item from a queue, returning the end marker if the pipeline is stopped."""
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return done
+
+        def read():
+            """Iterate the source, recording the loader count and stream indices of every batch."""
+            for batch in self.dataset:
+                yield batch, getattr(self.dataset, "count", None), getattr(self.dataset, "batch_streams", None)
+
+        def preprocess(item):
+            """Letterbox and convert one source batch to a model input tensor."""
+            with profilers[0]:
+                im = self.preprocess(item[0][1])
+            return (*item, im, profilers[0].dt)
+
+        @smart_inference_mode()
+        def inference(item):
+            """Run the model on one preprocessed batch (grad mode is thread-local, hence the decorator)."""
+            with profilers[1]:
+                preds = self.inference(item[3], *args, **kwargs)
+            return (*item, preds, profilers[1].dt)
+
+        def worker(source, fn, q):
+            """Apply fn to every item of source and forward results, end marker and exceptions to queue q."""
+            item = done
+            try:
+                for item in source:
+                    if item is done or isinstance(item, Exception):
+                        break
+                    if not put(q, fn(item)):
+                        return
+            except Exception as e:
+                item = e
+            put(q, item if isinstance(item, Exception) else done)
+
+        sources = (read(), iter(lambda: get(queues[0]), None), iter(lambda: get(queues[1]), None))
+        threads = [
+            threading.Thread(target=worker, args=(source, fn, q), daemon=True)
+            for source, fn, q in zip(sources, (lambda x: x, preprocess, inference), queues)
+        ]
+        for t in threads:
+            t.start()
+        try:
+            while (item := get(queues[2])) is not done:
+                if isinstance(item, Exception):
+                    raise item
+                self.batch, self.frame, self.batch_streams, im, dt_pre, preds, dt_inf = item
+                self.run_callbacks("on_predict_batch_start")
+                yield im, preds, (dt_pre, dt_inf)
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+
     def setup_model(self, model, verbose=True):
         """
         Initialize YOLO model with given parameters and set it to evaluation mode.
@@ -414,7 +634,7 @@ class BasePredictor:
             im = im[None]  # expand for batch dim
         if self.source_type.stream or self.source_type.from_img or self.source_type.tensor:  # batch_size >= 1
             string += f"{i}: "
-            frame = self.dataset.count
+            frame = self.frame
         else:
             match = re.search(r"frame (\d+)/", s[i])
             frame = int(match[1]) if match else None  # 0 if frame undetermined
@@ -443,23 +663,24 @@ class BasePredictor:
         if self.args.show:
             self.show(str(p))
         if self.args.save:
-            self.save_predicted_images(str(self.save_dir / p.name), frame)
+            self.save_predicted_images(str(self.save_dir / p.name), frame, str(p))
 
         return string
 
-    def save_predicted_images(self, save_path="", frame=0):
+    def save_predicted_images(self, save_path="", frame=0, source=""):
         """
         Save video predictions as mp4 or images as jpg at specified path.
 
         Args:
             save_path (str): Path to save the results.
             frame (int): Frame number for video mode.
+            source (str): Source path, used to look up the frame rate of its video.
         """
         im = self.plotted_img
 
         # Save videos and streams
         if self.dataset.mode in {"stream", "video"}:
-            fps = self.dataset.fps if self.dataset.mode == "video" else 30
+            fps = self.dataset.video_fps.get(source, self.dataset.fps) if self.dataset.mode == "video" else 30
             frames_path = f"{save_path.split('.', 1)[0]}_frames/"
             if save_path not in self.vid_writer:  # new video
                 if self.args.save_frames:
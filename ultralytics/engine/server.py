@@ -0,0 +1,334 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+Serve a model with dynamic micro-batching, coalescing concurrent single-image requests into batched inference.
+
+Usage - Python:
+    from ultralytics import YOLO
+    from ultralytics.engine.server import InferenceServer
+
+    InferenceServer(YOLO("yolo11n.pt"), max_batch=16, max_wait=0.005).serve(port=8000)
+
+Usage - HTTP:
+    $ curl -X POST --data-binary @bus.jpg http://127.0.0.1:8000/predict  # detections as JSON
+    $ curl http://127.0.0.1:8000/metrics                                  # queue depth, batch sizes and latency
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from ultralytics.data.loaders import LoadPilAndNumpy
+from ultralytics.utils import LOGGER, colorstr, ops
+from ultralytics.utils.patches import imread
+from ultralytics.utils.torch_utils import smart_inference_mode
+
+
+class InferenceServer:
+    """
+    Dynamic micro-batching server for a model, turning concurrent requests into batched predictions.
+
+    Requests submitted from any number of threads or asyncio tasks are queued. A single worker thread collects them
+    into batches of up to `max_batch` images, waiting at most `max_wait` seconds after the first request of a batch for
+    more to arrive, runs one batched preprocess, inference and postprocess pass of a dedicated predictor and scatters
+    the Results back to the callers. Unlike concurrent `Model.predict` calls, requests never wait on the predictor
+    lock of another request.
+
+    Attributes:
+        model (Model): Model to serve, e.g. `YOLO("yolo11n.pt")`.
+        max_batch (int): Maximum number of images per batch.
+        max_wait (float): Maximum time in seconds to wait for a batch to fill once its first request arrived.
+        predictor (BasePredictor): Dedicated predictor used by the worker thread.
+        queue (queue.Queue): Pending (image, future, submit time) requests.
+        profilers (Tuple[ops.Profile, ...]): Preprocess, inference and postprocess profilers.
+        batch_sizes (collections.Counter): Number of batches run per batch size.
+        requests (int): Number of completed requests.
+        max_queue_depth (int): Highest number of pending requests observed.
+        latency (float): Summed request latency in seconds, from submission to result.
+
+    Methods:
+        start: Start the batching worker thread.
+        stop: Stop the worker thread after failing pending requests.
+        submit: Queue an image and return a Future of its Results.
+        predict: Predict an image and block until its Results are ready.
+        apredict: Predict an image from an asyncio coroutine.
+        metrics: Return queue-depth, batch-size, latency and speed metrics.
+        serve: Serve predictions and metrics over a local HTTP server.
+        http_server: Create the local HTTP server without running it.
+
+    Examples:
+        >>> from ultralytics import YOLO
+        >>> with InferenceServer(YOLO("yolo11n.pt"), max_batch=8, max_wait=0.005, imgsz=320) as server:
+        ...     futures = [server.submit("bus.jpg") for _ in range(16)]
+        ...     results = [f.result() for f in futures]
+        ...     print(server.metrics()["mean_batch_size"])
+    """
+
+    def __init__(self, model, max_batch=8, max_wait=0.005, **kwargs):
+        """
+        Initialize the server and a dedicated predictor for the model.
+
+        Args:
+            model (Model): Model to serve.
+            max_batch (int): Maximum number of images per batch.
+            max_wait (float): Maximum time in seconds to wait for a batch to fill once its first request arrived.
+            **kwargs (Any): Prediction arguments, e.g. `imgsz`, `conf` or `half`.
+        """
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        args = {**model.overrides, "conf": 0.25, "save": False, "mode": "predict", "rect": True, **kwargs}
+        args.update(batch=max_batch, verbose=False)  # AutoBackend batch for static-shape exported models
+        self.predictor = model._smart_load("predictor")(overrides=args, _callbacks=model.callbacks)
+        self.predictor.setup_model(model=model.model, verbose=False)
+        self.predictor.setup_source(np.zeros((32, 32, 3), dtype=np.uint8))  # set imgsz and classify transforms
+        backend = self.predictor.model
+        backend.warmup(imgsz=(1 if backend.pt or backend.triton else max_batch, backend.ch, *self.predictor.imgsz))
+        self.predictor.done_warmup = True
+
+        self.queue = queue.Queue()
+        self.profilers = tuple(ops.Profile(device=self.predictor.device) for _ in range(3))
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.max_queue_depth = 0
+        self.latency = 0.0
+        self._thread = None
+        self._running = threading.Event()
+
+    def __enter__(self):
+        """Start the server on entering a context."""
+        return self.start()
+
+    def __exit__(self, *args):
+        """Stop the server on leaving a context."""
+        self.stop()
+
+    def start(self):
+        """Start the batching worker thread and return the server."""
+        if not self._running.is_set():
+            self._running.set()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the worker thread once its current batch is done and fail all requests still queued."""
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        while not self.queue.empty():
+            _, future, _ = self.queue.get_nowait()
+            future.set_exception(RuntimeError("InferenceServer stopped before the request was processed."))
+
+    def submit(self, im):
+        """
+        Queue an image for prediction.
+
+        Args:
+            im (str | Path | bytes | np.ndarray | PIL.Image.Image): Image file, encoded image bytes, BGR numpy image or
+                PIL image.
+
+        Returns:
+            (concurrent.futures.Future): Future resolving to the image's Results.
+        """
+        if not self._running.is_set():
+            raise RuntimeError("InferenceServer is not running, call 'start()' first.")
+        future = Future()
+        self.queue.put((im, future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+        return future
+
+    def predict(self, im, timeout=None):
+        """
+        Predict an image, blocking until its batch has been processed.
+
+        Args:
+            im (str | Path | bytes | np.ndarray | PIL.Image.Image): Image to predict.
+            timeout (float | None): Maximum time to wait in seconds.
+
+        Returns:
+            (Results): Prediction results of the image.
+        """
+        return self.submit(im).result(timeout)
+
+    async def apredict(self, im):
+        """
+        Predict an image from an asyncio coroutine without blocking the event loop.
+
+        Args:
+            im (str | Path | bytes | np.ndarray | PIL.Image.Image): Image to predict.
+
+        Returns:
+            (Results): Prediction results of the image.
+        """
+        return await asyncio.wrap_future(self.submit(im))
+
+    def metrics(self):
+        """
+        Return serving metrics.
+
+        Returns:
+            (dict): Current and maximum queue depth, number of requests and batches, batch-size histogram, mean batch
+                size, mean request latency in ms and mean per-image preprocess, inference and postprocess speed in ms.
+        """
+        batches = sum(self.batch_sizes.values())
+        n = max(self.requests, 1)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "batches": batches,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "mean_batch_size": self.requests / max(batches, 1),
+            "latency": self.latency * 1e3 / n,
+            "speed": {k: x.t * 1e3 / n for k, x in zip(("preprocess", "inference", "postprocess"), self.profilers)},
+        }
+
+    def _next_batch(self):
+        """Collect up to `max_batch` requests, waiting at most `max_wait` seconds after the first one arrived."""
+        try:
+            batch = [self.queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self.queue.get(timeout=max(deadline - time.perf_counter(), 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    @staticmethod
+    def _load(im):
+        """Load a request image as a BGR numpy array."""
+        if isinstance(im, (str, Path)):
+            x = imread(str(im))
+            if x is None:
+                raise FileNotFoundError(f"Image Not Found {im}")
+            return x
+        if isinstance(im, (bytes, bytearray)):
+            x = cv2.imdecode(np.frombuffer(im, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if x is None:
+                raise ValueError("Could not decode image bytes.")
+            return x
+        return LoadPilAndNumpy._single_check(im)
+
+    def _run(self):
+        """Worker loop batching queued requests until the server is stopped."""
+        while self._running.is_set():
+            ims, todo = [], []
+            for im, future, t in self._next_batch():
+                if not future.set_running_or_notify_cancel():  # cancelled by the caller
+                    continue
+                try:
+                    ims.append(self._load(im))
+                    todo.append((future, t))
+                except Exception as e:
+                    future.set_exception(e)
+            if not ims:
+                continue
+            try:
+                results = self._predict_batch(ims)
+            except Exception as e:
+                for future, _ in todo:
+                    future.set_exception(e)
+                continue
+            t = time.perf_counter()
+            for r, (future, t0) in zip(results, todo):
+                future.set_result(r)
+                self.latency += t - t0
+            self.requests += len(todo)
+            self.batch_sizes[len(todo)] += 1
+
+    @smart_inference_mode()
+    def _predict_batch(self, ims):
+        """Run one batched preprocess, inference and postprocess pass over a list of BGR images."""
+        predictor, n = self.predictor, len(ims)
+        predictor.batch = ([f"image{i}.jpg" for i in range(n)], ims, [""] * n)
+        with self.profilers[0]:
+            im = predictor.preprocess(ims)
+        with self.profilers[1]:
+            preds = predictor.inference(im)
+        with self.profilers[2]:
+            results = predictor.postprocess(preds, im, ims)
+        for r in results:
+            r.speed = {k: x.dt * 1e3 / n for k, x in zip(("preprocess", "inference", "postprocess"), self.profilers)}
+        return results
+
+    def serve(self, host="127.0.0.1", port=8000):
+        """
+        Serve predictions over a local HTTP server until interrupted.
+
+        `POST /predict` with encoded image bytes as the body returns the JSON summary of the detections, and
+        `GET /metrics` returns the serving metrics. Every connection is handled in its own thread, so concurrent
+        requests are batched by the server.
+
+        Args:
+            host (str): Host address to bind.
+            port (int): Port to bind, 0 for any free port.
+        """
+        httpd = self.http_server(host, port)
+        LOGGER.info(f"{colorstr('InferenceServer:')} serving on http://{host}:{httpd.server_address[1]}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+            self.stop()
+
+    def http_server(self, host="127.0.0.1", port=0):
+        """
+        Create a threading HTTP server for this inference server without starting its loop.
+
+        Args:
+            host (str): Host address to bind.
+            port (int): Port to bind, 0 for any free port.
+
+        Returns:
+            (http.server.ThreadingHTTPServer): HTTP server, run with `serve_forever()` and stop with `shutdown()`.
+        """
+        server = self.start()
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler forwarding images to the inference server."""
+
+            def _reply(self, code, body):
+                """Send a JSON response."""
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                """Return serving metrics."""
+                if self.path == "/metrics":
+                    self._reply(200, server.metrics())
+                else:
+                    self._reply(404, {"error": f"Unknown path {self.path}"})
+
+            def do_POST(self):
+                """Predict the posted image bytes."""
+                if self.path != "/predict":
+                    return self._reply(404, {"error": f"Unknown path {self.path}"})
+                try:
+                    data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                    self._reply(200, server.predict(data).summary())
+                except Exception as e:
+                    self._reply(400, {"error": str(e)})
+
+            def log_message(self, *args):
+                """Silence per-request logging."""
+
+        return ThreadingHTTPServer((host, port), Handler)
@@ -12,7 +12,7 @@ import os
 import subprocess
 import time
 import warnings
-from copy import copy, deepcopy
+from copy import copy
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -23,6 +23,7 @@ from torch import nn, optim
 
 from ultralytics import __version__
 from ultralytics.cfg import get_cfg, get_save_dir
+from ultralytics.data.build import BatchPrefetcher, batch_to_device, build_dataloader
 from ultralytics.data.utils import check_cls_dataset, check_det_dataset
 from ultralytics.nn.tasks import attempt_load_one_weight, attempt_load_weights
 from ultralytics.utils import (
@@ -43,10 +44,10 @@ from ultralytics.utils.dist import ddp_cleanup, generate_ddp_command
 from ultralytics.utils.files import get_latest_run
 from ultralytics.utils.torch_utils import (
     TORCH_2_4,
+    CheckpointWriter,
     EarlyStopping,
     ModelEMA,
     autocast,
-    convert_optimizer_state_dict_to_fp16,
     init_seeds,
     one_cycle,
     select_device,
@@ -71,6 +72,8 @@ class BaseTrainer:
         best (Path): Path to the best checkpoint.
         save_period (int): Save checkpoint every x epochs (disabled if < 1).
         batch_size (int): Batch size for training.
+        autobatch (float | None): Requested automatic batch size (-1 or memory fraction), None for a fixed batch size.
+        train_imgsz (int): Current training image size, reduced in early epochs by progressive resizing.
         epochs (int): Number of epochs to train for.
         start_epoch (int): Starting epoch for training.
         device (torch.device): Device to use for training.
@@ -120,6 +123,7 @@ class BaseTrainer:
             yaml_save(self.save_dir / "args.yaml", vars(self.args))  # save run args
         self.last, self.best = self.wdir / "last.pt", self.wdir / "best.pt"  # checkpoint paths
         self.save_period = self.args.save_period
+        self.ckpt_writer = CheckpointWriter()  # writes checkpoints in a background thread
 
         self.batch_size = self.args.batch
         self.epochs = self.args.epochs or 100  # in case users accidentally pass epochs=None with timed training
@@ -282,23 +286,31 @@ class BaseTrainer:
         self.stride = gs  # for multiscale training
 
         # Batch size
-        if self.batch_size < 1 and RANK == -1:  # single-GPU only, estimate best batch size
+        self.train_imgsz = self.args.imgsz  # reduced in early epochs by progressive resizing
+        self.autobatch = self.batch_size if self.batch_size < 1 and RANK == -1 else None  # single-GPU only
+        if self.autobatch is not None:  # estimate best batch size
             self.args.batch = self.batch_size = self.auto_batch()
 
         # Dataloaders
         batch_size = self.batch_size // max(world_size, 1)
         self.train_loader = self.get_dataloader(self.trainset, batch_size=batch_size, rank=LOCAL_RANK, mode="train")
-        if RANK in {-1, 0}:
-            # Note: When training DOTA dataset, double batch size could get OOM on images with >2000 objects.
-            self.test_loader = self.get_dataloader(
-                self.testset, batch_size=batch_size if self.args.task == "obb" else batch_size * 2, rank=-1, mode="val"
-            )
-            self.validator = self.get_validator()
-            metric_keys = self.validator.metrics.keys + self.label_loss_items(prefix="val")
-            self.metrics = dict(zip(metric_keys, [0] * len(metric_keys)))
-            self.ema = ModelEMA(self.model)
-            if self.args.plots:
-                self.plot_training_labels()
+        # Note: When training DOTA dataset, double batch size could get OOM on images with >2000 objects.
+        self.test_loader = self.get_dataloader(  # DDP ranks validate disjoint shards of the val set
+            self.testset,
+            batch_size=batch_size if self.args.task == "obb" else batch_size * 2,
+            rank=LOCAL_RANK,
+            mode="val",
+        )
+        datasets = getattr(self.train_loader.dataset, "datasets", [self.train_loader.dataset])
+        if self.args.progressive and (self.args.rect or not all(hasattr(d, "set_imgsz") for d in datasets)):
+            LOGGER.warning("'progressive' is not supported for rect training or this dataset, using full imgsz")
+            self.args.progressive = 0.0
+        self.validator = self.get_validator()
+        metric_keys = self.validator.metrics.keys + self.label_loss_items(prefix="val")
+        self.metrics = dict(zip(metric_keys, [0] * len(metric_keys)))
+        self.ema = ModelEMA(self.model, every=self.args.ema_steps, device=self.args.ema_device)
+        if RANK in {-1, 0} and self.args.plots:
+            self.plot_training_labels()
 
         # Optimizer
         self.accumulate = max(round(self.args.nbs / self.batch_size), 1)  # accumulate loss before optimizing
@@ -351,17 +363,21 @@ class BaseTrainer:
                 self.scheduler.step()
 
             self._model_train()
-            if RANK != -1:
+            imgsz = self._progressive_imgsz(epoch)
+            if imgsz != self.train_imgsz:  # progressive resizing stage boundary
+                self._set_train_imgsz(imgsz)
+                nb = len(self.train_loader)
+            if hasattr(self.train_loader.sampler, "set_epoch"):  # DistributedSampler or ShardSampler
                 self.train_loader.sampler.set_epoch(epoch)
-            pbar = enumerate(self.train_loader)
             # Update dataloader attributes (optional)
             if epoch == (self.epochs - self.args.close_mosaic):
                 self._close_dataloader_mosaic()
                 self.train_loader.reset()
 
+            pbar = enumerate(BatchPrefetcher(self.train_loader, self.device))  # next batch copied during compute
             if RANK in {-1, 0}:
                 LOGGER.info(self.progress_string())
-                pbar = TQDM(enumerate(self.train_loader), total=nb)
+                pbar = TQDM(pbar, total=nb)
             self.tloss = None
             for i, batch in pbar:
                 self.run_callbacks("on_train_batch_start")
@@ -428,15 +444,21 @@ class BaseTrainer:
 
             self.lr = {f"lr/pg{ir}": x["lr"] for ir, x in enumerate(self.optimizer.param_groups)}  # for loggers
             self.run_callbacks("on_train_epoch_end")
-            if RANK in {-1, 0}:
-                final_epoch = epoch + 1 >= self.epochs
-                self.ema.update_attr(self.model, include=["yaml", "nc", "args", "names", "stride", "class_weights"])
+            final_epoch = epoch + 1 >= self.epochs
+            self.ema.flush()  # apply a pending update of an EMA kept on another device
+            self.ema.update_attr(self.model, include=["yaml", "nc", "args", "names", "stride", "class_weights"])
 
-                # Validation
-                if self.args.val or final_epoch or self.stopper.possible_stop or self.stop:
-                    self.metrics, self.fitness = self.validate()
+            # Validation, sharded across all DDP ranks which then hold the same metrics
+            validate = self.args.val or final_epoch or self.stopper.possible_stop or self.stop
+            if RANK != -1:  # if DDP training
+                broadcast_list = [validate if RANK == 0 else None]
+                dist.broadcast_object_list(broadcast_list, 0)  # all ranks must join the validation
+                validate = broadcast_list[0]
+            if validate:
+                self.metrics, self.fitness = self.validate()
+            self.stop |= self.stopper(epoch + 1, self.fitness) or final_epoch
+            if RANK in {-1, 0}:
                 self.save_metrics(metrics={**self.label_loss_items(self.tloss), **self.metrics, **self.lr})
-                self.stop |= self.stopper(epoch + 1, self.fitness) or final_epoch
                 if self.args.time:
                     self.stop |= (time.time() - self.train_time_start) > (self.args.time * 3600)
 
@@ -469,10 +491,16 @@ class BaseTrainer:
             epoch += 1
 
         if RANK in {-1, 0}:
-            # Do final val with best.pt
+            self.ckpt_writer.wait()  # flush the last checkpoint save
             seconds = time.time() - self.train_time_start
             LOGGER.info(f"\n{epoch - self.start_epoch + 1} epochs completed in {seconds / 3600:.3f} hours.")
-            self.final_eval()
+            if self.ckpt_writer.saves:
+                LOGGER.info(
+                    f"{self.ckpt_writer.saves} checkpoint saves stalled training for {self.ckpt_writer.stall:.2f}s "
+                    f"({self.ckpt_writer.stall / self.ckpt_writer.saves:.3f}s per save)"
+                )
+        self.final_eval()  # final val with best.pt, sharded across DDP ranks
+        if RANK in {-1, 0}:
             if self.args.plots:
                 self.plot_metrics()
             self.run_callbacks("on_train_end")
@@ -484,7 +512,7 @@ class BaseTrainer:
         """Calculate optimal batch size based on model and device memory constraints."""
         return check_train_batch_size(
             model=self.model,
-            imgsz=self.args.imgsz,
+            imgsz=self.train_imgsz,
             amp=self.amp,
             batch=self.batch_size,
             max_num_obj=max_num_obj,
@@ -528,20 +556,23 @@ class BaseTrainer:
                 m.eval()
 
     def save_model(self):
-        """Save model training checkpoints with additional metadata."""
-        import io
-
-        # Serialize ckpt to a byte buffer once (faster than repeated torch.save() calls)
-        buffer = io.BytesIO()
-        torch.save(
+        """Save model training checkpoints with additional metadata, serialized and written in a background thread."""
+        files = [self.last]
+        if self.best_fitness == self.fitness:
+            files.append(self.best)  # save best.pt
+        if (self.save_period > 0) and (self.epoch % self.save_period == 0):
+            files.append(self.wdir / f"epoch{self.epoch}.pt")  # save epoch, i.e. 'epoch3.pt'
+        # if self.args.close_mosaic and self.epoch == (self.epochs - self.args.close_mosaic - 1):
+        #    files.append(self.wdir / "last_mosaic.pt")  # save mosaic checkpoint
+        self.ckpt_writer.save(
             {
                 "epoch": self.epoch,
                 "best_fitness": self.best_fitness,
                 "model": None,  # resume and final checkpoints derive from EMA
-                "ema": deepcopy(self.ema.ema).half(),
+                "ema": self.ema.ema,  # snapshot in FP16
                 "updates": self.ema.updates,
-                "optimizer": convert_optimizer_state_dict_to_fp16(deepcopy(self.optimizer.state_dict())),
-                "train_args": vars(self.args),  # save as dict
+                "optimizer": self.optimizer.state_dict(),  # snapshot with FP16 state
+                "train_args": dict(vars(self.args)),  # save as dict
                 "train_metrics": {**self.metrics, **{"fitness": self.fitness}},
                 "train_results": self.read_results_csv(),
                 "date": datetime.now().isoformat(),
@@ -549,18 +580,8 @@ class BaseTrainer:
                 "license": "AGPL-3.0 (https://ultralytics.com/license)",
                 "docs": "https://docs.ultralytics.com",
             },
-            buffer,
+            files,
         )
-        serialized_ckpt = buffer.getvalue()  # get the serialized content to save
-
-        # Save checkpoints
-        self.last.write_bytes(serialized_ckpt)  # save last.pt
-        if self.best_fitness == self.fitness:
-            self.best.write_bytes(serialized_ckpt)  # save best.pt
-        if (self.save_period > 0) and (self.epoch % self.save_period == 0):
-            (self.wdir / f"epoch{self.epoch}.pt").write_bytes(serialized_ckpt)  # save epoch, i.e. 'epoch3.pt'
-        # if self.args.close_mosaic and self.epoch == (self.epochs - self.args.close_mosaic - 1):
-        #    (self.wdir / "last_mosaic.pt").write_bytes(serialized_ckpt)  # save mosaic checkpoint
 
     def get_dataset(self):
         """
@@ -621,8 +642,8 @@ class BaseTrainer:
             self.ema.update(self.model)
 
     def preprocess_batch(self, batch):
-        """Allows custom preprocessing model inputs and ground truths depending on task type."""
-        return batch
+        """Move the batch to the device and normalize images, subclasses add task-specific preprocessing."""
+        return batch_to_device(batch, self.device)
 
     def validate(self):
         """
@@ -702,20 +723,21 @@ class BaseTrainer:
         self.plots[path] = {"data": data, "timestamp": time.time()}
 
     def final_eval(self):
-        """Perform final evaluation and validation for object detection YOLO model."""
-        ckpt = {}
-        for f in self.last, self.best:
-            if f.exists():
-                if f is self.last:
-                    ckpt = strip_optimizer(f)
-                elif f is self.best:
-                    k = "train_results"  # update best.pt train_metrics from last.pt
-                    strip_optimizer(f, updates={k: ckpt[k]} if k in ckpt else None)
-                    LOGGER.info(f"\nValidating {f}...")
-                    self.validator.args.plots = self.args.plots
-                    self.metrics = self.validator(model=f)
-                    self.metrics.pop("fitness", None)
-                    self.run_callbacks("on_fit_epoch_end")
+        """Perform final evaluation and validation for object detection YOLO model, sharded across DDP ranks."""
+        if RANK in {-1, 0}:
+            ckpt = strip_optimizer(self.last) if self.last.exists() else {}
+            if self.best.exists():
+                k = "train_results"  # update best.pt train_metrics from last.pt
+                strip_optimizer(self.best, updates={k: ckpt[k]} if k in ckpt else None)
+        if RANK != -1:
+            dist.barrier()  # checkpoints are stripped before all ranks load best.pt
+        if self.best.exists():
+            LOGGER.info(f"\nValidating {self.best}...")
+            self.validator.args.plots = self.args.plots
+            self.metrics = self.validator(model=self.best)
+            self.metrics.pop("fitness", None)
+            if RANK in {-1, 0}:
+                self.run_callbacks("on_fit_epoch_end")
 
     def check_resume(self, overrides):
         """Check if resume checkpoint exists and update arguments accordingly."""
@@ -784,6 +806,41 @@ class BaseTrainer:
             LOGGER.info("Closing dataloader mosaic")
             self.train_loader.dataset.close_mosaic(hyp=copy(self.args))
 
+    def _progressive_imgsz(self, epoch):
+        """
+        Return the training image size of an epoch under the progressive resizing schedule.
+
+        The first `progressive` fraction of the epochs is split into 4 equal stages trained at 0.5, 0.625, 0.75 and
+        0.875 times `imgsz`, rounded up to the grid size, the remaining epochs train at the full `imgsz`.
+        """
+        n = round(self.args.progressive * self.epochs)  # number of progressive epochs
+        if epoch >= n:
+            return self.args.imgsz
+        return math.ceil(self.args.imgsz * (0.5 + 0.125 * (4 * epoch // n)) / self.stride) * self.stride
+
+    def _set_train_imgsz(self, imgsz):
+        """Switch training to a new image size, updating dataset, transforms, batch size and optimizer settings."""
+        self.train_imgsz = imgsz
+        dataset = self.train_loader.dataset
+        if self.autobatch is not None:  # estimate best batch size at the new image size
+            self._clear_memory()
+            self.batch_size = self.autobatch
+            self.args.batch = self.batch_size = self.auto_batch()
+            if self.batch_size != self.train_loader.batch_size:
+                self.train_loader = build_dataloader(dataset, self.batch_size, self.args.workers, rank=LOCAL_RANK)
+                self.accumulate = max(round(self.args.nbs / self.batch_size), 1)  # same nominal batch size
+                weight_decay = self.args.weight_decay * self.batch_size * self.accumulate / self.args.nbs
+                for g in self.optimizer.param_groups:
+                    if g["weight_decay"]:  # param group with weight decay
+                        g["weight_decay"] = weight_decay
+        for d in getattr(dataset, "datasets", [dataset]):
+            d.set_imgsz(imgsz)
+            d.transforms = d.build_transforms(hyp=copy(self.args))
+        if self.epoch > self.epochs - self.args.close_mosaic:  # keep mosaic closed in the transforms rebuilt above
+            self._close_dataloader_mosaic()
+        self.train_loader.reset()
+        LOGGER.info(f"Progressive resizing to imgsz={imgsz}, batch={self.batch_size}")
+
     def build_optimizer(self, model, name="auto", lr=0.001, momentum=0.9, decay=1e-5, iterations=1e5):
         """
         Construct an optimizer for the given model.
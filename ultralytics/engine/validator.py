@@ -5,6 +5,9 @@ Check a model's accuracy on a test or val split of a dataset.
 Usage:
     $ yolo mode=val model=yolo11n.pt data=coco8.yaml imgsz=640
 
+Usage - sharded across processes that joined a torch.distributed process group, e.g. launched with torchrun:
+    $ torchrun --nproc_per_node 4 val.py  # where val.py calls YOLO("yolo11n.pt").val(data="coco8.yaml")
+
 Usage - formats:
     $ yolo mode=val model=yolo11n.pt                 # PyTorch
                           yolo11n.torchscript        # TorchScript
@@ -25,10 +28,12 @@ Usage - formats:
 
 import json
 import time
+from copy import deepcopy
 from pathlib import Path
 
 import numpy as np
 import torch
+import torch.distributed as dist
 
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data.utils import check_cls_dataset, check_det_dataset
@@ -58,6 +63,8 @@ class BaseValidator:
         names (dict): Class names mapping.
         seen (int): Number of images seen so far during validation.
         stats (dict): Statistics collected during validation.
+        world_size (int): Number of ranks of a sharded validation, each evaluating a disjoint slice of the data.
+        rank (int): Rank of this process in a sharded validation, results are reduced and finalized on rank 0.
         confusion_matrix: Confusion matrix for classification evaluation.
         nc (int): Number of classes.
         iouv (torch.Tensor): IoU thresholds from 0.50 to 0.95 in spaces of 0.05.
@@ -80,6 +87,9 @@ class BaseValidator:
         init_metrics: Initialize performance metrics for the YOLO model.
         update_metrics: Update metrics based on predictions and batch.
         finalize_metrics: Finalize and return all metrics.
+        gather_stats: Gather the results of all ranks of a sharded validation on rank 0.
+        get_shard_results: Return the results of this rank to be gathered.
+        merge_shard_results: Merge the gathered results of all ranks.
         get_stats: Return statistics about the model's performance.
         check_stats: Check statistics.
         print_results: Print the results of the model's predictions.
@@ -113,6 +123,7 @@ class BaseValidator:
         self.names = None
         self.seen = None
         self.stats = None
+        self.world_size, self.rank = 1, 0
         self.confusion_matrix = None
         self.nc = None
         self.iouv = None
@@ -141,6 +152,8 @@ class BaseValidator:
             stats (dict): Dictionary containing validation statistics.
         """
         self.training = trainer is not None
+        self.world_size = dist.get_world_size() if dist.is_available() and dist.is_initialized() else 1
+        self.rank = dist.get_rank() if self.world_size > 1 else 0
         augment = self.args.augment and (not self.training)
         if self.training:
             self.device = trainer.device
@@ -148,6 +161,8 @@ class BaseValidator:
             # Force FP16 val during training
             self.args.half = self.device.type != "cpu" and trainer.amp
             model = trainer.ema.ema or trainer.model
+            if next(model.parameters()).device != self.device:  # EMA kept on another device
+                model = deepcopy(model).to(self.device)
             model = model.half() if self.args.half else model.float()
             # self.model = model
             self.loss = torch.zeros_like(trainer.loss_items, device=trainer.device)
@@ -157,9 +172,12 @@ class BaseValidator:
             if str(self.args.model).endswith(".yaml") and model is None:
                 LOGGER.warning("validating an untrained model YAML will result in 0 mAP.")
             callbacks.add_integration_callbacks(self)
+            device = select_device(self.args.device, self.args.batch)
+            if self.world_size > 1 and device.type == "cuda":
+                device = torch.device("cuda", self.rank % torch.cuda.device_count())  # one GPU per rank
             model = AutoBackend(
                 weights=model or self.args.model,
-                device=select_device(self.args.device, self.args.batch),
+                device=device,
                 dnn=self.args.dnn,
                 data=self.args.data,
                 fp16=self.args.half,
@@ -223,21 +241,27 @@ class BaseValidator:
                 preds = self.postprocess(preds)
 
             self.update_metrics(preds, batch)
-            if self.args.plots and batch_i < 3:
+            if self.args.plots and batch_i < 3 and self.rank == 0:
                 self.plot_val_samples(batch, batch_i)
                 self.plot_predictions(batch, preds, batch_i)
 
             self.run_callbacks("on_val_batch_end")
+        if self.world_size > 1:
+            self.gather_stats()
+            if self.rank:  # the results of the whole dataset are finalized on rank 0 and broadcast to all ranks
+                if self.training:
+                    model.float()
+                return self.broadcast_stats(None)
         stats = self.get_stats()
         self.check_stats(stats)
-        self.speed = dict(zip(self.speed.keys(), (x.t / len(self.dataloader.dataset) * 1e3 for x in dt)))
+        self.speed = dict(zip(self.speed.keys(), (x.t / len(self.dataloader.sampler) * 1e3 for x in dt)))
         self.finalize_metrics()
         self.print_results()
         self.run_callbacks("on_val_end")
         if self.training:
             model.float()
             results = {**stats, **trainer.label_loss_items(self.loss.cpu() / len(self.dataloader), prefix="val")}
-            return {k: round(float(v), 5) for k, v in results.items()}  # return results as 5 decimal place floats
+            return self.broadcast_stats({k: round(float(v), 5) for k, v in results.items()})  # 5 decimal place floats
         else:
             LOGGER.info(
                 "Speed: {:.1f}ms preprocess, {:.1f}ms inference, {:.1f}ms loss, {:.1f}ms postprocess per image".format(
@@ -251,7 +275,40 @@ class BaseValidator:
                 stats = self.eval_json(stats)  # update stats
             if self.args.plots or self.args.save_json:
                 LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}")
-            return stats
+            return self.broadcast_stats(stats)
+
+    def gather_stats(self):
+        """Gather the results of all ranks of a sharded validation on rank 0, before the metrics are computed."""
+        results = [None] * self.world_size if self.rank == 0 else None
+        dist.gather_object(self.get_shard_results(), results, dst=0)
+        if self.rank == 0:
+            self.merge_shard_results(results)
+
+    def get_shard_results(self):
+        """Return the results of this rank to be gathered on rank 0, extended by task validators."""
+        return {
+            "seen": self.seen,
+            "jdict": self.jdict,
+            "loss": self.loss.cpu() if self.training else None,
+            "batches": len(self.dataloader),
+        }
+
+    def merge_shard_results(self, results):
+        """Merge the gathered results of all ranks, in rank order, into the results of rank 0."""
+        if self.seen is not None:
+            self.seen = sum(r["seen"] for r in results)
+        self.jdict = [x for r in results for x in r["jdict"]]
+        if self.training:  # mean over the batches of all ranks, later divided by the number of batches of this rank
+            batches = sum(r["batches"] for r in results)
+            self.loss = sum(r["loss"] for r in results).to(self.device) * len(self.dataloader) / batches
+
+    def broadcast_stats(self, stats):
+        """Return the stats of rank 0 on all ranks of a sharded validation."""
+        if self.world_size > 1:
+            stats = [stats]
+            dist.broadcast_object_list(stats, src=0)
+            stats = stats[0]
+        return stats
 
     def match_predictions(
         self, pred_classes: torch.Tensor, true_classes: torch.Tensor, iou: torch.Tensor, use_scipy: bool = False
@@ -100,6 +100,7 @@ class Predictor(BasePredictor):
         overrides.update(dict(task="segment", mode="predict", batch=1))
         super().__init__(cfg, overrides, _callbacks)
         self.args.retina_masks = True
+        self.args.pipeline = False  # prompts and image features are per-image state shared across stages
         self.im = None
         self.features = None
         self.prompts = {}
@@ -204,7 +205,9 @@ class Predictor(BasePredictor):
 
         return self.prompt_inference(im, bboxes, points, labels, masks, multimask_output)
 
-    def prompt_inference(self, im, bboxes=None, points=None, labels=None, masks=None, multimask_output=False):
+    def prompt_inference(
+        self, im, bboxes=None, points=None, labels=None, masks=None, multimask_output=False, img_idx=-1
+    ):
         """
         Performs image segmentation inference based on input cues using SAM's specialized architecture.
 
@@ -218,6 +221,8 @@ class Predictor(BasePredictor):
             labels (np.ndarray | List | None): Point prompt labels with shape (N) or (N, num_points). 1 for foreground, 0 for background.
             masks (np.ndarray | None): Low-res masks from previous predictions with shape (N, H, W). For SAM, H=W=256.
             multimask_output (bool): Flag to return multiple masks for ambiguous prompts.
+            img_idx (int | torch.Tensor): Index of the image in the batch to process, or a tensor with one image index
+                per prompt to decode prompts from different images in a single batch.
 
         Raises:
             AssertionError: If the number of points don't match the number of labels, in case labels were passed.
@@ -233,6 +238,7 @@ class Predictor(BasePredictor):
             >>> masks, scores, logits = predictor.prompt_inference(im, bboxes=bboxes)
         """
         features = self.get_im_features(im) if self.features is None else self.features
+        features = features[img_idx] if isinstance(img_idx, torch.Tensor) else features[img_idx].unsqueeze(0)
 
         bboxes, points, labels, masks = self._prepare_prompts(im.shape[2:], bboxes, points, labels, masks)
         points = (points, labels) if points is not None else None
@@ -313,6 +319,8 @@ class Predictor(BasePredictor):
 
         This method segments an entire image into constituent parts by leveraging SAM's advanced architecture
         and real-time performance capabilities. It can optionally work on image crops for finer segmentation.
+        All crops are encoded in a single batched encoder call, point prompts of all crops are decoded together in
+        fused batches, and masks are filtered on low-resolution logits so that only surviving masks are upsampled.
 
         Args:
             im (torch.Tensor): Input tensor representing the preprocessed image with shape (N, C, H, W).
@@ -321,7 +329,7 @@ class Predictor(BasePredictor):
             crop_downscale_factor (int): Scaling factor for sampled points-per-side in each layer.
             point_grids (List[np.ndarray] | None): Custom grids for point sampling normalized to [0,1].
             points_stride (int): Number of points to sample along each side of the image.
-            points_batch_size (int): Batch size for the number of points processed simultaneously.
+            points_batch_size (int): Batch size for the number of points processed simultaneously across crops.
             conf_thres (float): Confidence threshold [0,1] for filtering based on mask quality prediction.
             stability_score_thresh (float): Stability threshold [0,1] for mask filtering based on stability.
             stability_score_offset (float): Offset value for calculating stability score.
@@ -344,40 +352,70 @@ class Predictor(BasePredictor):
         crop_regions, layer_idxs = generate_crop_boxes((ih, iw), crop_n_layers, crop_overlap_ratio)
         if point_grids is None:
             point_grids = build_all_layer_point_grids(points_stride, crop_n_layers, crop_downscale_factor)
-        pred_masks, pred_scores, pred_bboxes, region_areas = [], [], [], []
-        for crop_region, layer_idx in zip(crop_regions, layer_idxs):
-            x1, y1, x2, y2 = crop_region
-            w, h = x2 - x1, y2 - y1
-            area = torch.tensor(w * h, device=im.device)
-            points_scale = np.array([[w, h]])  # w, h
-            # Crop image and interpolate to input size
-            crop_im = F.interpolate(im[..., y1:y2, x1:x2], (ih, iw), mode="bilinear", align_corners=False)
-            # (num_points, 2)
-            points_for_image = point_grids[layer_idx] * points_scale
-            crop_masks, crop_scores, crop_bboxes = [], [], []
-            for (points,) in batch_iterator(points_batch_size, points_for_image):
-                pred_mask, pred_score = self.prompt_inference(crop_im, points=points, multimask_output=True)
-                # Interpolate predicted masks to input size
-                pred_mask = F.interpolate(pred_mask[None], (h, w), mode="bilinear", align_corners=False)[0]
+
+        # Encode all crops in one batch, each crop interpolated to input size. The first crop is the full image.
+        if len(crop_regions) == 1 and self.features is not None:
+            features = self.features
+        else:
+            crop_ims = [
+                F.interpolate(im[..., y1:y2, x1:x2], (ih, iw), mode="bilinear", align_corners=False)
+                for x1, y1, x2, y2 in crop_regions
+            ]
+            features = self.get_im_features(torch.cat(crop_ims))
+        # Point prompts of all crops and layers, (num_points, 2) in crop pixels, and the crop index of each point
+        points = np.concatenate(
+            [point_grids[j] * np.array([[x2 - x1, y2 - y1]]) for (x1, y1, x2, y2), j in zip(crop_regions, layer_idxs)]
+        )
+        crop_idxs = np.concatenate([np.full(len(point_grids[j]), i) for i, j in enumerate(layer_idxs)])
+
+        # Decode prompts across crops in fused batches and filter on low-resolution masks
+        lowres_masks, lowres_scores, lowres_idxs = [], [], []
+        image_features, self.features = self.features, features
+        try:
+            for points_batch, idxs in batch_iterator(points_batch_size, points, crop_idxs):
+                idxs = torch.as_tensor(idxs, device=im.device)
+                pred_mask, pred_score = self.prompt_inference(
+                    im, points=points_batch, multimask_output=True, img_idx=idxs
+                )
+                idxs = idxs.repeat_interleave(len(pred_mask) // len(idxs))
                 idx = pred_score > conf_thres
-                pred_mask, pred_score = pred_mask[idx], pred_score[idx]
+                pred_mask, pred_score, idxs = pred_mask[idx], pred_score[idx], idxs[idx]
 
                 stability_score = calculate_stability_score(
                     pred_mask, self.model.mask_threshold, stability_score_offset
                 )
                 idx = stability_score > stability_score_thresh
-                pred_mask, pred_score = pred_mask[idx], pred_score[idx]
+                lowres_masks.append(pred_mask[idx])
+                lowres_scores.append(pred_score[idx])
+                lowres_idxs.append(idxs[idx])
+        finally:
+            self.features = image_features
+        lowres_masks = torch.cat(lowres_masks)
+        lowres_scores = torch.cat(lowres_scores)
+        lowres_idxs = torch.cat(lowres_idxs)
+
+        # Upsample surviving masks to crop size, then filter and do NMS within each crop
+        pred_masks, pred_scores, pred_bboxes, region_areas = [], [], [], []
+        for i, crop_region in enumerate(crop_regions):
+            x1, y1, x2, y2 = crop_region
+            w, h = x2 - x1, y2 - y1
+            crop_masks, crop_scores, crop_bboxes = [], [], []
+            for pred_mask, pred_score in batch_iterator(
+                points_batch_size, lowres_masks[lowres_idxs == i], lowres_scores[lowres_idxs == i]
+            ):
                 # Bool type is much more memory-efficient.
-                pred_mask = pred_mask > self.model.mask_threshold
+                pred_mask = (
+                    F.interpolate(pred_mask[None], (h, w), mode="bilinear", align_corners=False)[0]
+                    > self.model.mask_threshold
+                )
                 # (N, 4)
                 pred_bbox = batched_mask_to_box(pred_mask).float()
                 keep_mask = ~is_box_near_crop_edge(pred_bbox, crop_region, [0, 0, iw, ih])
-                if not torch.all(keep_mask):
-                    pred_bbox, pred_mask, pred_score = pred_bbox[keep_mask], pred_mask[keep_mask], pred_score[keep_mask]
-
-                crop_masks.append(pred_mask)
-                crop_bboxes.append(pred_bbox)
-                crop_scores.append(pred_score)
+                crop_masks.append(pred_mask[keep_mask])
+                crop_bboxes.append(pred_bbox[keep_mask])
+                crop_scores.append(pred_score[keep_mask])
+            if not crop_masks:
+                continue
 
             # Do nms within this crop
             crop_masks = torch.cat(crop_masks)
@@ -391,7 +429,9 @@ class Predictor(BasePredictor):
             pred_masks.append(crop_masks)
             pred_bboxes.append(crop_bboxes)
             pred_scores.append(crop_scores)
-            region_areas.append(area.expand(len(crop_masks)))
+            region_areas.append(torch.tensor(w * h, device=im.device).expand(len(crop_masks)))
+        if not pred_masks:  # no masks survived filtering
+            return lowres_masks.new_zeros((0, ih, iw), dtype=torch.bool), lowres_scores, lowres_scores.new_zeros(0, 4)
 
         pred_masks = torch.cat(pred_masks)
         pred_bboxes = torch.cat(pred_bboxes)
@@ -684,7 +724,8 @@ class SAM2Predictor(Predictor):
             labels (np.ndarray | List[int] | None): Point prompt labels with shape (N,). 1 = foreground, 0 = background.
             masks (np.ndarray | None): Low-resolution masks from previous predictions with shape (N, H, W).
             multimask_output (bool): Flag to return multiple masks for ambiguous prompts.
-            img_idx (int): Index of the image in the batch to process.
+            img_idx (int | torch.Tensor): Index of the image in the batch to process, or a tensor with one image index
+                per prompt to decode prompts from different images in a single batch.
 
         Returns:
             (np.ndarray): Output masks with shape (C, H, W), where C is the number of generated masks.
@@ -713,10 +754,16 @@ class SAM2Predictor(Predictor):
             masks=masks,
         )
         # Predict masks
-        batched_mode = points is not None and points[0].shape[0] > 1  # multi object prediction
-        high_res_features = [feat_level[img_idx].unsqueeze(0) for feat_level in features["high_res_feats"]]
+        if isinstance(img_idx, torch.Tensor):  # one image per prompt
+            batched_mode = False
+            image_embed = features["image_embed"][img_idx]
+            high_res_features = [feat_level[img_idx] for feat_level in features["high_res_feats"]]
+        else:
+            batched_mode = points is not None and points[0].shape[0] > 1  # multi object prediction
+            image_embed = features["image_embed"][img_idx].unsqueeze(0)
+            high_res_features = [feat_level[img_idx].unsqueeze(0) for feat_level in features["high_res_feats"]]
         pred_masks, pred_scores, _, _ = self.model.sam_mask_decoder(
-            image_embeddings=features["image_embed"][img_idx].unsqueeze(0),
+            image_embeddings=image_embed,
             image_pe=self.model.sam_prompt_encoder.get_dense_pe(),
             sparse_prompt_embeddings=sparse_embeddings,
             dense_prompt_embeddings=dense_embeddings,
@@ -803,7 +850,7 @@ class SAM2Predictor(Predictor):
         if self.model.directly_add_no_mem_embed:
             vision_feats[-1] = vision_feats[-1] + self.model.no_mem_embed
         feats = [
-            feat.permute(1, 2, 0).view(1, -1, *feat_size)
+            feat.permute(1, 2, 0).view(len(im), -1, *feat_size)
             for feat, feat_size in zip(vision_feats[::-1], self._bb_feat_sizes[::-1])
         ][::-1]
         return {"image_embed": feats[-1], "high_res_feats": feats[:-1]}
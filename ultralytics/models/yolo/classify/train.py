@@ -3,6 +3,7 @@
 from copy import copy
 
 import torch
+from torch import distributed as dist
 
 from ultralytics.data import ClassificationDataset, build_dataloader
 from ultralytics.engine.trainer import BaseTrainer
@@ -32,7 +33,6 @@ class ClassificationTrainer(BaseTrainer):
         setup_model: Load, create or download model for classification.
         build_dataset: Create a ClassificationDataset instance.
         get_dataloader: Return PyTorch DataLoader with transforms for image preprocessing.
-        preprocess_batch: Preprocess a batch of images and classes.
         progress_string: Return a formatted string showing training progress.
         get_validator: Return an instance of ClassificationValidator.
         label_loss_items: Return a loss dict with labelled training loss items.
@@ -150,7 +150,8 @@ class ClassificationTrainer(BaseTrainer):
         with torch_distributed_zero_first(rank):  # init dataset *.cache only once if DDP
             dataset = self.build_dataset(dataset_path, mode)
 
-        loader = build_dataloader(dataset, batch_size, self.args.workers, rank=rank)
+        shard = mode != "train" and rank != -1  # DDP ranks validate disjoint batches
+        loader = build_dataloader(dataset, batch_size, self.args.workers, rank=rank, shard=shard)
         # Attach inference transforms
         if mode != "train":
             if is_parallel(self.model):
@@ -159,12 +160,6 @@ class ClassificationTrainer(BaseTrainer):
                 self.model.transforms = loader.dataset.torch_transforms
         return loader
 
-    def preprocess_batch(self, batch):
-        """Preprocesses a batch of images and classes."""
-        batch["img"] = batch["img"].to(self.device)
-        batch["cls"] = batch["cls"].to(self.device)
-        return batch
-
     def progress_string(self):
         """Returns a formatted string showing training progress."""
         return ("\n" + "%11s" * (4 + len(self.loss_names))) % (
@@ -204,17 +199,21 @@ class ClassificationTrainer(BaseTrainer):
         plot_results(file=self.csv, classify=True, on_plot=self.on_plot)  # save results.png
 
     def final_eval(self):
-        """Evaluate trained model and save validation results."""
-        for f in self.last, self.best:
-            if f.exists():
-                strip_optimizer(f)  # strip optimizers
-                if f is self.best:
-                    LOGGER.info(f"\nValidating {f}...")
-                    self.validator.args.data = self.args.data
-                    self.validator.args.plots = self.args.plots
-                    self.metrics = self.validator(model=f)
-                    self.metrics.pop("fitness", None)
-                    self.run_callbacks("on_fit_epoch_end")
+        """Evaluate trained model and save validation results, sharding the validation across DDP ranks."""
+        if RANK in {-1, 0}:
+            for f in self.last, self.best:
+                if f.exists():
+                    strip_optimizer(f)  # strip optimizers
+        if RANK != -1:
+            dist.barrier()  # checkpoints are stripped before all ranks load best.pt
+        if self.best.exists():
+            LOGGER.info(f"\nValidating {self.best}...")
+            self.validator.args.data = self.args.data
+            self.validator.args.plots = self.args.plots
+            self.metrics = self.validator(model=self.best)
+            self.metrics.pop("fitness", None)
+            if RANK in {-1, 0}:
+                self.run_callbacks("on_fit_epoch_end")
 
     def plot_training_samples(self, batch, ni):
         """
@@ -136,6 +136,16 @@ class ClassificationValidator(BaseValidator):
         self.metrics.confusion_matrix = self.confusion_matrix
         self.metrics.save_dir = self.save_dir
 
+    def get_shard_results(self):
+        """Return the predictions and targets of this rank to be gathered on rank 0."""
+        return {**super().get_shard_results(), "pred": self.pred, "targets": self.targets}
+
+    def merge_shard_results(self, results):
+        """Merge the predictions and targets of all ranks into those of rank 0."""
+        super().merge_shard_results(results)
+        self.pred = [x for r in results for x in r["pred"]]
+        self.targets = [x for r in results for x in r["targets"]]
+
     def postprocess(self, preds):
         """Extract the primary prediction from model output if it's in a list or tuple format."""
         return preds[0] if isinstance(preds, (list, tuple)) else preds
@@ -161,7 +171,7 @@ class ClassificationValidator(BaseValidator):
             (torch.utils.data.DataLoader): DataLoader object for the classification validation dataset.
         """
         dataset = self.build_dataset(dataset_path)
-        return build_dataloader(dataset, batch_size, self.args.workers, rank=-1)
+        return build_dataloader(dataset, batch_size, self.args.workers, rank=-1, shard=self.world_size > 1)
 
     def print_results(self):
         """Print evaluation metrics for the classification model."""
@@ -52,7 +52,7 @@ class DetectionPredictor(BasePredictor):
             >>> processed_results = predictor.postprocess(preds, img, orig_imgs)
         """
         save_feats = getattr(self, "save_feats", False)
-        preds = ops.non_max_suppression(
+        preds = ops.batched_non_max_suppression(
             preds,
             self.args.conf,
             self.args.iou,
@@ -85,7 +85,8 @@ class DetectionTrainer(BaseTrainer):
             LOGGER.warning("'rect=True' is incompatible with DataLoader shuffle, setting shuffle=False")
             shuffle = False
         workers = self.args.workers if mode == "train" else self.args.workers * 2
-        return build_dataloader(dataset, batch_size, workers, shuffle, rank)  # return dataloader
+        shard = mode == "val" and rank != -1  # DDP ranks validate disjoint batches
+        return build_dataloader(dataset, batch_size, workers, shuffle, rank, shard=shard)  # return dataloader
 
     def preprocess_batch(self, batch):
         """
@@ -97,11 +98,11 @@ class DetectionTrainer(BaseTrainer):
         Returns:
             (dict): Preprocessed batch with normalized images.
         """
-        batch["img"] = batch["img"].to(self.device, non_blocking=True).float() / 255
+        batch = super().preprocess_batch(batch)
         if self.args.multi_scale:
             imgs = batch["img"]
             sz = (
-                random.randrange(int(self.args.imgsz * 0.5), int(self.args.imgsz * 1.5 + self.stride))
+                random.randrange(int(self.train_imgsz * 0.5), int(self.train_imgsz * 1.5 + self.stride))
                 // self.stride
                 * self.stride
             )  # size
@@ -10,7 +10,8 @@ from ultralytics.data import build_dataloader, build_yolo_dataset, converter
 from ultralytics.engine.validator import BaseValidator
 from ultralytics.utils import LOGGER, ops
 from ultralytics.utils.checks import check_requirements
-from ultralytics.utils.metrics import ConfusionMatrix, DetMetrics, box_iou
+from ultralytics.utils.cocoeval import COCOAnnotations, COCOEvaluator
+from ultralytics.utils.metrics import APAccumulator, ConfusionMatrix, DetMetrics, box_iou
 from ultralytics.utils.plotting import output_to_target, plot_images
 
 
@@ -33,6 +34,7 @@ class DetectionValidator(BaseValidator):
         lb (list): List for storing ground truth labels for hybrid saving.
         jdict (list): List for storing JSON detection results.
         stats (dict): Dictionary for storing statistics during validation.
+        accumulator (APAccumulator | None): Binned statistics folded from `stats` after each batch with `stream_ap`.
 
     Examples:
         >>> from ultralytics.models.yolo.detect import DetectionValidator
@@ -105,6 +107,7 @@ class DetectionValidator(BaseValidator):
         self.seen = 0
         self.jdict = []
         self.stats = dict(tp=[], conf=[], pred_cls=[], target_cls=[], target_img=[])
+        self.accumulator = None  # binned statistics of the images seen so far with args.stream_ap
 
     def get_desc(self):
         """Return a formatted string summarizing class metrics of YOLO model."""
@@ -120,7 +123,7 @@ class DetectionValidator(BaseValidator):
         Returns:
             (List[torch.Tensor]): Processed predictions after NMS.
         """
-        return ops.non_max_suppression(
+        return ops.batched_non_max_suppression(
             preds,
             self.args.conf,
             self.args.iou,
@@ -225,6 +228,37 @@ class DetectionValidator(BaseValidator):
                     pbatch["ori_shape"],
                     self.save_dir / "labels" / f"{Path(batch['im_file'][si]).stem}.txt",
                 )
+        self.accumulate_stats()
+
+    def accumulate_stats(self):
+        """Fold the per-image statistics collected so far into the binned APAccumulator if `stream_ap` is enabled."""
+        if not self.args.stream_ap:
+            return
+        if self.accumulator is None:
+            keys = tuple(k for k in self.stats if k.startswith("tp"))  # e.g. 'tp' and 'tp_m' for segmentation
+            self.accumulator = APAccumulator(self.nc, self.niou, keys=keys)
+        if self.stats["conf"]:
+            self.accumulator.update({k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()})
+            for v in self.stats.values():
+                v.clear()
+
+    def get_shard_results(self):
+        """Return the statistics and confusion matrix of this rank to be gathered on rank 0."""
+        self.accumulate_stats()
+        return {
+            **super().get_shard_results(),
+            "stats": {k: [x.cpu() for x in v] for k, v in self.stats.items()},
+            "accumulator": self.accumulator,
+            "matrix": self.confusion_matrix.matrix,
+        }
+
+    def merge_shard_results(self, results):
+        """Merge the statistics and confusion matrices of all ranks into those of rank 0."""
+        super().merge_shard_results(results)
+        self.stats = {k: [x for r in results for x in r["stats"][k]] for k in self.stats}
+        if self.accumulator is not None:
+            self.accumulator.merge(*(r["accumulator"] for r in results[1:]))
+        self.confusion_matrix.matrix = sum(r["matrix"] for r in results)
 
     def finalize_metrics(self, *args, **kwargs):
         """
@@ -244,6 +278,11 @@ class DetectionValidator(BaseValidator):
         Returns:
             (dict): Dictionary containing metrics results.
         """
+        self.accumulate_stats()
+        if self.accumulator is not None:  # stream_ap, bounded memory
+            self.nt_per_class, self.nt_per_image = self.accumulator.nt_per_class, self.accumulator.nt_per_image
+            self.metrics.process(**self.accumulator.stats(), on_plot=self.on_plot)
+            return self.metrics.results_dict
         stats = {k: torch.cat(v, 0).cpu().numpy() for k, v in self.stats.items()}  # to numpy
         self.nt_per_class = np.bincount(stats["target_cls"].astype(int), minlength=self.nc)
         self.nt_per_image = np.bincount(stats["target_img"].astype(int), minlength=self.nc)
@@ -315,7 +354,8 @@ class DetectionValidator(BaseValidator):
             (torch.utils.data.DataLoader): Dataloader for validation.
         """
         dataset = self.build_dataset(dataset_path, batch=batch_size, mode="val")
-        return build_dataloader(dataset, batch_size, self.args.workers, shuffle=False, rank=-1)  # return dataloader
+        shard = self.world_size > 1  # ranks of a distributed validation evaluate disjoint batches
+        return build_dataloader(dataset, batch_size, self.args.workers, shuffle=False, rank=-1, shard=shard)
 
     def plot_val_samples(self, batch, ni):
         """
@@ -406,46 +446,50 @@ class DetectionValidator(BaseValidator):
             (dict): Updated statistics dictionary with COCO/LVIS evaluation results.
         """
         if self.args.save_json and (self.is_coco or self.is_lvis) and len(self.jdict):
-            pred_json = self.save_dir / "predictions.json"  # predictions
             anno_json = (
                 self.data["path"]
                 / "annotations"
                 / ("instances_val2017.json" if self.is_coco else f"lvis_v1_{self.args.split}.json")
             )  # annotations
-            pkg = "pycocotools" if self.is_coco else "lvis"
-            LOGGER.info(f"\nEvaluating {pkg} mAP using {pred_json} and {anno_json}...")
-            try:  # https://github.com/cocodataset/cocoapi/blob/master/PythonAPI/pycocoEvalDemo.ipynb
-                for x in pred_json, anno_json:
-                    assert x.is_file(), f"{x} file not found"
-                check_requirements("pycocotools>=2.0.6" if self.is_coco else "lvis>=0.5.3")
-                if self.is_coco:
-                    from pycocotools.coco import COCO  # noqa
-                    from pycocotools.cocoeval import COCOeval  # noqa
-
-                    anno = COCO(str(anno_json))  # init annotations api
-                    pred = anno.loadRes(str(pred_json))  # init predictions api (must pass string, not Path)
-                    val = COCOeval(anno, pred, "bbox")
-                else:
-                    from lvis import LVIS, LVISEval
-
-                    anno = LVIS(str(anno_json))  # init annotations api
-                    pred = anno._load_json(str(pred_json))  # init predictions api (must pass string, not Path)
-                    val = LVISEval(anno, pred, "bbox")
-                val.params.imgIds = [int(Path(x).stem) for x in self.dataloader.dataset.im_files]  # images to eval
-                val.evaluate()
-                val.accumulate()
-                val.summarize()
-                if self.is_lvis:
-                    val.print_results()  # explicitly call print_results
+            stats = self.coco_evaluate(stats, anno_json)
+        return stats
+
+    def coco_evaluate(self, stats, anno_json, iou_types=("bbox",), suffixes=("B",)):
+        """
+        Evaluate the predictions in jdict with the COCO or LVIS protocol and update the mAP statistics.
+
+        Predictions are evaluated in memory by COCOEvaluator, which returns the same numbers as pycocotools and lvis
+        without reloading them from predictions.json.
+
+        Args:
+            stats (dict): Current statistics dictionary.
+            anno_json (Path): Path to the COCO or LVIS annotation JSON file.
+            iou_types (tuple): COCOEvaluator iou_type of each evaluated task, e.g. ('bbox', 'segm').
+            suffixes (tuple): Metric key suffix of each iou_type, e.g. ('B', 'M').
+
+        Returns:
+            (dict): Updated statistics dictionary.
+        """
+        pkg = "LVIS" if self.is_lvis else "COCO"
+        LOGGER.info(f"\nEvaluating {pkg} mAP using {anno_json}...")
+        try:
+            assert anno_json.is_file(), f"{anno_json} file not found"
+            if "segm" in iou_types:
+                check_requirements("pycocotools>=2.0.6")  # RLE mask operations
+            anno = COCOAnnotations(anno_json, segments="segm" in iou_types)
+            img_ids = [int(Path(x).stem) for x in self.dataloader.dataset.im_files]  # images to evaluate
+            for i, (iou_type, suffix) in enumerate(zip(iou_types, suffixes)):
+                results = COCOEvaluator(anno, iou_type, lvis=self.is_lvis).evaluate(self.jdict, img_ids)
                 # update mAP50-95 and mAP50
-                stats[self.metrics.keys[-1]], stats[self.metrics.keys[-2]] = (
-                    val.stats[:2] if self.is_coco else [val.results["AP"], val.results["AP50"]]
+                stats[self.metrics.keys[i * 4 + 3]], stats[self.metrics.keys[i * 4 + 2]] = (
+                    results["AP"],
+                    results["AP50"],
                 )
                 if self.is_lvis:
-                    stats["metrics/APr(B)"] = val.results["APr"]
-                    stats["metrics/APc(B)"] = val.results["APc"]
-                    stats["metrics/APf(B)"] = val.results["APf"]
-                    stats["fitness"] = val.results["AP"]
-            except Exception as e:
-                LOGGER.warning(f"{pkg} unable to run: {e}")
+                    for k in "APr", "APc", "APf":
+                        stats[f"metrics/{k}({suffix})"] = results[k]
+            if self.is_lvis:
+                stats["fitness"] = stats["metrics/mAP50-95(B)"]
+        except Exception as e:
+            LOGGER.warning(f"{pkg} evaluation unable to run: {e}")
         return stats
@@ -10,7 +10,7 @@ import torch.nn.functional as F
 from ultralytics.models.yolo.detect import DetectionValidator
 from ultralytics.utils import LOGGER, NUM_THREADS, ops
 from ultralytics.utils.checks import check_requirements
-from ultralytics.utils.metrics import SegmentMetrics, box_iou, mask_iou
+from ultralytics.utils.metrics import SegmentMetrics, box_iou, sparse_mask_iou
 from ultralytics.utils.plotting import output_to_target, plot_images
 
 
@@ -213,6 +213,7 @@ class SegmentationValidator(DetectionValidator):
                     pbatch["ori_shape"],
                     self.save_dir / "labels" / f"{Path(batch['im_file'][si]).stem}.txt",
                 )
+        self.accumulate_stats()
 
     def finalize_metrics(self, *args, **kwargs):
         """
@@ -258,20 +259,70 @@ class SegmentationValidator(DetectionValidator):
             >>> correct_preds = validator._process_batch(detections, gt_bboxes, gt_cls)
         """
         if masks:
-            if overlap:
-                nl = len(gt_cls)
-                index = torch.arange(nl, device=gt_masks.device).view(nl, 1, 1) + 1
-                gt_masks = gt_masks.repeat(nl, 1, 1)  # shape(1,640,640) -> (n,640,640)
-                gt_masks = torch.where(gt_masks == index, 1.0, 0.0)
-            if gt_masks.shape[1:] != pred_masks.shape[1:]:
-                gt_masks = F.interpolate(gt_masks[None], pred_masks.shape[1:], mode="bilinear", align_corners=False)[0]
-                gt_masks = gt_masks.gt_(0.5)
-            iou = mask_iou(gt_masks.view(gt_masks.shape[0], -1), pred_masks.view(pred_masks.shape[0], -1))
+            gt_idx, gt_pix = self._mask_pixels(gt_masks, len(gt_cls), overlap, pred_masks.shape[1:])
+            pred_idx, pred_pix = pred_masks.flatten(1).nonzero(as_tuple=True)
+            iou = sparse_mask_iou(gt_idx, gt_pix, pred_idx, pred_pix, len(gt_cls), len(pred_masks))
         else:  # boxes
             iou = box_iou(gt_bboxes, detections[:, :4])
 
         return self.match_predictions(detections[:, 5], gt_cls, iou)
 
+    @staticmethod
+    def _mask_pixels(gt_masks, nl, overlap, shape):
+        """
+        Return the instance index and flat pixel index of every ground truth mask pixel at the prediction resolution.
+
+        Instances are never expanded to full-frame masks. When the prediction resolution differs, each instance is
+        upsampled inside its own extent plus a 1-pixel empty margin, which gives the same pixels as bilinearly
+        interpolating the full mask and thresholding at 0.5.
+
+        Args:
+            gt_masks (torch.Tensor): Ground truth masks of shape (M, h, w), or (1, h, w) with values 1..M if overlap.
+            nl (int): Number of ground truth instances M.
+            overlap (bool): Whether `gt_masks` is a single overlap mask holding instance indices.
+            shape (tuple): Prediction mask resolution (H, W).
+
+        Returns:
+            gt_idx (torch.Tensor): Instance index of each ground truth pixel.
+            gt_pix (torch.Tensor): Flat pixel index of each ground truth pixel in an (H, W) frame.
+        """
+        h, w = gt_masks.shape[1:]
+        if overlap:
+            y, x = gt_masks[0].nonzero(as_tuple=True)
+            idx = gt_masks[0, y, x].long() - 1
+        else:
+            idx, y, x = gt_masks.nonzero(as_tuple=True)
+        H, W = shape
+        if (h, w) == (H, W):
+            return idx, y * w + x
+
+        sy, sx = H // h, W // w
+        rows = torch.zeros(nl, h, dtype=torch.bool, device=gt_masks.device)
+        cols = torch.zeros(nl, w, dtype=torch.bool, device=gt_masks.device)
+        rows[idx, y] = True
+        cols[idx, x] = True
+        if H % h or W % w:  # non-integer ratio, interpolate each instance over the full frame
+            bounds = torch.tensor([[0, h, 0, w]], device=gt_masks.device).repeat(nl, 1)
+        else:
+            y0, x0 = rows.byte().argmax(1), cols.byte().argmax(1)
+            y1, x1 = h - rows.flip(1).byte().argmax(1), w - cols.flip(1).byte().argmax(1)
+            bounds = torch.stack(
+                ((y0 - 1).clamp(0), (y1 + 1).clamp(max=h), (x0 - 1).clamp(0), (x1 + 1).clamp(max=w)), 1
+            )
+        gt_idx, gt_pix = [], []
+        for i, (present, (a, b, c, d)) in enumerate(zip(rows.any(1).tolist(), bounds.tolist())):
+            if not present:
+                continue
+            crop = (gt_masks[0, a:b, c:d] == i + 1).float() if overlap else gt_masks[i, a:b, c:d]
+            size = (H, W) if (H % h or W % w) else ((b - a) * sy, (d - c) * sx)
+            crop = F.interpolate(crop[None, None], size, mode="bilinear", align_corners=False)[0, 0]
+            y, x = crop.gt(0.5).nonzero(as_tuple=True)
+            gt_idx.append(torch.full_like(y, i))
+            gt_pix.append((y + a * sy) * W + x + c * sx)
+        if not gt_idx:
+            return idx[:0], idx[:0]
+        return torch.cat(gt_idx), torch.cat(gt_pix)
+
     def plot_val_samples(self, batch, ni):
         """
         Plot validation samples with bounding box labels and masks.
@@ -374,55 +425,10 @@ class SegmentationValidator(DetectionValidator):
     def eval_json(self, stats):
         """Return COCO-style object detection evaluation metrics."""
         if self.args.save_json and (self.is_lvis or self.is_coco) and len(self.jdict):
-            pred_json = self.save_dir / "predictions.json"  # predictions
-
             anno_json = (
                 self.data["path"]
                 / "annotations"
                 / ("instances_val2017.json" if self.is_coco else f"lvis_v1_{self.args.split}.json")
             )  # annotations
-
-            pkg = "pycocotools" if self.is_coco else "lvis"
-            LOGGER.info(f"\nEvaluating {pkg} mAP using {pred_json} and {anno_json}...")
-            try:  # https://github.com/cocodataset/cocoapi/blob/master/PythonAPI/pycocoEvalDemo.ipynb
-                for x in anno_json, pred_json:
-                    assert x.is_file(), f"{x} file not found"
-                check_requirements("pycocotools>=2.0.6" if self.is_coco else "lvis>=0.5.3")
-                if self.is_coco:
-                    from pycocotools.coco import COCO  # noqa
-                    from pycocotools.cocoeval import COCOeval  # noqa
-
-                    anno = COCO(str(anno_json))  # init annotations api
-                    pred = anno.loadRes(str(pred_json))  # init predictions api (must pass string, not Path)
-                    vals = [COCOeval(anno, pred, "bbox"), COCOeval(anno, pred, "segm")]
-                else:
-                    from lvis import LVIS, LVISEval
-
-                    anno = LVIS(str(anno_json))
-                    pred = anno._load_json(str(pred_json))
-                    vals = [LVISEval(anno, pred, "bbox"), LVISEval(anno, pred, "segm")]
-
-                for i, eval in enumerate(vals):
-                    eval.params.imgIds = [int(Path(x).stem) for x in self.dataloader.dataset.im_files]  # im to eval
-                    eval.evaluate()
-                    eval.accumulate()
-                    eval.summarize()
-                    if self.is_lvis:
-                        eval.print_results()
-                    idx = i * 4 + 2
-                    # update mAP50-95 and mAP50
-                    stats[self.metrics.keys[idx + 1]], stats[self.metrics.keys[idx]] = (
-                        eval.stats[:2] if self.is_coco else [eval.results["AP"], eval.results["AP50"]]
-                    )
-                    if self.is_lvis:
-                        tag = "B" if i == 0 else "M"
-                        stats[f"metrics/APr({tag})"] = eval.results["APr"]
-                        stats[f"metrics/APc({tag})"] = eval.results["APc"]
-                        stats[f"metrics/APf({tag})"] = eval.results["APf"]
-
-                if self.is_lvis:
-                    stats["fitness"] = stats["metrics/mAP50-95(B)"]
-
-            except Exception as e:
-                LOGGER.warning(f"{pkg} unable to run: {e}")
+            stats = self.coco_evaluate(stats, anno_json, iou_types=("bbox", "segm"), suffixes=("B", "M"))
         return stats
@@ -11,10 +11,9 @@ from ultralytics.utils.torch_utils import de_parallel
 
 def on_pretrain_routine_end(trainer):
     """Callback to set up model classes and text encoder at the end of the pretrain routine."""
-    if RANK in {-1, 0}:
-        # Set class names for evaluation
-        names = [name.split("/")[0] for name in list(trainer.test_loader.dataset.data["names"].values())]
-        de_parallel(trainer.ema.ema).set_classes(names, cache_clip_model=False)
+    # Set class names for evaluation, on all ranks as DDP validation is sharded
+    names = [name.split("/")[0] for name in list(trainer.test_loader.dataset.data["names"].values())]
+    de_parallel(trainer.ema.ema).set_classes(names, cache_clip_model=False)
     device = next(trainer.model.parameters()).device
     trainer.text_model, _ = trainer.clip.load("ViT-B/32", device=device)
     for p in trainer.text_model.parameters():
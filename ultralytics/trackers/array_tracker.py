@@ -0,0 +1,627 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""Array-backed BYTETracker and BOTSORT keeping the state of all tracks in contiguous NumPy arrays."""
+
+from types import SimpleNamespace
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from ..utils.ops import xywh2ltwh
+from .basetrack import BaseTrack, TrackState
+from .bot_sort import ReID
+from .utils import matching
+from .utils.gmc import GMC
+from .utils.kalman_filter import KalmanFilterXYAH, KalmanFilterXYWH
+
+
+class TrackStore:
+    """
+    Structure-of-arrays storage for the state of a set of tracks or detections, one row per track.
+
+    Detections are stored in the same layout before they become tracks, with `mean` and `covariance` unset and the
+    detected box kept in `tlwh`.
+
+    Attributes:
+        mean (np.ndarray | None): Kalman filter state means with shape (N, 8).
+        covariance (np.ndarray | None): Kalman filter state covariances with shape (N, 8, 8).
+        tlwh (np.ndarray | None): Detected boxes in (top left x, top left y, width, height) format with shape (N, 4).
+        track_id (np.ndarray): Track IDs.
+        state (np.ndarray): TrackState of every track.
+        is_activated (np.ndarray): Whether every track has been activated.
+        score (np.ndarray): Confidence of the last associated detection.
+        cls (np.ndarray): Class of the last associated detection.
+        idx (np.ndarray): Index of the last associated detection in its frame.
+        angle (np.ndarray | None): Angle of the last associated detection for oriented boxes.
+        frame_id (np.ndarray): Frame in which every track was last updated.
+        start_frame (np.ndarray): Frame in which every track was activated.
+        tracklet_len (np.ndarray): Number of consecutive updates of every track.
+        feat (np.ndarray | None): Smoothed ReID features of tracks, or current features of detections, shape (N, D).
+
+    Methods:
+        __getitem__: Return a new TrackStore with the selected rows.
+        concat: Concatenate TrackStores row-wise.
+
+    Examples:
+        >>> store = TrackStore(tlwh=np.array([[10, 20, 30, 40]], dtype=np.float32), score=np.array([0.9]))
+        >>> len(store)
+        1
+    """
+
+    fields = (
+        "mean",
+        "covariance",
+        "tlwh",
+        "track_id",
+        "state",
+        "is_activated",
+        "score",
+        "cls",
+        "idx",
+        "angle",
+        "frame_id",
+        "start_frame",
+        "tracklet_len",
+        "feat",
+    )
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the store from per-field arrays of equal length, defaulting unset counters and flags to zero.
+
+        Args:
+            **kwargs (np.ndarray): Arrays for any of the `fields`, with one row per track.
+        """
+        n = len(next(v for v in kwargs.values() if v is not None))
+        for k in self.fields:
+            setattr(self, k, kwargs.get(k))
+        for k in "track_id", "state", "is_activated", "frame_id", "start_frame", "tracklet_len":
+            if getattr(self, k) is None:
+                setattr(self, k, np.zeros(n, dtype=bool if k == "is_activated" else int))
+
+    def __len__(self):
+        """Return the number of tracks."""
+        return len(self.track_id)
+
+    def __getitem__(self, i):
+        """Return a new TrackStore with the rows selected by index array or mask `i`."""
+        store = TrackStore.__new__(TrackStore)  # all fields are set, skip the defaults of __init__
+        store.__dict__.update({k: None if v is None else v[i] for k, v in self.__dict__.items()})
+        return store
+
+    @staticmethod
+    def concat(*stores):
+        """Concatenate TrackStores row-wise, leaving fields unset in all stores unset."""
+        values = {k: [getattr(s, k) for s in stores] for k in TrackStore.fields}
+        return TrackStore(**{k: None if v[0] is None else np.concatenate(v) for k, v in values.items()})
+
+
+class ArrayBYTETracker:
+    """
+    BYTETracker keeping all track state in a TrackStore of contiguous NumPy arrays.
+
+    Produces the same tracks as BYTETracker, but predicts, compensates, updates and re-orders all tracks with
+    vectorized array operations instead of per-track STrack objects, which keeps the update cost low in crowded scenes
+    with hundreds of objects per frame. The tracked tracks are the first `n_tracked` rows of `tracks`, followed by the
+    lost tracks, both in the order BYTETracker keeps its `tracked_stracks` and `lost_stracks` lists. Removed tracks are
+    dropped from the store, only their IDs are kept.
+
+    Attributes:
+        tracks (TrackStore): Tracked and lost tracks.
+        n_tracked (int): Number of tracked tracks at the start of `tracks`.
+        removed_ids (np.ndarray): IDs of the most recently removed tracks.
+        frame_id (int): The current frame ID.
+        args (Namespace): Tracker arguments.
+        max_time_lost (int): The maximum frames for a track to be considered as 'lost'.
+        kalman_filter (KalmanFilterXYAH): Kalman Filter object.
+        velocity (Tuple[int, ...]): State dimensions whose velocity is reset when predicting non-tracked tracks.
+        gated (bool): Whether to match only overlapping tracks and detections, solving every overlapping group apart.
+
+    Methods:
+        update: Update the tracker with new detections and return the tracked objects.
+        prepare: Start a new frame and select the tracks to predict.
+        associate: Associate the predicted tracks with the detections of a frame.
+        finish: Finish a frame once the Kalman filter states are updated and return the tracked objects.
+        get_kalmanfilter: Return a Kalman filter object for tracking bounding boxes.
+        init_track: Initialize detections from boxes, scores and classes.
+        get_dists: Calculate the distances between tracks and detections.
+        assign: Match tracks with detections, optionally over overlapping pairs only.
+        predict_mean: Return the states of tracks to predict with the Kalman filter.
+        reset: Reset the tracker.
+
+    Examples:
+        >>> tracker = ArrayBYTETracker(args, frame_rate=30)
+        >>> tracks = tracker.update(results.boxes.cpu().numpy())
+    """
+
+    velocity = (7,)
+
+    def __init__(self, args, frame_rate=30):
+        """
+        Initialize an ArrayBYTETracker instance for object tracking.
+
+        Args:
+            args (Namespace): Tracker arguments, as for BYTETracker.
+            frame_rate (int): Frame rate of the video sequence.
+        """
+        self.args = args
+        self.max_time_lost = int(frame_rate / 30.0 * args.track_buffer)
+        self.gated = getattr(args, "gated_association", False)
+        self.reset()
+
+    def update(self, results, img=None, feats=None):
+        """Update the tracker with new detections and return the tracked objects, like `BYTETracker.update`."""
+        return TrackerGroup([self]).update([results], [img], [feats])[0]
+
+    def prepare(self, results, img=None, feats=None):
+        """
+        Start a new frame, initializing its detections and selecting the tracks to predict and associate.
+
+        Args:
+            results (Boxes | OBB): Detections of the frame with `conf`, `xywh` or `xywhr` and `cls` attributes.
+            img (np.ndarray | None): Image of the frame for global motion compensation and ReID.
+            feats (list | None): Native ReID features of the detections.
+
+        Returns:
+            (SimpleNamespace): Frame state passed to `associate` and `finish`, with the indices of the tracks to predict
+                in `pool`.
+        """
+        self.frame_id += 1
+        scores = results.conf
+        bboxes = results.xywhr if hasattr(results, "xywhr") else results.xywh
+        bboxes = np.concatenate([bboxes, np.arange(len(bboxes)).reshape(-1, 1)], axis=-1)  # add index
+        cls = results.cls
+
+        remain_inds = scores >= self.args.track_high_thresh
+        inds_second = (scores > self.args.track_low_thresh) & (scores < self.args.track_high_thresh)
+        img_or_feats = img if feats is None else feats
+        nt = self.n_tracked
+        return SimpleNamespace(
+            dets=bboxes[remain_inds],
+            detections=self.init_track(bboxes[remain_inds], scores[remain_inds], cls[remain_inds], img_or_feats),
+            second=self.init_track(bboxes[inds_second], scores[inds_second], cls[inds_second], img_or_feats),
+            unconfirmed=np.flatnonzero(~self.tracks.is_activated[:nt]),
+            pool=np.concatenate([np.flatnonzero(self.tracks.is_activated[:nt]), np.arange(nt, len(self.tracks))]),
+        )
+
+    def associate(self, frame, img=None):
+        """
+        Associate the predicted tracks with the detections of a frame prepared by `prepare`.
+
+        Matched tracks are updated except for their Kalman filter states: the matched rows and detections are collected
+        in `frame.rows` and `frame.matched`, and the detections starting new tracks in `frame.new`, so that the Kalman
+        filter update and initiation of all tracks, or all trackers of a TrackerGroup, run in single batched calls.
+
+        Args:
+            frame (SimpleNamespace): Frame state returned by `prepare`, with the tracks in `frame.pool` predicted.
+            img (np.ndarray | None): Image of the frame for global motion compensation.
+        """
+        tracks, pool, unconfirmed, detections = self.tracks, frame.pool, frame.unconfirmed, frame.detections
+        if hasattr(self, "gmc") and img is not None:
+            self.multi_gmc(tracks, np.concatenate([pool, unconfirmed]), self.gmc.apply(img, frame.dets))
+        frame.rows, frame.matched = [], []
+
+        # First association, with high score detection boxes
+        matches, u_track, u_detection = self.assign(tracks, pool, detections, self.args.match_thresh)
+        rows = pool[matches[:, 0]]
+        frame.refind = rows[tracks.state[rows] != TrackState.Tracked]
+        self.update_tracks(frame, rows, detections[matches[:, 1]])
+
+        # Second association, of the remaining tracked tracks with low score detection boxes
+        r_tracked = pool[u_track][tracks.state[pool[u_track]] == TrackState.Tracked]
+        matches, u_track, _ = self.assign(tracks, r_tracked, frame.second, 0.5, iou_only=True)
+        self.update_tracks(frame, r_tracked[matches[:, 0]], frame.second[matches[:, 1]])
+        frame.lost = r_tracked[u_track]
+        tracks.state[frame.lost] = TrackState.Lost
+
+        # Unconfirmed tracks, usually tracks with only one beginning frame
+        detections = detections[u_detection]
+        matches, u_unconfirmed, u_detection = self.assign(tracks, unconfirmed, detections, 0.7)
+        self.update_tracks(frame, unconfirmed[matches[:, 0]], detections[matches[:, 1]])
+        frame.removed = unconfirmed[u_unconfirmed]
+        tracks.state[frame.removed] = TrackState.Removed
+
+        # Init new tracks
+        frame.new = self.activate(detections[u_detection[detections.score[u_detection] >= self.args.new_track_thresh]])
+
+    def finish(self, frame):
+        """
+        Finish a frame once the Kalman filter states of its tracks are updated, returning the tracked objects.
+
+        Args:
+            frame (SimpleNamespace): Frame state returned by `prepare` and completed by `associate`.
+
+        Returns:
+            (np.ndarray): Tracked objects as (x1, y1, x2, y2, [angle], track_id, score, cls, idx) rows.
+        """
+        tracks, nt = self.tracks, self.n_tracked
+        old_lost = np.arange(nt, len(tracks))
+        timed_out = old_lost[self.frame_id - tracks.frame_id[old_lost] > self.max_time_lost]
+        tracks.state[timed_out] = TrackState.Removed
+        tracked = np.concatenate(
+            [
+                np.flatnonzero(tracks.state[:nt] == TrackState.Tracked),
+                len(tracks) + np.arange(len(frame.new)),
+                frame.refind,
+            ]
+        )
+        lost = np.concatenate([old_lost[tracks.state[old_lost] != TrackState.Tracked], frame.lost])
+        lost = lost[~np.isin(tracks.track_id[lost], self.removed_ids)]
+        self.removed_ids = np.concatenate(
+            [self.removed_ids, tracks.track_id[np.concatenate([frame.removed, timed_out])]]
+        )
+        if len(self.removed_ids) > 1000:
+            self.removed_ids = self.removed_ids[-999:]  # clip removed IDs to 1000 maximum
+        tracks = TrackStore.concat(tracks, frame.new)
+        tracked, lost = self.remove_duplicate_tracks(tracks, tracked, lost)
+        self.tracks, self.n_tracked = tracks[np.concatenate([tracked, lost])], len(tracked)
+        return self.results(self.tracks[: self.n_tracked][self.tracks.is_activated[: self.n_tracked]])
+
+    def get_kalmanfilter(self):
+        """Return a Kalman filter object for tracking bounding boxes using KalmanFilterXYAH."""
+        return KalmanFilterXYAH()
+
+    def init_track(self, dets, scores, cls, img=None):
+        """Initialize detections from (x, y, w, h, [a], idx) boxes, scores and classes as a TrackStore."""
+        return TrackStore(
+            tlwh=xywh2ltwh(dets[:, :4]).astype(np.float32),
+            score=scores,
+            cls=cls,
+            idx=dets[:, -1],
+            angle=dets[:, 4] if dets.shape[1] == 6 else None,
+        )
+
+    def get_dists(self, tracks, rows, detections):
+        """Calculate the distances between the tracks in `rows` and detections using IoU and optionally scores."""
+        dists = matching.iou_distance(self.track_boxes(tracks, rows), self.track_boxes(detections))
+        if self.args.fuse_score:
+            dists = self.fuse_score(dists, detections)
+        return dists
+
+    def get_pair_dists(self, tracks, rows, detections, j, dists):
+        """Calculate the distances of track `rows[k]` and detection `j[k]` pairs from their IoU distances `dists`."""
+        return 1 - (1 - dists) * detections.score[j] if self.args.fuse_score else dists
+
+    @staticmethod
+    def fuse_score(dists, detections):
+        """Fuse an IoU cost matrix with detection scores, like `matching.fuse_score`."""
+        return 1 - (1 - dists) * detections.score[None] if dists.size else dists
+
+    def assign(self, tracks, rows, detections, thresh, iou_only=False):
+        """
+        Match the tracks in `rows` with detections, returning matches and unmatched track and detection indices.
+
+        With `gated_association`, costs are only computed for the pairs of overlapping boxes and the assignment is
+        solved separately for every group of overlapping tracks and detections. Pairs of boxes that do not overlap cost
+        1 and are never matched for thresholds below 1, so the matches are the same as with the dense cost matrix, while
+        the cost grows near-linearly with the number of objects in large scenes.
+
+        Args:
+            tracks (TrackStore): Tracks to match.
+            rows (np.ndarray): Rows of the tracks to match.
+            detections (TrackStore): Detections to match.
+            thresh (float): Maximum cost of a match.
+            iou_only (bool): Use plain IoU distances instead of `get_dists`.
+
+        Returns:
+            matches (np.ndarray): Indices into `rows` and `detections` of the matches, with shape (K, 2).
+            u_track (np.ndarray): Indices into `rows` of the unmatched tracks.
+            u_detection (np.ndarray): Indices of the unmatched detections.
+        """
+        if not self.gated:
+            if iou_only:
+                return self.match(
+                    matching.iou_distance(self.track_boxes(tracks, rows), self.track_boxes(detections)), thresh
+                )
+            return self.match(self.get_dists(tracks, rows, detections), thresh)
+        i, j, ious = matching.iou_pairs(self.track_boxes(tracks, rows), self.track_boxes(detections))
+        dists = 1 - ious if iou_only else self.get_pair_dists(tracks, rows[i], detections, j, 1 - ious)
+        return matching.sparse_linear_assignment(i, j, dists, (len(rows), len(detections)), thresh)
+
+    @staticmethod
+    def match(dists, thresh):
+        """Run `matching.linear_assignment` and return matches with shape (K, 2) and unmatched indices as arrays."""
+        matches, u_a, u_b = matching.linear_assignment(dists, thresh=thresh)
+        return np.asarray(matches, dtype=int).reshape(-1, 2), np.asarray(u_a, dtype=int), np.asarray(u_b, dtype=int)
+
+    def predict_mean(self, tracks, rows):
+        """Return the states of the tracks in `rows` to predict, with the velocities of non-tracked tracks reset."""
+        mean = tracks.mean[rows]
+        mean[np.ix_(tracks.state[rows] != TrackState.Tracked, self.velocity)] = 0
+        return mean
+
+    @staticmethod
+    def multi_gmc(tracks, rows, H=None):
+        """Apply the camera motion homography `H` to the states of the tracks in `rows`."""
+        H = np.eye(2, 3) if H is None else H
+        if len(rows):
+            R8x8 = np.kron(np.eye(4, dtype=float), H[:2, :2])
+            mean = tracks.mean[rows] @ R8x8.T
+            mean[:, :2] += H[:2, 2]
+            tracks.mean[rows], tracks.covariance[rows] = mean, R8x8 @ tracks.covariance[rows] @ R8x8.T
+
+    def convert_coords(self, tlwh):
+        """Convert (N, 4) tlwh boxes to the (x, y, a, h) Kalman filter measurement format."""
+        ret = tlwh.copy()
+        ret[:, :2] += ret[:, 2:] / 2
+        ret[:, 2] /= ret[:, 3]
+        return ret
+
+    def mean_to_tlwh(self, mean):
+        """Convert (x, y, a, h) Kalman filter states to (N, 4) tlwh boxes."""
+        ret = mean[:, :4].copy()
+        ret[:, 2] *= ret[:, 3]
+        ret[:, :2] -= ret[:, 2:] / 2
+        return ret
+
+    def track_boxes(self, tracks, rows=slice(None)):
+        """Return xyxy boxes, or xywha boxes for oriented boxes, of the tracks or detections in `rows`."""
+        ret = self.mean_to_tlwh(tracks.mean[rows]) if tracks.mean is not None else tracks.tlwh[rows].copy()
+        if tracks.angle is None:
+            ret[:, 2:] += ret[:, :2]
+            return ret
+        ret[:, :2] += ret[:, 2:] / 2
+        return np.concatenate([ret, tracks.angle[rows, None]], axis=1)
+
+    def update_tracks(self, frame, rows, detections):
+        """Update tracks in `rows` with their matched detections, deferring the Kalman filter update to the frame."""
+        tracks = self.tracks
+        tracked = tracks.state[rows] == TrackState.Tracked
+        tracks.tracklet_len[rows] = np.where(tracked, tracks.tracklet_len[rows] + 1, 0)
+        tracks.frame_id[rows] = self.frame_id
+        tracks.state[rows] = TrackState.Tracked
+        tracks.is_activated[rows] = True
+        for k in "score", "cls", "idx", "angle":
+            if getattr(tracks, k) is not None:
+                getattr(tracks, k)[rows] = getattr(detections, k)
+        frame.rows.append(rows)
+        frame.matched.append(detections)
+
+    def activate(self, detections):
+        """Activate detections as new tracks with new IDs, leaving their Kalman filter initiation to the frame."""
+        n = len(detections)
+        detections.track_id = BaseTrack._count + 1 + np.arange(n)
+        BaseTrack._count += n
+        detections.state[:] = TrackState.Tracked
+        detections.is_activated[:] = self.frame_id == 1
+        detections.frame_id[:] = self.frame_id
+        detections.start_frame[:] = self.frame_id
+        for k in "score", "cls", "idx", "angle":
+            if getattr(self.tracks, k) is None and getattr(detections, k) is not None:  # first tracks
+                setattr(self.tracks, k, np.zeros(len(self.tracks), dtype=getattr(detections, k).dtype))
+        return detections
+
+    def remove_duplicate_tracks(self, tracks, tracked, lost):
+        """Remove tracked and lost tracks overlapping with IoU > 0.85, keeping the longer-lived track of each pair."""
+        p, q = np.nonzero(
+            matching.iou_distance(self.track_boxes(tracks, tracked), self.track_boxes(tracks, lost)) < 0.15
+        )
+        age = tracks.frame_id - tracks.start_frame
+        older = age[tracked[p]] > age[lost[q]]
+        return np.delete(tracked, p[~older]), np.delete(lost, q[older])
+
+    def results(self, tracks):
+        """Return (x1, y1, x2, y2, [angle], track_id, score, cls, idx) rows for the given tracks."""
+        if not len(tracks):
+            return np.asarray([], dtype=np.float32)
+        columns = [tracks.track_id, tracks.score, tracks.cls, tracks.idx]
+        return np.concatenate([self.track_boxes(tracks), np.stack(columns, axis=1)], axis=1).astype(np.float32)
+
+    @staticmethod
+    def reset_id():
+        """Reset the ID counter shared with STrack."""
+        BaseTrack.reset_id()
+
+    def reset(self):
+        """Reset the tracker by clearing all tracks and reinitializing the Kalman filter."""
+        self.tracks = TrackStore(mean=np.zeros((0, 8)), covariance=np.zeros((0, 8, 8)))
+        self.n_tracked = 0
+        self.removed_ids = np.zeros(0, dtype=int)
+        self.frame_id = 0
+        self.kalman_filter = self.get_kalmanfilter()
+        self.reset_id()
+
+
+class ArrayBOTSORT(ArrayBYTETracker):
+    """
+    BOTSORT keeping all track state in a TrackStore of contiguous NumPy arrays.
+
+    Extends ArrayBYTETracker with the (x, y, w, h) Kalman filter, global motion compensation and optional ReID features
+    of BOTSORT, producing the same tracks as BOTSORT.
+
+    Attributes:
+        proximity_thresh (float): Threshold for spatial proximity (IoU) between tracks and detections.
+        appearance_thresh (float): Threshold for appearance similarity (ReID embeddings) between tracks and detections.
+        encoder (Any): Object to handle ReID embeddings, set to None if ReID is not enabled.
+        gmc (GMC): An instance of the GMC algorithm for data association.
+        alpha (float): Smoothing factor for the exponential moving average of track features.
+
+    Examples:
+        >>> tracker = ArrayBOTSORT(args, frame_rate=30)
+        >>> tracks = tracker.update(results.boxes.cpu().numpy(), img)
+    """
+
+    velocity = (6, 7)
+    alpha = 0.9
+
+    def __init__(self, args, frame_rate=30):
+        """
+        Initialize ArrayBOTSORT with ReID module and GMC algorithm.
+
+        Args:
+            args (Namespace): Tracker arguments, as for BOTSORT.
+            frame_rate (int): Frame rate of the video being processed.
+        """
+        super().__init__(args, frame_rate)
+        self.gmc = GMC(method=args.gmc_method, stride=getattr(args, "gmc_stride", 1))
+        self.proximity_thresh = args.proximity_thresh
+        self.appearance_thresh = args.appearance_thresh
+        self.encoder = (
+            (lambda feats, s: [f.cpu().numpy() for f in feats])  # native features do not require any model
+            if args.with_reid and self.args.model == "auto"
+            else ReID(args.model, cache=getattr(args, "reid_cache", False))
+            if args.with_reid
+            else None
+        )
+
+    def get_kalmanfilter(self):
+        """Return an instance of KalmanFilterXYWH."""
+        return KalmanFilterXYWH()
+
+    def init_track(self, dets, scores, cls, img=None):
+        """Initialize detections with optional L2-normalized ReID features, like `BOTSORT.init_track`."""
+        detections = super().init_track(dets, scores, cls, img)
+        if len(dets) and self.args.with_reid and self.encoder is not None:
+            feat = np.asarray(self.encoder(img, dets)[: len(dets)], dtype=np.float32)
+            detections.feat = self.normalize(self.normalize(feat))  # normalized by BOTrack.update_features in place
+        return detections
+
+    def get_dists(self, tracks, rows, detections):
+        """Calculate the distances between the tracks in `rows` and detections using IoU and optionally ReID."""
+        dists = matching.iou_distance(self.track_boxes(tracks, rows), self.track_boxes(detections))
+        dists_mask = dists > (1 - self.proximity_thresh)
+        if self.args.fuse_score:
+            dists = self.fuse_score(dists, detections)
+        if self.args.with_reid and self.encoder is not None and dists.size:
+            emb_dists = np.maximum(0.0, cdist(tracks.feat[rows], detections.feat, "cosine")) / 2.0
+            emb_dists[emb_dists > (1 - self.appearance_thresh)] = 1.0
+            emb_dists[dists_mask] = 1.0
+            dists = np.minimum(dists, emb_dists)
+        return dists
+
+    def get_pair_dists(self, tracks, rows, detections, j, dists):
+        """Calculate the distances of track and detection pairs from their IoU distances and optionally ReID."""
+        dists_mask = dists > (1 - self.proximity_thresh)
+        dists = super().get_pair_dists(tracks, rows, detections, j, dists)
+        if self.args.with_reid and self.encoder is not None and len(dists):
+            a, b = tracks.feat[rows].astype(float), detections.feat[j].astype(float)
+            cosine = 1 - (a * b).sum(1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))  # as cdist
+            emb_dists = np.maximum(0.0, cosine) / 2.0
+            emb_dists[emb_dists > (1 - self.appearance_thresh)] = 1.0
+            emb_dists[dists_mask] = 1.0
+            dists = np.minimum(dists, emb_dists)
+        return dists
+
+    def update_tracks(self, frame, rows, detections):
+        """Update the tracks in `rows` with their matched detections and smooth their ReID features."""
+        if len(rows) and detections.feat is not None:
+            feat = self.normalize(detections.feat)
+            self.tracks.feat[rows] = self.normalize(self.alpha * self.tracks.feat[rows] + (1 - self.alpha) * feat)
+        super().update_tracks(frame, rows, detections)
+
+    def activate(self, detections):
+        """Activate detections as new tracks, creating the track feature array on first use."""
+        if detections.feat is not None and self.tracks.feat is None:
+            self.tracks.feat = np.zeros((len(self.tracks), detections.feat.shape[1]), dtype=np.float32)
+        return super().activate(detections)
+
+    @staticmethod
+    def normalize(x):
+        """L2-normalize feature rows."""
+        return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+    def convert_coords(self, tlwh):
+        """Convert (N, 4) tlwh boxes to the (x, y, w, h) Kalman filter measurement format."""
+        ret = tlwh.copy()
+        ret[:, :2] += ret[:, 2:] / 2
+        return ret
+
+    def mean_to_tlwh(self, mean):
+        """Convert (x, y, w, h) Kalman filter states to (N, 4) tlwh boxes."""
+        ret = mean[:, :4].copy()
+        ret[:, :2] -= ret[:, 2:] / 2
+        return ret
+
+    def reset(self):
+        """Reset the tracker to its initial state, clearing all tracks and GMC parameters."""
+        super().reset()
+        if hasattr(self, "gmc"):
+            self.gmc.reset_params()
+        if isinstance(getattr(self, "encoder", None), ReID):
+            self.encoder.reset()
+
+
+class TrackerGroup:
+    """
+    Update several array-backed trackers, e.g. one per camera stream, with batched Kalman filter steps.
+
+    Every frame runs in the phases of ArrayBYTETracker: each tracker prepares its detections, the tracks of all trackers
+    are predicted in one stacked `multi_predict` call, each tracker associates its tracks with its detections, and the
+    matched and new tracks of all trackers are updated and initiated in one stacked `multi_update` and `multi_initiate`
+    call. The per-frame Python and NumPy call overhead of the Kalman filter is thus paid once per group instead of once
+    per stream, while every tracker produces exactly the tracks it would produce on its own.
+
+    Attributes:
+        trackers (List[ArrayBYTETracker]): Trackers of the same type, updated with one frame each.
+
+    Methods:
+        update: Update every tracker with its frame's detections and return the tracked objects.
+
+    Examples:
+        >>> trackers = [ArrayBYTETracker(args) for _ in range(64)]
+        >>> tracks = TrackerGroup(trackers).update([r.boxes.cpu().numpy() for r in results])
+    """
+
+    def __init__(self, trackers):
+        """
+        Initialize the group with trackers of the same type sharing the same Kalman filter class.
+
+        Args:
+            trackers (List[ArrayBYTETracker]): Trackers to update together, each with one frame per update.
+        """
+        self.trackers = trackers
+
+    def update(self, results, imgs=None, feats=None):
+        """
+        Update every tracker with the detections of its frame.
+
+        Args:
+            results (List[Boxes | OBB]): Detections of one frame per tracker.
+            imgs (List[np.ndarray | None] | None): Images of the frames for global motion compensation and ReID.
+            feats (List[list | None] | None): Native ReID features of the detections of every frame.
+
+        Returns:
+            (List[np.ndarray]): Tracked objects of every tracker as (x1, y1, x2, y2, [angle], track_id, score, cls,
+                idx) rows.
+        """
+        imgs = imgs or [None] * len(self.trackers)
+        feats = feats or [None] * len(self.trackers)
+        frames = [t.prepare(r, im, f) for t, r, im, f in zip(self.trackers, results, imgs, feats)]
+        kf = self.trackers[0].kalman_filter
+
+        # Predict the tracks of all trackers
+        pools = [(t.tracks, f.pool) for t, f in zip(self.trackers, frames)]
+        mean = [t.predict_mean(t.tracks, f.pool) for t, f in zip(self.trackers, frames)]
+        if sum(len(rows) for _, rows in pools):
+            self.scatter(pools, *kf.multi_predict(np.concatenate(mean), self.gather(pools, "covariance")))
+
+        for t, f, im in zip(self.trackers, frames, imgs):
+            t.associate(f, im)
+
+        # Update the matched tracks of all trackers
+        matched = [(t.tracks, np.concatenate(f.rows)) for t, f in zip(self.trackers, frames)]
+        if sum(len(rows) for _, rows in matched):
+            measurements = [t.convert_coords(d.tlwh) for t, f in zip(self.trackers, frames) for d in f.matched]
+            mean, covariance = self.gather(matched, "mean"), self.gather(matched, "covariance")
+            self.scatter(matched, *kf.multi_update(mean, covariance, np.concatenate(measurements)))
+
+        # Initiate the new tracks of all trackers
+        new = [(f.new, np.arange(len(f.new))) for f in frames]
+        for store, _ in new:
+            store.mean, store.covariance = np.zeros((len(store), 8)), np.zeros((len(store), 8, 8))
+        if sum(len(rows) for _, rows in new):
+            measurements = [t.convert_coords(f.new.tlwh) for t, f in zip(self.trackers, frames)]
+            self.scatter(new, *kf.multi_initiate(np.concatenate(measurements)))
+        return [t.finish(f) for t, f in zip(self.trackers, frames)]
+
+    @staticmethod
+    def gather(items, field):
+        """Concatenate a field of the selected rows of (TrackStore, rows) items."""
+        return np.concatenate([getattr(store, field)[rows] for store, rows in items])
+
+    @staticmethod
+    def scatter(items, mean, covariance):
+        """Write stacked Kalman filter states back to the selected rows of (TrackStore, rows) items."""
+        i = 0
+        for store, rows in items:
+            store.mean[rows], store.covariance[rows] = mean[i : i + len(rows)], covariance[i : i + len(rows)]
+            i += len(rows)
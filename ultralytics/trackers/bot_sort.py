@@ -4,7 +4,11 @@ from collections import deque
 
 import numpy as np
 import torch
+import torchvision.transforms as T
+from torchvision.ops import roi_align
 
+from ultralytics.utils import ops
+from ultralytics.utils.metrics import bbox_ioa
 from ultralytics.utils.ops import xywh2xyxy
 from ultralytics.utils.plotting import save_one_box
 
@@ -190,7 +194,7 @@ class BOTSORT(BYTETracker):
             >>> bot_sort = BOTSORT(args, frame_rate=30)
         """
         super().__init__(args, frame_rate)
-        self.gmc = GMC(method=args.gmc_method)
+        self.gmc = GMC(method=args.gmc_method, stride=getattr(args, "gmc_stride", 1))
 
         # ReID module
         self.proximity_thresh = args.proximity_thresh
@@ -198,7 +202,7 @@ class BOTSORT(BYTETracker):
         self.encoder = (
             (lambda feats, s: [f.cpu().numpy() for f in feats])  # native features do not require any model
             if self.args.model == "auto"
-            else ReID(args.model)
+            else ReID(args.model, cache=getattr(args, "reid_cache", False))
             if args.with_reid
             else None
         )
@@ -240,19 +244,113 @@ class BOTSORT(BYTETracker):
         """Reset the BOTSORT tracker to its initial state, clearing all tracked objects and internal states."""
         super().reset()
         self.gmc.reset_params()
+        if isinstance(self.encoder, ReID):
+            self.encoder.reset()
 
 
 class ReID:
-    """YOLO model as encoder for re-identification."""
+    """
+    YOLO classification model as encoder for re-identification, embedding all detections of a frame in one pass.
+
+    For PyTorch models, detections are cropped and resized on the model device with a single `roi_align` over the frame,
+    reproducing the padded `save_one_box` crop and the center crop of the classification transforms, and embedded with
+    one batched forward pass at the model's fixed input size. Other formats embed `save_one_box` crops through
+    `YOLO.predict`. With `cache`, the embeddings of detections barely moved since the previous frame are reused.
+
+    Attributes:
+        model (YOLO): Classification model used as encoder.
+        embed (List[int]): Indices of the layers whose pooled outputs are the embeddings.
+        cache (bool): Whether to reuse the embeddings of detections overlapping a previous-frame detection.
+        cache_iou (float): Minimum IoU with a previous-frame detection to reuse its embedding.
+
+    Methods:
+        reset: Clear the embedding cache.
+
+    Examples:
+        >>> encoder = ReID("yolo11n-cls.pt", cache=True)
+        >>> feats = encoder(img, dets)  # (N, C) embeddings of (N, 4+) xywh detections
+    """
+
+    cache_iou = 0.9
+
+    def __init__(self, model, cache=False):
+        """
+        Initialize encoder for re-identification.
 
-    def __init__(self, model):
-        """Initialize encoder for re-identification."""
+        Args:
+            model (str): Path to the classification model.
+            cache (bool): Reuse the embeddings of detections barely moved since the previous frame.
+        """
         from ultralytics import YOLO
 
         self.model = YOLO(model)
-        self.model(embed=[len(self.model.model.model) - 2 if ".pt" in model else -1], verbose=False)  # initialize
+        self.embed = [len(self.model.model.model) - 2 if ".pt" in model else -1]
+        self.model(embed=self.embed, verbose=False)  # initialize
+        self.cache = cache
+        self.reset()
 
     def __call__(self, img, dets):
-        """Extract embeddings for detected objects."""
-        feats = self.model([save_one_box(det, img, save=False) for det in xywh2xyxy(torch.from_numpy(dets[:, :4]))])
-        return [f.cpu().numpy() for f in feats]
+        """
+        Extract embeddings for detected objects.
+
+        Args:
+            img (np.ndarray): BGR image of the frame with shape (H, W, 3).
+            dets (np.ndarray): Detections with (x, y, w, h) boxes in their first 4 columns.
+
+        Returns:
+            (np.ndarray): Embeddings of the detections with shape (N, C).
+        """
+        if not len(dets):
+            return []
+        xyxy = xywh2xyxy(torch.from_numpy(np.ascontiguousarray(dets[:, :4], dtype=np.float32)))
+        if img is not self._img:  # new frame, the embeddings of the current frame become the cache
+            self._img, self._im, self._prev, self._curr = img, None, self._curr, []
+        hit = np.zeros(len(xyxy), dtype=bool)
+        if self.cache and self._prev:
+            boxes, cached = (np.concatenate(x) for x in zip(*self._prev))
+            ious = bbox_ioa(xyxy.numpy(), boxes, iou=True)
+            hit = ious.max(1) >= self.cache_iou
+        feats = self.extract(img, xyxy[~hit]) if not hit.all() else None
+        if hit.any():
+            out = np.empty((len(xyxy), cached.shape[1]), dtype=np.float32)
+            out[hit] = cached[ious.argmax(1)[hit]]
+            if feats is not None:
+                out[~hit] = feats
+            feats = out
+        if self.cache:
+            self._curr.append((xyxy.numpy(), feats))
+        return feats
+
+    def extract(self, img, xyxy):
+        """Embed the (N, 4) xyxy boxes of a BGR image, returning an (N, C) array."""
+        backend = self.model.predictor.model
+        if not backend.pt:
+            crops = [save_one_box(box, img, save=False) for box in xyxy]
+            return torch.stack(self.model(crops, embed=self.embed, verbose=False)).float().cpu().numpy()
+        if self._im is None:  # BGR, the channel order the classifier sees for the RGB save_one_box crops
+            self._im = torch.from_numpy(np.ascontiguousarray(img.transpose(2, 0, 1))).to(backend.device)[None].float()
+        b = ops.xyxy2xywh(xyxy)
+        b[:, 2:] = b[:, 2:] * 1.02 + 10  # save_one_box gain and pad
+        crop = ops.clip_boxes(ops.xywh2xyxy(b).long(), img.shape).float()
+        center, side = (crop[:, :2] + crop[:, 2:]) / 2, (crop[:, 2:] - crop[:, :2]).min(1, keepdim=True).values / 2
+        rois = torch.cat([torch.zeros_like(side), center - side, center + side], 1).to(backend.device)  # center crop
+        size = self.model.predictor.imgsz
+        x = roi_align(
+            self._im, rois, output_size=(size[0], size[1]), spatial_scale=1.0, sampling_ratio=-1, aligned=True
+        )
+        transforms = getattr(self.model.predictor.transforms, "transforms", [])
+        norm = next((t for t in transforms if isinstance(t, T.Normalize)), None)
+        x = (
+            x / 255
+            if norm is None
+            else (x / 255 - torch.as_tensor(norm.mean, device=x.device).view(1, 3, 1, 1))
+            / (torch.as_tensor(norm.std, device=x.device).view(1, 3, 1, 1))
+        )
+        with torch.inference_mode():
+            feats = backend.model(x.half() if backend.fp16 else x, embed=self.embed)
+        return torch.stack(feats).float().cpu().numpy()
+
+    def reset(self):
+        """Clear the embedding cache."""
+        self._img = self._im = None  # current frame and its tensor on the model device
+        self._prev, self._curr = [], []  # (boxes, embeddings) of the previous and current frame
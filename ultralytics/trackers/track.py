@@ -8,11 +8,13 @@ import torch
 from ultralytics.utils import IterableSimpleNamespace, yaml_load
 from ultralytics.utils.checks import check_yaml
 
+from .array_tracker import ArrayBOTSORT, ArrayBYTETracker, TrackerGroup
 from .bot_sort import BOTSORT
 from .byte_tracker import BYTETracker
 
 # A mapping of tracker types to corresponding tracker classes
 TRACKER_MAP = {"bytetrack": BYTETracker, "botsort": BOTSORT}
+ARRAY_TRACKER_MAP = {"bytetrack": ArrayBYTETracker, "botsort": ArrayBOTSORT}  # structure-of-arrays backends
 
 
 def on_predict_start(predictor: object, persist: bool = False) -> None:
@@ -63,12 +65,13 @@ def on_predict_start(predictor: object, persist: bool = False) -> None:
 
             predictor.model.model.model[-1].register_forward_hook(capture_io)
 
+    tracker_map = ARRAY_TRACKER_MAP if cfg.get("array_backend", False) else TRACKER_MAP
     trackers = []
     for _ in range(predictor.dataset.bs):
-        tracker = TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30)
+        tracker = tracker_map[cfg.tracker_type](args=cfg, frame_rate=30)
         trackers.append(tracker)
-        if predictor.dataset.mode != "stream":  # only need one tracker for other modes
-            break
+        if predictor.dataset.mode != "stream" and not getattr(predictor.dataset, "parallel", False):
+            break  # only need one tracker for other modes
     predictor.trackers = trackers
     predictor.vid_path = [None] * predictor.dataset.bs  # for determining when to reset tracker on new video
 
@@ -77,6 +80,9 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
     """
     Postprocess detected boxes and update with object tracking.
 
+    Array-backed trackers of different streams or videos in a batch are updated together by a TrackerGroup, running the
+    Kalman filter steps of all of them in single batched calls.
+
     Args:
         predictor (object): The predictor object containing the predictions.
         persist (bool): Whether to persist the trackers if they already exist.
@@ -88,24 +94,46 @@ def on_predict_postprocess_end(predictor: object, persist: bool = False) -> None
     """
     is_obb = predictor.args.task == "obb"
     is_stream = predictor.dataset.mode == "stream"
-    for i, result in enumerate(predictor.results):
-        tracker = predictor.trackers[i if is_stream else 0]
-        vid_path = predictor.save_dir / Path(result.path).name
-        if not persist and predictor.vid_path[i if is_stream else 0] != vid_path:
-            tracker.reset()
-            predictor.vid_path[i if is_stream else 0] = vid_path
-
-        det = (result.obb if is_obb else result.boxes).cpu().numpy()
-        if len(det) == 0:
-            continue
-        tracks = tracker.update(det, result.orig_img, getattr(result, "feats", None))
-        if len(tracks) == 0:
-            continue
-        idx = tracks[:, -1].astype(int)
-        predictor.results[i] = result[idx]
-
-        update_args = {"obb" if is_obb else "boxes": torch.as_tensor(tracks[:, :-1])}
-        predictor.results[i].update(**update_args)
+    streams = predictor.batch_streams  # scheduled stream batches may hold a subset of streams
+    parallel = len(predictor.trackers) > 1 and not is_stream  # videos decoded in parallel, one tracker per video
+    vid_paths = [predictor.save_dir / Path(result.path).name for result in predictor.results]
+    rounds = [[]]  # (result index, tracker index, detections, reset) updated together, one frame per tracker
+    for i, (result, vid_path) in enumerate(zip(predictor.results, vid_paths)):
+        if is_stream:
+            j = streams[i] if streams else i
+        elif vid_path in predictor.vid_path:  # tracker already following this video
+            j = predictor.vid_path.index(vid_path)
+        elif parallel:  # take over a tracker whose video is no longer in the batch
+            j = next(k for k, p in enumerate(predictor.vid_path) if p not in vid_paths)
+        else:
+            j = 0
+        reset = predictor.vid_path[j] != vid_path and not persist
+        predictor.vid_path[j] = vid_path
+        if any(j == k for _, k, _, _ in rounds[-1]):  # next frame of the same tracker
+            rounds.append([])
+        rounds[-1].append((i, j, (result.obb if is_obb else result.boxes).cpu().numpy(), reset))
+
+    for items in rounds:
+        for _, j, _, reset in items:
+            if reset:
+                predictor.trackers[j].reset()
+        items = [item for item in items if len(item[2])]
+        trackers = [predictor.trackers[j] for _, j, _, _ in items]
+        results = [predictor.results[i] for i, _, _, _ in items]
+        dets, imgs = [det for _, _, det, _ in items], [r.orig_img for r in results]
+        feats = [getattr(r, "feats", None) for r in results]
+        if trackers and isinstance(trackers[0], ArrayBYTETracker):  # batched Kalman filter steps across trackers
+            outputs = TrackerGroup(trackers).update(dets, imgs, feats)
+        else:
+            outputs = [t.update(*args) for t, *args in zip(trackers, dets, imgs, feats)]
+        for (i, *_), tracks in zip(items, outputs):
+            if len(tracks) == 0:
+                continue
+            idx = tracks[:, -1].astype(int)
+            predictor.results[i] = predictor.results[i][idx]
+
+            update_args = {"obb" if is_obb else "boxes": torch.as_tensor(tracks[:, :-1])}
+            predictor.results[i].update(**update_args)
 
 
 def register_tracker(model: object, persist: bool) -> None:
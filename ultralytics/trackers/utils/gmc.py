@@ -6,6 +6,7 @@ import cv2
 import numpy as np
 
 from ultralytics.utils import LOGGER
+from ultralytics.utils.ops import Profile
 
 
 class GMC:
@@ -13,11 +14,17 @@ class GMC:
     Generalized Motion Compensation (GMC) class for tracking and object detection in video frames.
 
     This class provides methods for tracking and detecting objects based on several tracking algorithms including ORB,
-    SIFT, ECC, and Sparse Optical Flow. It also supports downscaling of frames for computational efficiency.
+    SIFT, ECC, and Sparse Optical Flow. It also supports downscaling of frames for computational efficiency. The
+    'fastOptFlow' method is built for throughput: it writes frames into reusable buffers, follows its keypoints over
+    several frames and estimates the camera motion only every `stride` frames, interpolating in between.
 
     Attributes:
-        method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
+        method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow',
+            'fastOptFlow', 'none'.
         downscale (int): Factor by which to downscale the frames for processing.
+        stride (int): Number of frames between camera motion estimates of the 'fastOptFlow' method.
+        profile (Profile): Accumulated time spent in `apply`.
+        frames (int): Number of frames processed by `apply`.
         prevFrame (np.ndarray): Previous frame for tracking.
         prevKeyPoints (list): Keypoints from the previous frame.
         prevDescriptors (np.ndarray): Descriptors from the previous frame.
@@ -28,7 +35,9 @@ class GMC:
         apply_ecc: Apply the ECC algorithm to a raw frame.
         apply_features: Apply feature-based methods like ORB or SIFT to a raw frame.
         apply_sparseoptflow: Apply the Sparse Optical Flow method to a raw frame.
+        apply_fastoptflow: Apply the buffered, strided Sparse Optical Flow method to a raw frame.
         reset_params: Reset the internal parameters of the GMC object.
+        benchmark: Measure the time per frame of GMC methods on a sequence of frames.
 
     Examples:
         Create a GMC object and apply it to a frame
@@ -40,13 +49,15 @@ class GMC:
                [4, 5, 6]])
     """
 
-    def __init__(self, method: str = "sparseOptFlow", downscale: int = 2) -> None:
+    def __init__(self, method: str = "sparseOptFlow", downscale: int = 2, stride: int = 1) -> None:
         """
         Initialize a Generalized Motion Compensation (GMC) object with tracking method and downscale factor.
 
         Args:
-            method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow', 'none'.
+            method (str): The tracking method to use. Options include 'orb', 'sift', 'ecc', 'sparseOptFlow',
+                'fastOptFlow', 'none'.
             downscale (int): Downscale factor for processing frames.
+            stride (int): Estimate the camera motion every `stride` frames, 'fastOptFlow' only.
 
         Examples:
             Initialize a GMC object with the 'sparseOptFlow' method and a downscale factor of 2
@@ -56,6 +67,9 @@ class GMC:
 
         self.method = method
         self.downscale = max(1, downscale)
+        self.stride = max(1, stride)
+        self.profile = Profile()
+        self.frames = 0
 
         if self.method == "orb":
             self.detector = cv2.FastFeatureDetector_create(20)
@@ -73,20 +87,18 @@ class GMC:
             self.warp_mode = cv2.MOTION_EUCLIDEAN
             self.criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, number_of_iterations, termination_eps)
 
-        elif self.method == "sparseOptFlow":
+        elif self.method in {"sparseOptFlow", "fastOptFlow"}:
             self.feature_params = dict(
                 maxCorners=1000, qualityLevel=0.01, minDistance=1, blockSize=3, useHarrisDetector=False, k=0.04
             )
+            self.min_keypoints = self.feature_params["maxCorners"] // 4  # 'fastOptFlow' re-detects below this count
 
         elif self.method in {"none", "None", None}:
             self.method = None
         else:
             raise ValueError(f"Unknown GMC method: {method}")
 
-        self.prevFrame = None
-        self.prevKeyPoints = None
-        self.prevDescriptors = None
-        self.initializedFirstFrame = False
+        self.reset_params()
 
     def apply(self, raw_frame: np.ndarray, detections: list = None) -> np.ndarray:
         """
@@ -106,14 +118,18 @@ class GMC:
             >>> print(transformation_matrix.shape)
             (2, 3)
         """
-        if self.method in {"orb", "sift"}:
-            return self.apply_features(raw_frame, detections)
-        elif self.method == "ecc":
-            return self.apply_ecc(raw_frame)
-        elif self.method == "sparseOptFlow":
-            return self.apply_sparseoptflow(raw_frame)
-        else:
-            return np.eye(2, 3)
+        self.frames += 1
+        with self.profile:
+            if self.method in {"orb", "sift"}:
+                return self.apply_features(raw_frame, detections)
+            elif self.method == "ecc":
+                return self.apply_ecc(raw_frame)
+            elif self.method == "sparseOptFlow":
+                return self.apply_sparseoptflow(raw_frame)
+            elif self.method == "fastOptFlow":
+                return self.apply_fastoptflow(raw_frame)
+            else:
+                return np.eye(2, 3)
 
     def apply_ecc(self, raw_frame: np.ndarray) -> np.ndarray:
         """
@@ -368,9 +384,108 @@ class GMC:
 
         return H
 
+    def apply_fastoptflow(self, raw_frame: np.ndarray) -> np.ndarray:
+        """
+        Apply Sparse Optical Flow to a raw frame, built for throughput.
+
+        Frames are converted into preallocated buffers and keypoints are followed over several frames, re-detecting
+        them only when fewer than `min_keypoints` remain. The camera motion since the last estimate is measured every
+        `stride` frames; the frames in between reuse an equal share of the last measured motion, and each estimate
+        corrects the motion already applied since the previous one.
+
+        Args:
+            raw_frame (np.ndarray): The raw frame to be processed, with shape (H, W, C).
+
+        Returns:
+            (np.ndarray): Transformation matrix with shape (2, 3).
+
+        Examples:
+            >>> gmc = GMC(method="fastOptFlow", stride=2)
+            >>> raw_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+            >>> transformation_matrix = gmc.apply_fastoptflow(raw_frame)
+            >>> print(transformation_matrix.shape)
+            (2, 3)
+        """
+        if self.initializedFirstFrame:
+            self.elapsed += 1
+            if self.elapsed < self.stride:  # interpolate between estimates
+                self.applied = self.step @ self.applied
+                return self.step[:2].copy()
+
+        height, width, _ = raw_frame.shape
+        shape = (height // self.downscale, width // self.downscale)
+        if self.buffers is None or self.buffers[0].shape != shape:
+            self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(2)]  # current and previous frame
+            self.gray = np.empty((height, width), dtype=np.uint8) if self.downscale > 1 else None
+            self.initializedFirstFrame = False
+        frame = self.buffers[self.buffers[0] is self.prevFrame]
+        if self.gray is None:
+            cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY, dst=frame)
+        else:
+            cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
+            cv2.resize(self.gray, shape[::-1], dst=frame)
+
+        H = np.eye(2, 3)
+        keypoints = None
+        if self.initializedFirstFrame and self.prevKeyPoints is not None and len(self.prevKeyPoints):
+            matchedKeypoints, status, _ = cv2.calcOpticalFlowPyrLK(self.prevFrame, frame, self.prevKeyPoints, None)
+            good = status.ravel() == 1
+            keypoints = matchedKeypoints[good]
+            M = None
+            if good.sum() > 4:
+                M, _ = cv2.estimateAffinePartial2D(self.prevKeyPoints[good], keypoints, cv2.RANSAC)
+            if M is not None:
+                M[:, 2] *= self.downscale
+                M = np.vstack([M, [0.0, 0.0, 1.0]])  # motion since the last estimate
+                H = (M @ np.linalg.inv(self.applied))[:2]
+                self.step = np.eye(3) + (M - np.eye(3)) / self.elapsed
+            else:
+                LOGGER.warning("not enough matching points")
+                self.step = np.eye(3)
+
+        if keypoints is None or len(keypoints) < self.min_keypoints:
+            keypoints = cv2.goodFeaturesToTrack(frame, mask=None, **self.feature_params)
+
+        self.prevFrame = frame
+        self.prevKeyPoints = keypoints
+        self.applied = np.eye(3)
+        self.elapsed = 0
+        self.initializedFirstFrame = True
+
+        return H
+
     def reset_params(self) -> None:
         """Reset the internal parameters including previous frame, keypoints, and descriptors."""
         self.prevFrame = None
         self.prevKeyPoints = None
         self.prevDescriptors = None
         self.initializedFirstFrame = False
+        self.buffers = self.gray = None  # reusable 'fastOptFlow' frame buffers
+        self.step = self.applied = np.eye(3)  # 'fastOptFlow' motion per frame and motion applied since the estimate
+        self.elapsed = 0  # frames since the last 'fastOptFlow' estimate
+
+    @staticmethod
+    def benchmark(frames: list, methods=("orb", "sift", "ecc", "sparseOptFlow", "fastOptFlow"), **kwargs) -> dict:
+        """
+        Measure the time per frame of GMC methods, to choose a method for BOTSORT by cost.
+
+        Args:
+            frames (List[np.ndarray]): Consecutive raw frames with shape (H, W, C).
+            methods (Tuple[str, ...]): GMC methods to measure.
+            **kwargs (Any): Additional arguments for GMC, e.g. `downscale` or `stride`.
+
+        Returns:
+            (Dict[str, float]): Milliseconds per frame of each method.
+
+        Examples:
+            >>> frames = [np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(10)]
+            >>> GMC.benchmark(frames, methods=("sparseOptFlow", "fastOptFlow"), stride=2)
+            {'sparseOptFlow': 10.1, 'fastOptFlow': 2.3}
+        """
+        times = {}
+        for method in methods:
+            gmc = GMC(method, **kwargs)
+            for frame in frames:
+                gmc.apply(frame)
+            times[method] = gmc.profile.t * 1e3 / max(gmc.frames, 1)
+        return times
@@ -25,6 +25,9 @@ class KalmanFilterXYAH:
         project: Projects the state distribution to measurement space.
         multi_predict: Runs the Kalman filter prediction step (vectorized version).
         update: Runs the Kalman filter correction step.
+        multi_initiate: Creates tracks from multiple unassociated measurements (vectorized version).
+        multi_project: Projects multiple state distributions to measurement space (vectorized version).
+        multi_update: Runs the Kalman filter correction step for multiple states (vectorized version).
         gating_distance: Computes the gating distance between state distribution and measurements.
 
     Examples:
@@ -193,12 +196,10 @@ class KalmanFilterXYAH:
         ]
         sqr = np.square(np.r_[std_pos, std_vel]).T
 
-        motion_cov = [np.diag(sqr[i]) for i in range(len(mean))]
-        motion_cov = np.asarray(motion_cov)
+        motion_cov = sqr[:, :, None] * np.eye(8)  # (N, 8, 8) diagonal matrices
 
         mean = np.dot(mean, self._motion_mat.T)
-        left = np.dot(self._motion_mat, covariance).transpose((1, 0, 2))
-        covariance = np.dot(left, self._motion_mat.T) + motion_cov
+        covariance = self._motion_mat @ covariance @ self._motion_mat.T + motion_cov
 
         return mean, covariance
 
@@ -235,6 +236,89 @@ class KalmanFilterXYAH:
         new_covariance = covariance - np.linalg.multi_dot((kalman_gain, projected_cov, kalman_gain.T))
         return new_mean, new_covariance
 
+    def multi_initiate(self, measurements: np.ndarray):
+        """
+        Create tracks from multiple unassociated measurements (vectorized version of `initiate`).
+
+        Args:
+            measurements (np.ndarray): The Nx4 dimensional (x, y, a, h) measurements of the new tracks.
+
+        Returns:
+            (np.ndarray): Mean matrix of the new tracks with shape (N, 8). Unobserved velocities are initialized to 0.
+            (np.ndarray): Covariance matrix of the new tracks with shape (N, 8, 8).
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean, covariance = kf.multi_initiate(np.array([[100, 50, 1.5, 200], [300, 80, 0.5, 100]]))
+        """
+        h = measurements[:, 3]
+        std = [
+            2 * self._std_weight_position * h,
+            2 * self._std_weight_position * h,
+            1e-2 * np.ones_like(h),
+            2 * self._std_weight_position * h,
+            10 * self._std_weight_velocity * h,
+            10 * self._std_weight_velocity * h,
+            1e-5 * np.ones_like(h),
+            10 * self._std_weight_velocity * h,
+        ]
+        return self._multi_initiate(measurements, std)
+
+    def _multi_initiate(self, measurements: np.ndarray, std: list):
+        """Build initial means and diagonal covariances from measurements and per-dimension standard deviations."""
+        mean = np.concatenate([measurements, np.zeros_like(measurements)], axis=1).astype(float)
+        covariance = np.zeros((len(measurements), 8, 8))
+        covariance[:, range(8), range(8)] = np.square(np.stack(std, axis=1))
+        return mean, covariance
+
+    def multi_project(self, mean: np.ndarray, covariance: np.ndarray):
+        """
+        Project multiple state distributions to measurement space (vectorized version of `project`).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the states.
+
+        Returns:
+            (np.ndarray): Projected means with shape (N, 4).
+            (np.ndarray): Projected covariances with shape (N, 4, 4).
+        """
+        h = mean[:, 3]
+        std = [self._std_weight_position * h, self._std_weight_position * h, 1e-1 * np.ones_like(h)]
+        return self._multi_project(mean, covariance, [*std, self._std_weight_position * h])
+
+    def _multi_project(self, mean: np.ndarray, covariance: np.ndarray, std: list):
+        """Project states to measurement space, adding the diagonal innovation covariance of the given deviations."""
+        covariance = self._update_mat @ covariance @ self._update_mat.T
+        covariance[:, range(4), range(4)] += np.square(np.stack(std, axis=1))
+        return mean @ self._update_mat.T, covariance
+
+    def multi_update(self, mean: np.ndarray, covariance: np.ndarray, measurements: np.ndarray):
+        """
+        Run the Kalman filter correction step for multiple states (vectorized version of `update`).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional predicted state means.
+            covariance (np.ndarray): The Nx8x8 dimensional state covariances.
+            measurements (np.ndarray): The Nx4 dimensional measurements, one per state.
+
+        Returns:
+            (np.ndarray): Measurement-corrected state means with shape (N, 8).
+            (np.ndarray): Measurement-corrected state covariances with shape (N, 8, 8).
+
+        Examples:
+            >>> kf = KalmanFilterXYAH()
+            >>> mean, covariance = kf.multi_initiate(np.array([[100, 50, 1.5, 200]]))
+            >>> mean, covariance = kf.multi_update(mean, covariance, np.array([[102, 51, 1.5, 201]]))
+        """
+        projected_mean, projected_cov = self.multi_project(mean, covariance)
+        gain = np.linalg.solve(projected_cov, (covariance @ self._update_mat.T).transpose(0, 2, 1))
+        gain = gain.transpose(0, 2, 1)  # (N, 8, 4), P H^T S^-1 with S symmetric
+        innovation = measurements - projected_mean
+        mean = mean + (gain @ innovation[..., None])[..., 0]
+        covariance = covariance - gain @ projected_cov @ gain.transpose(0, 2, 1)
+        return mean, covariance
+
     def gating_distance(
         self,
         mean: np.ndarray,
@@ -307,6 +391,8 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         project: Projects the state distribution to measurement space.
         multi_predict: Runs the Kalman filter prediction step in a vectorized manner.
         update: Runs the Kalman filter correction step.
+        multi_initiate: Creates tracks from multiple unassociated measurements in a vectorized manner.
+        multi_project: Projects multiple state distributions to measurement space in a vectorized manner.
 
     Examples:
         Create a Kalman filter and initialize a track
@@ -460,12 +546,10 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
         ]
         sqr = np.square(np.r_[std_pos, std_vel]).T
 
-        motion_cov = [np.diag(sqr[i]) for i in range(len(mean))]
-        motion_cov = np.asarray(motion_cov)
+        motion_cov = sqr[:, :, None] * np.eye(8)  # (N, 8, 8) diagonal matrices
 
         mean = np.dot(mean, self._motion_mat.T)
-        left = np.dot(self._motion_mat, covariance).transpose((1, 0, 2))
-        covariance = np.dot(left, self._motion_mat.T) + motion_cov
+        covariance = self._motion_mat @ covariance @ self._motion_mat.T + motion_cov
 
         return mean, covariance
 
@@ -491,3 +575,35 @@ class KalmanFilterXYWH(KalmanFilterXYAH):
             >>> new_mean, new_covariance = kf.update(mean, covariance, measurement)
         """
         return super().update(mean, covariance, measurement)
+
+    def multi_initiate(self, measurements):
+        """
+        Create tracks from multiple unassociated measurements (vectorized version of `initiate`).
+
+        Args:
+            measurements (np.ndarray): The Nx4 dimensional (x, y, w, h) measurements of the new tracks.
+
+        Returns:
+            (np.ndarray): Mean matrix of the new tracks with shape (N, 8). Unobserved velocities are initialized to 0.
+            (np.ndarray): Covariance matrix of the new tracks with shape (N, 8, 8).
+        """
+        w, h = measurements[:, 2], measurements[:, 3]
+        pos, vel = 2 * self._std_weight_position, 10 * self._std_weight_velocity
+        return self._multi_initiate(
+            measurements, [pos * w, pos * h, pos * w, pos * h, vel * w, vel * h, vel * w, vel * h]
+        )
+
+    def multi_project(self, mean, covariance):
+        """
+        Project multiple state distributions to measurement space (vectorized version of `project`).
+
+        Args:
+            mean (np.ndarray): The Nx8 dimensional mean matrix of the states.
+            covariance (np.ndarray): The Nx8x8 covariance matrix of the states.
+
+        Returns:
+            (np.ndarray): Projected means with shape (N, 4).
+            (np.ndarray): Projected covariances with shape (N, 4, 4).
+        """
+        w, h = self._std_weight_position * mean[:, 2], self._std_weight_position * mean[:, 3]
+        return self._multi_project(mean, covariance, [w, h, w, h])
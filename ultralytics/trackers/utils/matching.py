@@ -2,9 +2,11 @@
 
 import numpy as np
 import scipy
+import torch
+from scipy.sparse.csgraph import connected_components
 from scipy.spatial.distance import cdist
 
-from ultralytics.utils.metrics import batch_probiou, bbox_ioa
+from ultralytics.utils.metrics import batch_probiou, bbox_ioa, probiou
 
 try:
     import lap  # for linear_assignment
@@ -61,13 +63,125 @@ def linear_assignment(cost_matrix: np.ndarray, thresh: float, use_lap: bool = Tr
     return matches, unmatched_a, unmatched_b
 
 
+def sparse_linear_assignment(i: np.ndarray, j: np.ndarray, cost: np.ndarray, shape: tuple, thresh: float) -> tuple:
+    """
+    Perform linear assignment over candidate pairs only, solving every connected component of pairs separately.
+
+    Pairs missing from the candidates are treated as costs above `thresh`, which can never be matched. The assignment is
+    the same as `linear_assignment` of the dense cost matrix, but the cost of the dense solver only grows with the size
+    of the largest group of mutually competing tracks and detections rather than with all of them.
+
+    Args:
+        i (np.ndarray): Row indices of the candidate pairs.
+        j (np.ndarray): Column indices of the candidate pairs.
+        cost (np.ndarray): Costs of the candidate pairs.
+        shape (Tuple[int, int]): Shape (N, M) of the full cost matrix.
+        thresh (float): Threshold for considering an assignment valid.
+
+    Returns:
+        matched_indices (np.ndarray): Array of matched indices of shape (K, 2), sorted by row.
+        unmatched_a (np.ndarray): Array of unmatched row indices.
+        unmatched_b (np.ndarray): Array of unmatched column indices.
+
+    Examples:
+        >>> i, j, cost = np.array([0, 0, 2]), np.array([0, 1, 2]), np.array([0.1, 0.3, 0.9])
+        >>> matches, unmatched_a, unmatched_b = sparse_linear_assignment(i, j, cost, (3, 3), thresh=0.8)
+    """
+    n, m = shape
+    keep = cost <= thresh  # pairs above the threshold are never matched
+    i, j, cost = i[keep], j[keep], cost[keep]
+    adjacency = scipy.sparse.coo_matrix((np.ones(len(i)), (i, n + j)), shape=(n + m, n + m))
+    _, labels = connected_components(adjacency, directed=False)
+    component = labels[i]
+    single = np.bincount(component, minlength=n + m)[component] == 1  # pairs that compete with no other pair
+    matches = [np.stack([i[single], j[single]], axis=1)]
+    order = np.argsort(component[~single], kind="stable")
+    ci, cj, cc, comp = i[~single][order], j[~single][order], cost[~single][order], component[~single][order]
+    for k in np.split(np.arange(len(comp)), np.flatnonzero(np.diff(comp)) + 1) if len(comp) else []:
+        rows, ri = np.unique(ci[k], return_inverse=True)
+        cols, rj = np.unique(cj[k], return_inverse=True)
+        dense = np.full((len(rows), len(cols)), thresh + 1.0)
+        dense[ri, rj] = cc[k]
+        sub, _, _ = linear_assignment(dense, thresh)
+        sub = np.asarray(sub, dtype=int).reshape(-1, 2)
+        matches.append(np.stack([rows[sub[:, 0]], cols[sub[:, 1]]], axis=1))
+    matches = np.concatenate(matches)
+    matches = matches[np.argsort(matches[:, 0], kind="stable")]
+    return matches, np.setdiff1d(np.arange(n), matches[:, 0]), np.setdiff1d(np.arange(m), matches[:, 1])
+
+
+def iou_pairs(atlbrs: np.ndarray, btlbrs: np.ndarray) -> tuple:
+    """
+    Find the pairs of overlapping boxes and their IoU without computing the dense IoU matrix.
+
+    Box centers are hashed into a uniform grid with cells as large as the largest box, so that the boxes overlapping a
+    box lie in its own or the 8 neighbouring cells, and the IoU is only computed for the boxes in these cells. For
+    oriented boxes, whose probabilistic IoU is never exactly zero, cells are twice the largest box diagonal and pairs
+    farther apart, whose probiou is below 1e-5, are dropped.
+
+    Args:
+        atlbrs (np.ndarray): Boxes 'a' in (x1, y1, x2, y2) format with shape (N, 4) or (x, y, w, h, angle) format with
+            shape (N, 5).
+        btlbrs (np.ndarray): Boxes 'b' in the same format as `atlbrs`.
+
+    Returns:
+        i (np.ndarray): Indices of the boxes 'a' of the overlapping pairs.
+        j (np.ndarray): Indices of the boxes 'b' of the overlapping pairs.
+        ious (np.ndarray): IoU of the pairs, equal to the corresponding `1 - iou_distance(atlbrs, btlbrs)` entries.
+
+    Examples:
+        >>> a = np.array([[0, 0, 10, 10], [100, 100, 110, 110]])
+        >>> b = np.array([[5, 5, 15, 15], [500, 500, 510, 510]])
+        >>> i, j, ious = iou_pairs(a, b)  # only the first boxes overlap
+    """
+    if not len(atlbrs) or not len(btlbrs):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=np.float32)
+    a, b = np.ascontiguousarray(atlbrs, dtype=np.float32), np.ascontiguousarray(btlbrs, dtype=np.float32)
+    obb = a.shape[1] == 5
+    if obb:
+        ca, cb = a[:, :2], b[:, :2]
+        cell = 2 * max(np.hypot(a[:, 2], a[:, 3]).max(), np.hypot(b[:, 2], b[:, 3]).max())
+    else:
+        ca, cb = (a[:, :2] + a[:, 2:]) / 2, (b[:, :2] + b[:, 2:]) / 2
+        cell = max((a[:, 2:] - a[:, :2]).max(), (b[:, 2:] - b[:, :2]).max())
+    i, j = _grid_neighbours(ca, cb, max(float(cell), 1e-6))
+    if obb:
+        ious = probiou(torch.from_numpy(a[i]), torch.from_numpy(b[j])).view(-1).numpy()
+        keep = ious > 1e-5
+    else:
+        (ax1, ay1, ax2, ay2), (bx1, by1, bx2, by2) = a[i].T, b[j].T
+        inter = (np.minimum(ax2, bx2) - np.maximum(ax1, bx1)).clip(0) * (
+            np.minimum(ay2, by2) - np.maximum(ay1, by1)
+        ).clip(0)
+        ious = inter / ((bx2 - bx1) * (by2 - by1) + (ax2 - ax1) * (ay2 - ay1) - inter + 1e-7)  # same as bbox_ioa
+        keep = inter > 0
+    return i[keep], j[keep], ious[keep]
+
+
+def _grid_neighbours(ca: np.ndarray, cb: np.ndarray, cell: float) -> tuple:
+    """Return the index pairs of points `ca` and `cb` lying in the same or neighbouring grid cells of size `cell`."""
+    ka, kb = np.floor(ca / cell).astype(np.int64), np.floor(cb / cell).astype(np.int64)
+    lo = np.minimum(ka.min(0), kb.min(0)) - 1  # keep neighbouring cells non-negative
+    ka, kb = ka - lo, kb - lo
+    ny = int(max(ka[:, 1].max(), kb[:, 1].max())) + 2
+    keys = kb[:, 0] * ny + kb[:, 1]
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    queries = (ka[:, 0] * ny + ka[:, 1])[:, None] + np.array([dx * ny + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+    start = np.searchsorted(keys, queries.ravel(), "left")
+    counts = np.searchsorted(keys, queries.ravel(), "right") - start
+    i = np.repeat(np.arange(len(ca)), 9)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(i, counts), order[np.repeat(start, counts) + offsets]
+
+
 def iou_distance(atracks: list, btracks: list) -> np.ndarray:
     """
     Compute cost based on Intersection over Union (IoU) between tracks.
 
     Args:
-        atracks (List[STrack] | List[np.ndarray]): List of tracks 'a' or bounding boxes.
-        btracks (List[STrack] | List[np.ndarray]): List of tracks 'b' or bounding boxes.
+        atracks (List[STrack] | List[np.ndarray] | np.ndarray): List of tracks 'a' or bounding boxes.
+        btracks (List[STrack] | List[np.ndarray] | np.ndarray): List of tracks 'b' or bounding boxes.
 
     Returns:
         (np.ndarray): Cost matrix computed based on IoU with shape (len(atracks), len(btracks)).
@@ -78,7 +192,7 @@ def iou_distance(atracks: list, btracks: list) -> np.ndarray:
         >>> btracks = [np.array([5, 5, 15, 15]), np.array([25, 25, 35, 35])]
         >>> cost_matrix = iou_distance(atracks, btracks)
     """
-    if atracks and isinstance(atracks[0], np.ndarray) or btracks and isinstance(btracks[0], np.ndarray):
+    if len(atracks) and isinstance(atracks[0], np.ndarray) or len(btracks) and isinstance(btracks[0], np.ndarray):
         atlbrs = atracks
         btlbrs = btracks
     else:
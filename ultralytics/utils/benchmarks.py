@@ -3,9 +3,10 @@
 Benchmark a YOLO model formats for speed and accuracy.
 
 Usage:
-    from ultralytics.utils.benchmarks import ProfileModels, benchmark
+    from ultralytics.utils.benchmarks import ProfileModels, benchmark, benchmark_ema, benchmark_nms
     ProfileModels(['yolo11n.yaml', 'yolov8s.yaml']).profile()
     benchmark(model='yolo11n.pt', imgsz=160)
+    benchmark_nms(batch_sizes=(1, 8, 32, 64), candidates=(10, 100, 1000))
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -201,6 +202,121 @@ def benchmark(
     return df
 
 
+def benchmark_nms(batch_sizes=(1, 8, 32, 64), candidates=(10, 100, 1000), anchors=8400, nc=80, device="cpu", runs=10):
+    """
+    Microbenchmark per-image `non_max_suppression` against `batched_non_max_suppression` on random predictions.
+
+    Every image gets `candidates` random boxes scoring above the 0.25 confidence threshold among `anchors` predictions.
+
+    Args:
+        batch_sizes (Tuple[int, ...]): Batch sizes to benchmark.
+        candidates (Tuple[int, ...]): Numbers of candidate boxes per image to benchmark.
+        anchors (int): Number of predicted boxes per image, i.e. 8400 for imgsz=640.
+        nc (int): Number of classes.
+        device (str): Device to run the benchmark on, i.e. 'cpu' or 'cuda:0'.
+        runs (int): Number of timed runs per configuration, after one warmup run.
+
+    Returns:
+        (List[dict]): Batch size, candidates, and mean 'loop' and 'batched' times in ms per configuration.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_nms
+        >>> benchmark_nms(batch_sizes=(1, 64), candidates=(100,), device="cuda:0")
+    """
+    from ultralytics.utils.ops import Profile, batched_non_max_suppression, non_max_suppression
+
+    device = select_device(device, verbose=False)
+    rows = []
+    for bs in batch_sizes:
+        for n in candidates:
+            x = torch.rand(bs, 4 + nc, anchors, device=device)
+            x[:, :2] *= 640  # xy
+            x[:, 2:4] = x[:, 2:4] * 100 + 5  # wh
+            x[:, 4:] *= 0.2  # scores below conf_thres
+            i = torch.rand(bs, anchors, device=device).argsort(1)[:, :n]  # candidate boxes
+            c = torch.randint(4, 4 + nc, i.shape, device=device)
+            x[torch.arange(bs, device=device)[:, None], c, i] = torch.rand(i.shape, device=device) * 0.75 + 0.25
+            row = {"batch": bs, "candidates": n}
+            for name, f in ("loop", non_max_suppression), ("batched", batched_non_max_suppression):
+                f(x.clone(), max_time_img=float("inf"))  # warmup
+                dt = Profile(device=device)
+                for _ in range(runs):
+                    y = x.clone()
+                    with dt:
+                        f(y, max_time_img=float("inf"))
+                row[name] = dt.t * 1e3 / runs
+            rows.append(row)
+
+    s = f"{'Batch':>6}{'Candidates':>12}{'Loop (ms)':>12}{'Batched (ms)':>14}{'Speedup':>9}"
+    for r in rows:
+        s += f"\n{r['batch']:>6}{r['candidates']:>12}{r['loop']:>12.2f}{r['batched']:>14.2f}"
+        s += f"{r['loop'] / r['batched']:>8.2f}x"
+    LOGGER.info(f"\nNMS benchmark on {device} with {anchors} boxes and {nc} classes per image\n{s}")
+    return rows
+
+
+def benchmark_ema(models=("yolo11n.yaml", "yolo11x.yaml"), every=(1, 4), device="cpu", runs=50):
+    """
+    Microbenchmark the time `ModelEMA.update` adds to each optimizer step against the previous per-tensor update.
+
+    The previous implementation did two in-place ops per state_dict tensor on every step. It is timed against the
+    foreach update for each `every` interval and, on CUDA, against an EMA kept on the CPU with asynchronous copies.
+
+    Args:
+        models (Tuple[str, ...]): Model YAML or weights files to benchmark.
+        every (Tuple[int, ...]): EMA update intervals in optimizer steps to benchmark.
+        device (str): Device to keep the models on, i.e. 'cpu' or 'cuda:0'.
+        runs (int): Number of timed optimizer steps per configuration, after warmup steps.
+
+    Returns:
+        (List[dict]): Model and mean EMA time in ms per optimizer step for each configuration.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_ema
+        >>> benchmark_ema(models=("yolo11x.yaml",), device="cuda:0")
+    """
+    from ultralytics.utils.ops import Profile
+    from ultralytics.utils.torch_utils import ModelEMA
+
+    def loop_update(ema, model):
+        """Previous ModelEMA.update with two in-place ops per state_dict tensor."""
+        ema.updates += 1
+        d = ema.decay(ema.updates)
+        msd = model.state_dict()
+        for k, v in ema.ema.state_dict().items():
+            if v.dtype.is_floating_point:
+                v *= d
+                v += (1 - d) * msd[k].detach()
+
+    device = select_device(device, verbose=False)
+    rows = []
+    for m in models:
+        model = YOLO(m).model.to(device)
+        configs = {"loop": (loop_update, {})}
+        configs.update({f"foreach every {n}": (ModelEMA.update, {"every": n}) for n in every})
+        if device.type == "cuda":
+            configs["foreach cpu"] = (ModelEMA.update, {"device": "cpu"})
+        row = {"model": Path(m).stem}
+        for name, (update, kwargs) in configs.items():
+            ema = ModelEMA(model, **kwargs)
+            for _ in range(max(every) + 1):
+                update(ema, model)  # warmup
+            dt = Profile(device=device)
+            for _ in range(runs):
+                with dt:
+                    update(ema, model)
+            ema.flush()
+            row[name] = dt.t * 1e3 / runs
+        rows.append(row)
+
+    names = list(rows[0])[1:]
+    s = f"{'Model':>12}" + "".join(f"{n:>18}" for n in names)
+    for r in rows:
+        s += f"\n{r['model']:>12}" + "".join(f"{r[n]:>18.3f}" for n in names)
+    LOGGER.info(f"\nEMA update benchmark on {device}, mean ms per optimizer step\n{s}")
+    return rows
+
+
 class RF100Benchmark:
     """
     Benchmark YOLO model performance across various formats for speed and accuracy.
@@ -444,6 +444,7 @@ def _log_plots(experiment, trainer) -> None:
 def _log_model(experiment, trainer) -> None:
     """Log the best-trained model to Comet.ml."""
     model_name = _get_comet_model_name()
+    trainer.ckpt_writer.wait()  # checkpoints are written in a background thread
     experiment.log_model(model_name, file_or_folder=str(trainer.best), file_name="best.pt", overwrite=True)
 
 
@@ -0,0 +1,488 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+Vectorized COCO and LVIS evaluation of in-memory predictions.
+
+COCOEvaluator reproduces the AP/AR numbers of pycocotools COCOeval and of the federated lvis LVISEval exactly, but
+matches all image-category pairs at once with numpy instead of looping over them in Python, and reads predictions
+straight from a validator's `jdict` instead of a predictions.json round-trip. Ground truth is parsed once into flat
+arrays by COCOAnnotations and cached next to the annotation file.
+
+Examples:
+    >>> from ultralytics.utils.cocoeval import COCOEvaluator
+    >>> evaluator = COCOEvaluator("annotations/instances_val2017.json", iou_type="bbox")
+    >>> results = evaluator.evaluate(validator.jdict)
+    >>> results["AP"], results["AP50"]
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from ultralytics.utils import LOGGER, colorstr
+from ultralytics.utils.metrics import OKS_SIGMA
+
+COCO_CACHE_VERSION = "1.0.0"  # COCOAnnotations *.cache version
+
+
+def _lookup(keys, values):
+    """Return the index of each value in the sorted array keys, or -1 where it is missing."""
+    if not len(keys):
+        return np.full(len(values), -1, dtype=np.int64)
+    i = np.searchsorted(keys, values).clip(max=len(keys) - 1)
+    return np.where(keys[i] == values, i, -1)
+
+
+def _group(keys, sorted_keys):
+    """Return the start offset and length of each key in sorted_keys, a sorted array with repeated keys."""
+    start = np.searchsorted(sorted_keys, keys, side="left")
+    return start, np.searchsorted(sorted_keys, keys, side="right") - start
+
+
+class COCOAnnotations:
+    """
+    Ground truth of a COCO or LVIS annotation JSON file, indexed into flat per-annotation arrays.
+
+    Loading a large annotation file and rasterizing its polygons dominates the cost of a pycocotools evaluation, so the
+    index is saved to a *.cache file next to the JSON file and reused for as long as the file is unchanged.
+
+    Attributes:
+        json_file (Path): Path to the annotation JSON file.
+        img_ids (np.ndarray): Image IDs, shape (I,).
+        img_shapes (np.ndarray): Image (height, width), shape (I, 2).
+        cat_ids (np.ndarray): Sorted category IDs, shape (K,).
+        frequency (np.ndarray): LVIS frequency group ('r', 'c' or 'f') of each category, empty strings for COCO.
+        neg (np.ndarray): (image index, category ID) pairs verified absent from an image (LVIS), shape (P, 2).
+        not_exhaustive (np.ndarray): (image index, category ID) pairs not exhaustively annotated (LVIS), shape (Q, 2).
+        img (np.ndarray): Image index of each annotation, shape (N,).
+        cat (np.ndarray): Category ID of each annotation, shape (N,).
+        bbox (np.ndarray): Boxes in COCO (x, y, w, h) format, shape (N, 4).
+        area (np.ndarray): Annotation areas, shape (N,).
+        iscrowd (np.ndarray): Crowd flags, shape (N,).
+        ignore (np.ndarray): Explicit ignore flags, shape (N,).
+        keypoints (np.ndarray | None): Keypoints as (x, y, visibility) triplets, shape (N, 3 * nkpt).
+        num_keypoints (np.ndarray | None): Number of labeled keypoints, shape (N,).
+        segments (list | None): RLE of each annotation if indexed with segments=True.
+
+    Examples:
+        >>> anno = COCOAnnotations("annotations/instances_val2017.json", segments=True)
+        >>> len(anno.cat), anno.cat_ids[:3]
+    """
+
+    def __init__(self, json_file, segments=False):
+        """
+        Load the annotation index of json_file from its cache, building and caching it if missing or outdated.
+
+        Args:
+            json_file (str | Path): Path to a COCO or LVIS annotation JSON file.
+            segments (bool): Whether to index annotation masks as RLE, needed for 'segm' evaluation.
+        """
+        from ultralytics.data.utils import get_file_stats, load_dataset_cache_file, save_dataset_cache_file
+
+        self.json_file = Path(json_file)
+        cache_path = self.json_file.with_suffix(".cache")
+        stats = get_file_stats([str(self.json_file)])
+        try:
+            cache = load_dataset_cache_file(cache_path)
+            assert cache["version"] == COCO_CACHE_VERSION  # matches current version
+            assert np.array_equal(cache["stats"], stats)  # unchanged annotation file
+            assert cache["segments"] is not None or not segments  # masks indexed if needed
+        except (FileNotFoundError, AssertionError, AttributeError, KeyError):
+            cache = self.index(self.json_file, segments)
+            cache["stats"] = stats
+            save_dataset_cache_file(colorstr("COCO: "), cache_path, cache, COCO_CACHE_VERSION)
+        for k in "version", "stats":
+            cache.pop(k)
+        self.__dict__.update(cache)
+
+    @staticmethod
+    def index(json_file, segments=False):
+        """
+        Parse an annotation JSON file into flat arrays.
+
+        Args:
+            json_file (str | Path): Path to a COCO or LVIS annotation JSON file.
+            segments (bool): Whether to convert annotation polygons and uncompressed RLE to compressed RLE.
+
+        Returns:
+            (dict): Annotation arrays keyed by COCOAnnotations attribute name.
+        """
+        with open(json_file, encoding="utf-8") as f:
+            data = json.load(f)
+        images, anns = data["images"], data.get("annotations", [])
+        cats = sorted(data["categories"], key=lambda x: x["id"])
+        index = {im["id"]: i for i, im in enumerate(images)}
+        x = {
+            "img_ids": np.array([im["id"] for im in images]),
+            "img_shapes": np.array([(im["height"], im["width"]) for im in images], dtype=np.int64).reshape(-1, 2),
+            "cat_ids": np.array([c["id"] for c in cats], dtype=np.int64),
+            "frequency": np.array([c.get("frequency", "") for c in cats], dtype=str),
+            "img": np.array([index[a["image_id"]] for a in anns], dtype=np.int64),
+            "cat": np.array([a["category_id"] for a in anns], dtype=np.int64),
+            "bbox": np.array([a["bbox"] for a in anns], dtype=np.float64).reshape(-1, 4),
+            "area": np.array([a["area"] for a in anns], dtype=np.float64),
+            "iscrowd": np.array([a.get("iscrowd", 0) for a in anns], dtype=bool),
+            "ignore": np.array([a.get("ignore", 0) for a in anns], dtype=bool),
+            "keypoints": None,
+            "num_keypoints": None,
+            "segments": None,
+        }
+        for k in "neg_category_ids", "not_exhaustive_category_ids":
+            pairs = [(i, c) for i, im in enumerate(images) for c in im.get(k, [])]
+            x["neg" if k.startswith("neg") else "not_exhaustive"] = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        if any("keypoints" in a for a in anns):
+            nkpt = max(len(a.get("keypoints", [])) for a in anns)
+            x["keypoints"] = np.array([a.get("keypoints") or [0] * nkpt for a in anns], dtype=np.float64)
+            x["num_keypoints"] = np.array([a.get("num_keypoints", 0) for a in anns], dtype=np.int64)
+        if segments:
+            from pycocotools import mask as mask_utils
+
+            rles = []
+            for a, (h, w) in zip(anns, x["img_shapes"][x["img"]].tolist()):
+                segm = a["segmentation"]
+                if isinstance(segm, list):  # polygons, merged into one RLE
+                    rles.append(mask_utils.merge(mask_utils.frPyObjects(segm, h, w)))
+                elif isinstance(segm["counts"], list):  # uncompressed RLE
+                    rles.append(mask_utils.frPyObjects(segm, h, w))
+                else:
+                    rles.append(segm)
+            x["segments"] = rles
+        return x
+
+
+class COCOEvaluator:
+    """
+    Vectorized COCO-protocol evaluator of in-memory predictions, returning the same numbers as pycocotools.
+
+    Detections of every image-category pair are ranked by score and greedily matched to ground truth in lockstep,
+    one detection rank at a time, for all pairs, IoU thresholds and area ranges at once. The per-category precision
+    and recall accumulation then runs on flat sorted arrays. The matching, ignore and tie-breaking rules follow
+    COCOeval.evaluateImg exactly, and with lvis=True the federated LVISEval rules apply instead: at most 300
+    detections per image, no crowd regions, only detections of categories verified present or absent in an image are
+    evaluated and unmatched detections of not exhaustively annotated categories are ignored.
+
+    Attributes:
+        anno (COCOAnnotations): Indexed ground truth.
+        iou_type (str): Evaluation type, one of 'bbox', 'segm' or 'keypoints'.
+        lvis (bool): Whether to apply the LVIS federated evaluation protocol.
+        iou_thrs (np.ndarray): IoU thresholds, shape (T,).
+        rec_thrs (np.ndarray): Recall thresholds at which precision is sampled, shape (R,).
+        max_dets (list): Maximum detections per image-category pair (per image for LVIS).
+        area_rng (list): Area ranges as [min, max] pairs.
+        area_lbl (list): Labels of the area ranges.
+        summary (list): (key, is_ap, iou_thr, area_lbl, max_det, frequency) of each summary metric.
+        precision (np.ndarray): Precision of shape (T, R, K, A, M), -1 for categories without ground truth.
+        recall (np.ndarray): Recall of shape (T, K, A, M), -1 for categories without ground truth.
+        stats (np.ndarray): Summary metrics in pycocotools order.
+
+    Methods:
+        evaluate: Evaluate predictions and return the summary metrics.
+        summarize: Compute the summary metrics from precision and recall.
+
+    Examples:
+        >>> evaluator = COCOEvaluator("annotations/instances_val2017.json", iou_type="bbox")
+        >>> results = evaluator.evaluate(jdict, img_ids=[139, 285])
+    """
+
+    def __init__(self, anno, iou_type="bbox", lvis=False):
+        """
+        Initialize the evaluator with ground truth and COCO or LVIS evaluation parameters.
+
+        Args:
+            anno (COCOAnnotations | str | Path): Indexed ground truth or path to the annotation JSON file.
+            iou_type (str): Evaluation type, one of 'bbox', 'segm' or 'keypoints'.
+            lvis (bool): Whether to apply the LVIS federated evaluation protocol.
+        """
+        assert iou_type in {"bbox", "segm", "keypoints"}, f"Unsupported iou_type '{iou_type}'"
+        assert not (lvis and iou_type == "keypoints"), "LVIS has no keypoint annotations"
+        self.anno = anno if isinstance(anno, COCOAnnotations) else COCOAnnotations(anno, segments=iou_type == "segm")
+        self.iou_type = iou_type
+        self.lvis = lvis
+        self.iou_thrs = np.linspace(0.5, 0.95, 10)
+        self.rec_thrs = np.linspace(0.0, 1.00, 101)
+        if iou_type == "keypoints":
+            self.max_dets = [20]
+            self.area_rng = [[0**2, 1e5**2], [32**2, 96**2], [96**2, 1e5**2]]
+            self.area_lbl = ["all", "medium", "large"]
+            ap = [("AP", None, "all"), ("AP50", 0.5, "all"), ("AP75", 0.75, "all"), ("APm", None, "medium")]
+            ap += [("APl", None, "large")]
+            ar = [(k.replace("AP", "AR"), t, a) for k, t, a in ap]
+            self.summary = [(k, True, t, a, 20, None) for k, t, a in ap] + [
+                (k, False, t, a, 20, None) for k, t, a in ar
+            ]
+        else:
+            self.max_dets = [300] if lvis else [1, 10, 100]
+            self.area_rng = [[0**2, 1e5**2], [0**2, 32**2], [32**2, 96**2], [96**2, 1e5**2]]
+            self.area_lbl = ["all", "small", "medium", "large"]
+            m = self.max_dets[-1]
+            self.summary = [
+                ("AP", True, None, "all", m, None),
+                ("AP50", True, 0.5, "all", m, None),
+                ("AP75", True, 0.75, "all", m, None),
+                ("APs", True, None, "small", m, None),
+                ("APm", True, None, "medium", m, None),
+                ("APl", True, None, "large", m, None),
+            ]
+            if lvis:
+                self.summary += [(f"AP{f}", True, None, "all", m, f) for f in "rcf"]
+                self.summary += [(f"AR{a}@{m}", False, None, b, m, None) for a, b in (("", "all"), ("s", "small"))]
+                self.summary += [(f"AR{a}@{m}", False, None, b, m, None) for a, b in (("m", "medium"), ("l", "large"))]
+            else:
+                self.summary += [(f"AR{d}", False, None, "all", d, None) for d in self.max_dets]
+                self.summary += [(f"AR{a[0]}", False, None, a, m, None) for a in self.area_lbl[1:]]
+        self.precision = self.recall = self.stats = None
+
+    def evaluate(self, preds, img_ids=None):
+        """
+        Evaluate predictions against the ground truth of the given images.
+
+        Args:
+            preds (list[dict]): Predictions in COCO results format, e.g. a validator's jdict, with 'image_id',
+                'category_id', 'bbox' (x, y, w, h), 'score' and 'segmentation' (RLE) or 'keypoints' per iou_type.
+            img_ids (list, optional): IDs of the images to evaluate, all annotated images if None.
+
+        Returns:
+            (dict): Summary metrics keyed like pycocotools and LVISEval, e.g. 'AP', 'AP50', 'APs', 'AR100'.
+        """
+        anno = self.anno
+        img_ids = np.unique(anno.img_ids if img_ids is None else np.asarray(img_ids))
+        cat_ids, thrs = anno.cat_ids, self.iou_thrs
+        ni, K, A, T = len(img_ids), len(cat_ids), len(self.area_rng), len(thrs)
+
+        # Ground truth of the evaluated images, grouped by (category, image) in annotation order
+        g_img, g_cat = _lookup(img_ids, anno.img_ids[anno.img]), _lookup(cat_ids, anno.cat)
+        keep = (g_img >= 0) & (g_cat >= 0)
+        if self.lvis:  # LVIS.get_ann_ids() drops empty annotations
+            keep &= (anno.area > 0) & (anno.area < np.inf)
+        g = np.flatnonzero(keep)
+        g = g[np.argsort(g_cat[g] * ni + g_img[g], kind="stable")]
+        g_key = g_cat[g] * ni + g_img[g]
+        g_area = anno.area[g]
+        g_crowd = np.zeros(len(g), dtype=bool) if self.lvis else anno.iscrowd[g]
+        g_ig = anno.ignore[g] if self.lvis else g_crowd.copy()
+        if self.iou_type == "keypoints":
+            g_ig |= anno.num_keypoints[g] == 0
+        g_ig = g_ig[:, None] | np.stack([(g_area < lo) | (g_area > hi) for lo, hi in self.area_rng], 1)  # (G, A)
+        npig = np.stack([np.bincount(g_key[~g_ig[:, a]] // ni, minlength=K) for a in range(A)], 1)  # (K, A)
+
+        # Predictions ranked by score within each (category, image) pair
+        n = len(preds)
+        p_img = np.array([p["image_id"] for p in preds])
+        p_cat = np.array([p["category_id"] for p in preds], dtype=np.int64).reshape(n)
+        score = np.array([p["score"] for p in preds], dtype=np.float64).reshape(n)
+        bbox = np.array([p["bbox"] for p in preds], dtype=np.float64).reshape(n, 4)
+        p_area = bbox[:, 2] * bbox[:, 3]
+        keep = np.ones(n, dtype=bool)
+        if self.lvis and n:  # LVISResults keeps the 300 highest-scoring predictions of each image
+            i = np.argsort(-score, kind="stable")
+            i = i[np.argsort(p_img[i], kind="stable")]
+            start, _ = _group(p_img[i], p_img[i])
+            keep[i] = np.arange(n) - start < self.max_dets[-1]
+            keep &= (p_area > 0) & (p_area < np.inf)
+        p_img, p_cat = _lookup(img_ids, p_img), _lookup(cat_ids, p_cat)
+        keep &= (p_img >= 0) & (p_cat >= 0)
+        p_key = p_cat * ni + p_img
+        if self.lvis:  # (category, image) keys of the negative and not exhaustively annotated categories of images
+            neg_key, nel_key = (self._pair_keys(x, img_ids) for x in (anno.neg, anno.not_exhaustive))
+            keep &= np.isin(p_key, g_key) | np.isin(p_key, neg_key)  # only categories verified present or absent
+        d = np.flatnonzero(keep)
+        d = d[np.argsort(-score[d], kind="stable")]
+        d = d[np.argsort(p_key[d], kind="stable")]
+        start, _ = _group(p_key[d], p_key[d])
+        rank = np.arange(len(d)) - start
+        if not self.lvis:  # COCOeval.computeIoU() keeps the highest-scoring maxDets[-1] detections of each pair
+            d, rank = d[rank < self.max_dets[-1]], rank[rank < self.max_dets[-1]]
+        d_key = p_key[d]
+        d_out = np.stack([(p_area[d] < lo) | (p_area[d] > hi) for lo, hi in self.area_rng], 1)  # (D, A)
+        if self.lvis:  # unmatched detections of not exhaustively annotated categories are ignored
+            d_out |= np.isin(d_key, nel_key)[:, None]
+
+        # Match detections to ground truth, in chunks of (category, image) pairs of similar size
+        keys = np.union1d(g_key, d_key)
+        gs, gn = _group(keys, g_key)
+        ds, dn = _group(keys, d_key)
+        dtm = np.zeros((len(d), A, T), dtype=bool)
+        dtig = np.zeros((len(d), A, T), dtype=bool)
+        order = np.flatnonzero((gn > 0) & (dn > 0))  # detections of pairs without ground truth stay unmatched
+        order = order[np.lexsort((gn[order], dn[order]))]
+        for chunk in self._chunks(gn[order], dn[order]):
+            j = order[chunk]
+            G, D = gn[j].max(), dn[j].max()
+            gi, gv = gs[j, None] + np.arange(G), np.arange(G) < gn[j, None]  # (n, G) indices into g, valid mask
+            di, dv = ds[j, None] + np.arange(D), np.arange(D) < dn[j, None]  # (n, D) indices into d, valid mask
+            gi, di = np.where(gv, gi, 0), np.where(dv, di, 0)
+            ious = self._ious(g[gi], d[di], g_crowd[gi], gv, dv, preds, bbox)
+            m, ig = self._match(
+                np.where(gv[:, None] & dv[:, :, None], ious, -1.0), g_ig[gi] | ~gv[..., None], g_crowd[gi]
+            )
+            dtm[di[dv]], dtig[di[dv]] = m.transpose(0, 3, 1, 2)[dv], ig.transpose(0, 3, 1, 2)[dv]
+        dtig |= ~dtm & d_out[..., None]
+
+        # Accumulate precision and recall per category over all images, like COCOeval.accumulate()
+        R, M = len(self.rec_thrs), len(self.max_dets)
+        self.precision, self.recall = -np.ones((T, R, K, A, M)), -np.ones((T, K, A, M))
+        d_cat, d_score = d_key // ni, score[d]
+        for mi, max_det in enumerate(self.max_dets):
+            i = np.flatnonzero(rank < max_det) if not self.lvis else np.arange(len(d))  # still in image order
+            i = i[np.argsort(-d_score[i], kind="stable")]
+            i = i[np.argsort(d_cat[i], kind="stable")]
+            bounds = np.searchsorted(d_cat[i], np.arange(K + 1))
+            for k in np.flatnonzero(npig.any(1)):
+                ik = i[bounds[k] : bounds[k + 1]]
+                valid = ~dtig[ik]
+                tp = np.cumsum(dtm[ik] & valid, axis=0).astype(float)  # (nd, A, T)
+                fp = np.cumsum(~dtm[ik] & valid, axis=0).astype(float)
+                nd = len(ik)
+                for a in np.flatnonzero(npig[k]):
+                    rc = tp[:, a] / npig[k, a]
+                    pr = tp[:, a] / (fp[:, a] + tp[:, a] + np.spacing(1))
+                    pr = np.maximum.accumulate(pr[::-1], axis=0)[::-1]  # precision envelope
+                    self.recall[:, k, a, mi] = rc[-1] if nd else 0
+                    for t in range(T):
+                        ri = np.searchsorted(rc[:, t], self.rec_thrs, side="left")
+                        q = np.zeros(R)
+                        q[ri < nd] = pr[ri[ri < nd], t]
+                        self.precision[t, :, k, a, mi] = q
+        return self.summarize()
+
+    def summarize(self):
+        """
+        Compute the summary metrics from precision and recall and log them in pycocotools format.
+
+        Returns:
+            (dict): Summary metrics keyed like pycocotools and LVISEval.
+        """
+        results = {}
+        frequency = self.anno.frequency
+        for key, is_ap, iou_thr, area, max_det, freq in self.summary:
+            a, m = [self.area_lbl.index(area)], [self.max_dets.index(max_det)]
+            s = self.precision if is_ap else self.recall
+            if iou_thr is not None:
+                s = s[np.where(iou_thr == self.iou_thrs)[0]]
+            if freq is not None:
+                s = s[..., 0][:, :, list(np.flatnonzero(frequency == freq)), a]
+            else:
+                s = s[:, :, :, a, m] if is_ap else s[:, :, a, m]
+            results[key] = np.mean(s[s > -1]) if (s > -1).any() else -1
+            iou = f"{self.iou_thrs[0]:0.2f}:{self.iou_thrs[-1]:0.2f}" if iou_thr is None else f"{iou_thr:0.2f}"
+            title = "Average Precision  (AP)" if is_ap else "Average Recall     (AR)"
+            cats = f" catIds={freq or 'all':>3s}" if self.lvis else " "
+            LOGGER.info(
+                f" {title} @[ IoU={iou:<9} | area={area:>6s} | maxDets={max_det:>3d}{cats}] = {results[key]:0.3f}"
+            )
+        self.stats = np.array(list(results.values()))
+        return results
+
+    def _pair_keys(self, pairs, img_ids):
+        """Return the (category, image) keys of (image index, category ID) pairs of the evaluated images."""
+        i, c = _lookup(img_ids, self.anno.img_ids[pairs[:, 0]]), _lookup(self.anno.cat_ids, pairs[:, 1])
+        return (c * len(img_ids) + i)[(i >= 0) & (c >= 0)]
+
+    @staticmethod
+    def _chunks(gn, dn, max_size=1 << 18):
+        """Split (category, image) pairs sorted by size into slices whose padded (pairs, D, G) size stays bounded."""
+        start, g, d = 0, 0, 0
+        for i in range(len(gn)):
+            g, d = max(g, gn[i]), max(d, dn[i])
+            if (i - start + 1) * g * d > max_size and i > start:
+                yield slice(start, i)
+                start, g, d = i, gn[i], dn[i]
+        if len(gn):
+            yield slice(start, len(gn))
+
+    def _ious(self, gi, di, crowd, gv, dv, preds, bbox):
+        """
+        Compute IoUs (or OKS) between the padded detections and ground truth of a chunk of (category, image) pairs.
+
+        Args:
+            gi (np.ndarray): Annotation indices, shape (n, G).
+            di (np.ndarray): Prediction indices, shape (n, D).
+            crowd (np.ndarray): Crowd flags of the annotations, shape (n, G).
+            gv (np.ndarray): Valid annotation mask, shape (n, G).
+            dv (np.ndarray): Valid detection mask, shape (n, D).
+            preds (list[dict]): Predictions.
+            bbox (np.ndarray): Prediction boxes, shape (N, 4).
+
+        Returns:
+            (np.ndarray): IoUs of shape (n, D, G), arbitrary where padded.
+        """
+        anno = self.anno
+        if self.iou_type == "bbox":  # same operations as pycocotools bbIou() for bit-identical results
+            b1, b2 = bbox[di][:, :, None], anno.bbox[gi][:, None]  # (n, D, 1, 4), (n, 1, G, 4)
+            w = np.minimum(b1[..., 0] + b1[..., 2], b2[..., 0] + b2[..., 2]) - np.maximum(b1[..., 0], b2[..., 0])
+            h = np.minimum(b1[..., 1] + b1[..., 3], b2[..., 1] + b2[..., 3]) - np.maximum(b1[..., 1], b2[..., 1])
+            inter, a1, a2 = w * h, b1[..., 2] * b1[..., 3], b2[..., 2] * b2[..., 3]
+            union = np.where(crowd[:, None], a1, a1 + a2 - inter)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where((w > 0) & (h > 0), inter / union, 0.0)
+        ious = np.zeros(di.shape + gi.shape[1:])
+        if self.iou_type == "segm":
+            from pycocotools import mask as mask_utils
+
+            for j, (g, d) in enumerate(zip(gi, di)):
+                g, d = g[gv[j]], d[dv[j]]
+                if len(g) and len(d):
+                    dt = [preds[x]["segmentation"] for x in d]
+                    gt = [anno.segments[x] for x in g]
+                    ious[j, : len(d), : len(g)] = mask_utils.iou(dt, gt, crowd[j][gv[j]].astype(int).tolist())
+            return ious
+        nkpt = anno.keypoints.shape[1] // 3
+        sigmas = OKS_SIGMA if nkpt == 17 else np.ones(nkpt) / nkpt
+        var = (sigmas * 2) ** 2
+        for j, (g, d) in enumerate(zip(gi, di)):  # same operations as COCOeval.computeOks(), one gt at a time
+            g, d = g[gv[j]], d[dv[j]]
+            if not (len(g) and len(d)):
+                continue
+            kd = np.array([preds[x]["keypoints"] for x in d], dtype=np.float64)
+            xd, yd = kd[:, 0::3], kd[:, 1::3]
+            for i, x in enumerate(g):
+                kg, bb = anno.keypoints[x], anno.bbox[x]
+                vis = kg[2::3] > 0
+                if vis.any():
+                    dx, dy = xd - kg[0::3], yd - kg[1::3]
+                else:  # distance outside of the gt box grown by its size on each side
+                    x0, x1, y0, y1 = bb[0] - bb[2], bb[0] + bb[2] * 2, bb[1] - bb[3], bb[1] + bb[3] * 2
+                    dx = np.maximum(0, x0 - xd) + np.maximum(0, xd - x1)
+                    dy = np.maximum(0, y0 - yd) + np.maximum(0, yd - y1)
+                e = (dx**2 + dy**2) / var / (anno.area[x] + np.spacing(1)) / 2
+                if vis.any():
+                    e = e[:, vis]
+                ious[j, : len(d), i] = np.sum(np.exp(-e), axis=1) / e.shape[1]
+        return ious
+
+    def _match(self, ious, gt_ig, crowd):
+        """
+        Greedily match ranked detections to ground truth, like COCOeval.evaluateImg() for all pairs at once.
+
+        Each detection, from the highest score down, takes the unmatched ground truth with the highest IoU of at least
+        the threshold, preferring regular over ignored ground truth and the last of equal IoUs. Crowd regions may be
+        matched repeatedly (never under LVIS).
+
+        Args:
+            ious (np.ndarray): IoUs of shape (n, D, G), -1 for padding.
+            gt_ig (np.ndarray): Ground truth ignore flags per area range, shape (n, G, A).
+            crowd (np.ndarray): Crowd flags, shape (n, G).
+
+        Returns:
+            dtm (np.ndarray): Whether each detection is matched, shape (n, A, T, D).
+            dtig (np.ndarray): Whether each detection is matched to ignored ground truth, shape (n, A, T, D).
+        """
+        n, D, G = ious.shape
+        A, T = gt_ig.shape[-1], len(self.iou_thrs)
+        thrs = np.minimum(self.iou_thrs, 1 - 1e-10)[:, None]  # (T, 1)
+        ig = np.broadcast_to(gt_ig.transpose(0, 2, 1)[:, :, None], (n, A, T, G))
+        reusable = crowd[:, None, None] & (not self.lvis)
+        gtm = np.zeros((n, A, T, G), dtype=bool)
+        dtm = np.zeros((n, A, T, D), dtype=bool)
+        dtig = np.zeros((n, A, T, D), dtype=bool)
+        for k in range(D):
+            iou = ious[:, None, None, k]  # (n, 1, 1, G)
+            cand = (iou >= thrs) & (reusable | ~gtm)
+            regular = cand & ~ig
+            cand = np.where(regular.any(-1, keepdims=True), regular, cand)
+            m = G - 1 - np.where(cand, iou, -1.0)[..., ::-1].argmax(-1)  # last of the best matches
+            matched = cand.any(-1)
+            dtm[..., k] = matched
+            dtig[..., k] = matched & np.take_along_axis(ig, m[..., None], -1)[..., 0]
+            gtm |= matched[..., None] & (np.arange(G) == m[..., None])
+        return dtm, dtig
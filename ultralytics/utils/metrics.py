@@ -153,6 +153,40 @@ def mask_iou(mask1, mask2, eps=1e-7):
     return intersection / (union + eps)
 
 
+def sparse_mask_iou(idx1, pix1, idx2, pix2, n1, n2, eps=1e-7):
+    """
+    Calculate masks IoU from the flat pixel indices covered by each mask.
+
+    Only pixels covered by masks from both sets contribute an intersection, so memory grows with the total mask
+    area rather than with the number of masks times the image size. Results are identical to `mask_iou` on the
+    equivalent dense binary masks.
+
+    Args:
+        idx1 (torch.Tensor): A tensor of shape (P1,) with the mask index in [0, n1) of every pixel in the first set.
+        pix1 (torch.Tensor): A tensor of shape (P1,) with the flat pixel index of every pixel in the first set.
+        idx2 (torch.Tensor): A tensor of shape (P2,) with the mask index in [0, n2) of every pixel in the second set.
+        pix2 (torch.Tensor): A tensor of shape (P2,) with the flat pixel index of every pixel in the second set.
+        n1 (int): Number of masks in the first set.
+        n2 (int): Number of masks in the second set.
+        eps (float, optional): A small value to avoid division by zero.
+
+    Returns:
+        (torch.Tensor): A tensor of shape (n1, n2) representing masks IoU.
+    """
+    pix1, order = pix1.sort()
+    idx1 = idx1[order]
+    lo = torch.searchsorted(pix1, pix2)
+    counts = torch.searchsorted(pix1, pix2, right=True) - lo  # masks of the first set covering each pixel
+    start = torch.repeat_interleave(lo - (counts.cumsum(0) - counts), counts)
+    i = idx1[start + torch.arange(len(start), device=start.device)]
+    j = torch.repeat_interleave(idx2, counts)
+    intersection = torch.bincount(i * n2 + j, minlength=n1 * n2).view(n1, n2)
+    area1 = torch.bincount(idx1, minlength=n1)
+    area2 = torch.bincount(idx2, minlength=n2)
+    union = (area1[:, None] + area2[None]) - intersection
+    return intersection.float() / (union.float() + eps)
+
+
 def kpt_iou(kpt1, kpt2, area, sigma, eps=1e-7):
     """
     Calculate Object Keypoint Similarity (OKS).
@@ -571,7 +605,18 @@ def compute_ap(recall, precision):
 
 
 def ap_per_class(
-    tp, conf, pred_cls, target_cls, plot=False, on_plot=None, save_dir=Path(), names={}, eps=1e-16, prefix=""
+    tp,
+    conf,
+    pred_cls,
+    target_cls,
+    plot=False,
+    on_plot=None,
+    save_dir=Path(),
+    names={},
+    eps=1e-16,
+    prefix="",
+    weights=None,
+    target_weights=None,
 ):
     """
     Compute the average precision per class for object detection evaluation.
@@ -587,6 +632,9 @@ def ap_per_class(
         names (dict, optional): Dict of class names to plot PR curves.
         eps (float, optional): A small value to avoid division by zero.
         prefix (str, optional): A prefix string for saving the plot files.
+        weights (np.ndarray, optional): Number of detections each row of `tp`, `conf` and `pred_cls` stands for, `tp`
+            then holding true positive counts, e.g. the confidence bins of an APAccumulator. Defaults to one each.
+        target_weights (np.ndarray, optional): Number of targets each entry of `target_cls` stands for.
 
     Returns:
         tp (np.ndarray): True positive counts at threshold given by max F1 metric for each class.
@@ -605,9 +653,14 @@ def ap_per_class(
     # Sort by objectness
     i = np.argsort(-conf)
     tp, conf, pred_cls = tp[i], conf[i], pred_cls[i]
+    weights = np.ones(len(conf)) if weights is None else weights[i]
 
     # Find unique classes
-    unique_classes, nt = np.unique(target_cls, return_counts=True)
+    if target_weights is None:
+        unique_classes, nt = np.unique(target_cls, return_counts=True)
+    else:
+        unique_classes, inverse = np.unique(target_cls, return_inverse=True)
+        nt = np.bincount(inverse.ravel(), weights=target_weights, minlength=len(unique_classes))
     nc = unique_classes.shape[0]  # number of classes, number of detections
 
     # Create Precision-Recall curve and compute AP for each class
@@ -623,7 +676,7 @@ def ap_per_class(
             continue
 
         # Accumulate FPs and TPs
-        fpc = (1 - tp[i]).cumsum(0)
+        fpc = (weights[i, None] - tp[i]).cumsum(0)
         tpc = tp[i].cumsum(0)
 
         # Recall
@@ -659,6 +712,98 @@ def ap_per_class(
     return tp, fp, p, r, f1, ap, unique_classes.astype(int), p_curve, r_curve, f1_curve, x, prec_values
 
 
+class APAccumulator:
+    """
+    Streaming accumulator of detection statistics for computing AP, precision and recall in bounded memory.
+
+    Instead of keeping every prediction until the end of validation, each batch of per-prediction statistics is folded
+    into per-class histograms over fixed confidence bins, holding the number of predictions and of true positives at
+    each IoU threshold. Memory is independent of the dataset size, and the summed histograms of partial states from DDP
+    ranks or separate worker processes are the state of the whole dataset. AP is computed from the bins by
+    `ap_per_class`, ordering predictions by bin instead of by exact confidence.
+
+    Attributes:
+        nc (int): Number of classes.
+        bins (int): Number of confidence bins over [0, 1].
+        n (np.ndarray): Number of predictions per class and bin, shape (nc, bins).
+        tp (Dict[str, np.ndarray]): True positive counts per class, bin and IoU threshold for each true positive key
+            such as 'tp' or 'tp_m', shape (nc, bins, niou).
+        nt_per_class (np.ndarray): Number of targets per class, shape (nc,).
+        nt_per_image (np.ndarray): Number of images containing each class, shape (nc,).
+
+    Methods:
+        update: Fold a batch of per-prediction statistics into the histograms.
+        merge: Add the histograms of other accumulators.
+        stats: Return weighted statistics for the `process` methods of the metrics classes.
+
+    Examples:
+        >>> acc = APAccumulator(nc=80)
+        >>> acc.update(dict(tp=tp, conf=conf, pred_cls=pred_cls, target_cls=target_cls, target_img=target_img))
+        >>> DetMetrics(names=names).process(**acc.stats())
+    """
+
+    def __init__(self, nc, niou=10, bins=1000, keys=("tp",)):
+        """
+        Initialize an empty APAccumulator.
+
+        Args:
+            nc (int): Number of classes.
+            niou (int): Number of IoU thresholds.
+            bins (int): Number of confidence bins over [0, 1].
+            keys (Tuple[str, ...]): True positive keys of the statistics, e.g. ('tp', 'tp_m') for segmentation.
+        """
+        self.nc, self.bins = nc, bins
+        self.n = np.zeros((nc, bins), dtype=np.int64)
+        self.tp = {k: np.zeros((nc, bins, niou), dtype=np.int64) for k in keys}
+        self.nt_per_class = np.zeros(nc, dtype=np.int64)
+        self.nt_per_image = np.zeros(nc, dtype=np.int64)
+
+    def update(self, stats):
+        """
+        Fold a batch of per-prediction statistics into the histograms.
+
+        Args:
+            stats (Dict[str, np.ndarray]): Concatenated 'conf', 'pred_cls', 'target_cls' and 'target_img' arrays and
+                an (N, niou) boolean array for each true positive key.
+        """
+        c = stats["pred_cls"].astype(int)
+        b = np.minimum((stats["conf"] * self.bins).astype(int), self.bins - 1)
+        np.add.at(self.n, (c, b), 1)
+        for k, tp in self.tp.items():
+            np.add.at(tp, (c, b), stats[k])
+        self.nt_per_class += np.bincount(stats["target_cls"].astype(int), minlength=self.nc)
+        self.nt_per_image += np.bincount(stats["target_img"].astype(int), minlength=self.nc)
+
+    def merge(self, *others):
+        """Add the histograms of other accumulators, e.g. those of other worker processes, returning self."""
+        for other in others:
+            self.n += other.n
+            for k, tp in self.tp.items():
+                tp += other.tp[k]
+            self.nt_per_class += other.nt_per_class
+            self.nt_per_image += other.nt_per_image
+        return self
+
+    def stats(self):
+        """
+        Return the non-empty bins as weighted statistics for the `process` methods of the metrics classes.
+
+        Returns:
+            (Dict[str, np.ndarray]): True positive counts for each key, bin center 'conf', 'pred_cls', 'target_cls' and
+                the 'weights' and 'target_weights' counts they stand for.
+        """
+        c, b = np.nonzero(self.n)
+        classes = np.nonzero(self.nt_per_class)[0]
+        return {
+            **{k: tp[c, b] for k, tp in self.tp.items()},
+            "conf": (b + 0.5) / self.bins,
+            "pred_cls": c,
+            "target_cls": classes,
+            "weights": self.n[c, b],
+            "target_weights": self.nt_per_class[classes],
+        }
+
+
 class Metric(SimpleClass):
     """
     Class for computing evaluation metrics for YOLOv8 model.
@@ -861,7 +1006,7 @@ class DetMetrics(SimpleClass):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "detect"
 
-    def process(self, tp, conf, pred_cls, target_cls, on_plot=None):
+    def process(self, tp, conf, pred_cls, target_cls, on_plot=None, weights=None, target_weights=None):
         """
         Process predicted results for object detection and update metrics.
 
@@ -871,6 +1016,8 @@ class DetMetrics(SimpleClass):
             pred_cls (np.ndarray): Predicted class indices array.
             target_cls (np.ndarray): Target class indices array.
             on_plot (callable, optional): Function to call after plots are generated.
+            weights (np.ndarray, optional): Number of detections each row stands for, see `ap_per_class`.
+            target_weights (np.ndarray, optional): Number of targets each entry of `target_cls` stands for.
         """
         results = ap_per_class(
             tp,
@@ -880,6 +1027,8 @@ class DetMetrics(SimpleClass):
             plot=self.plot,
             save_dir=self.save_dir,
             names=self.names,
+            weights=weights,
+            target_weights=target_weights,
             on_plot=on_plot,
         )[2:]
         self.box.nc = len(self.names)
@@ -960,7 +1109,7 @@ class SegmentMetrics(SimpleClass):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "segment"
 
-    def process(self, tp, tp_m, conf, pred_cls, target_cls, on_plot=None):
+    def process(self, tp, tp_m, conf, pred_cls, target_cls, on_plot=None, weights=None, target_weights=None):
         """
         Process the detection and segmentation metrics over the given set of predictions.
 
@@ -971,6 +1120,8 @@ class SegmentMetrics(SimpleClass):
             pred_cls (np.ndarray): Predicted class indices array.
             target_cls (np.ndarray): Target class indices array.
             on_plot (callable, optional): Function to call after plots are generated.
+            weights (np.ndarray, optional): Number of detections each row stands for, see `ap_per_class`.
+            target_weights (np.ndarray, optional): Number of targets each entry of `target_cls` stands for.
         """
         results_mask = ap_per_class(
             tp_m,
@@ -981,6 +1132,8 @@ class SegmentMetrics(SimpleClass):
             on_plot=on_plot,
             save_dir=self.save_dir,
             names=self.names,
+            weights=weights,
+            target_weights=target_weights,
             prefix="Mask",
         )[2:]
         self.seg.nc = len(self.names)
@@ -994,6 +1147,8 @@ class SegmentMetrics(SimpleClass):
             on_plot=on_plot,
             save_dir=self.save_dir,
             names=self.names,
+            weights=weights,
+            target_weights=target_weights,
             prefix="Box",
         )[2:]
         self.box.nc = len(self.names)
@@ -1106,7 +1261,7 @@ class PoseMetrics(SegmentMetrics):
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
         self.task = "pose"
 
-    def process(self, tp, tp_p, conf, pred_cls, target_cls, on_plot=None):
+    def process(self, tp, tp_p, conf, pred_cls, target_cls, on_plot=None, weights=None, target_weights=None):
         """
         Process the detection and pose metrics over the given set of predictions.
 
@@ -1117,6 +1272,8 @@ class PoseMetrics(SegmentMetrics):
             pred_cls (np.ndarray): Predicted class indices array.
             target_cls (np.ndarray): Target class indices array.
             on_plot (callable, optional): Function to call after plots are generated.
+            weights (np.ndarray, optional): Number of detections each row stands for, see `ap_per_class`.
+            target_weights (np.ndarray, optional): Number of targets each entry of `target_cls` stands for.
         """
         results_pose = ap_per_class(
             tp_p,
@@ -1127,6 +1284,8 @@ class PoseMetrics(SegmentMetrics):
             on_plot=on_plot,
             save_dir=self.save_dir,
             names=self.names,
+            weights=weights,
+            target_weights=target_weights,
             prefix="Pose",
         )[2:]
         self.pose.nc = len(self.names)
@@ -1140,6 +1299,8 @@ class PoseMetrics(SegmentMetrics):
             on_plot=on_plot,
             save_dir=self.save_dir,
             names=self.names,
+            weights=weights,
+            target_weights=target_weights,
             prefix="Box",
         )[2:]
         self.box.nc = len(self.names)
@@ -1284,7 +1445,7 @@ class OBBMetrics(SimpleClass):
         self.box = Metric()
         self.speed = {"preprocess": 0.0, "inference": 0.0, "loss": 0.0, "postprocess": 0.0}
 
-    def process(self, tp, conf, pred_cls, target_cls, on_plot=None):
+    def process(self, tp, conf, pred_cls, target_cls, on_plot=None, weights=None, target_weights=None):
         """
         Process predicted results for object detection and update metrics.
 
@@ -1294,6 +1455,8 @@ class OBBMetrics(SimpleClass):
             pred_cls (np.ndarray): Predicted class indices array.
             target_cls (np.ndarray): Target class indices array.
             on_plot (callable, optional): Function to call after plots are generated.
+            weights (np.ndarray, optional): Number of detections each row stands for, see `ap_per_class`.
+            target_weights (np.ndarray, optional): Number of targets each entry of `target_cls` stands for.
         """
         results = ap_per_class(
             tp,
@@ -1303,6 +1466,8 @@ class OBBMetrics(SimpleClass):
             plot=self.plot,
             save_dir=self.save_dir,
             names=self.names,
+            weights=weights,
+            target_weights=target_weights,
             on_plot=on_plot,
         )[2:]
         self.box.nc = len(self.names)
@@ -342,6 +342,163 @@ def non_max_suppression(
     return (output, keepi) if return_idxs else output
 
 
+def batched_non_max_suppression(
+    prediction,
+    conf_thres=0.25,
+    iou_thres=0.45,
+    classes=None,
+    agnostic=False,
+    multi_label=False,
+    labels=(),
+    max_det=300,
+    nc=0,  # number of classes (optional)
+    max_time_img=0.05,
+    max_nms=30000,
+    max_wh=7680,
+    in_place=True,
+    rotated=False,
+    end2end=False,
+    return_idxs=False,
+):
+    """
+    Perform non-maximum suppression (NMS) on a whole batch at once, without a Python loop over images.
+
+    Candidates of all images are filtered, capped and gathered into flat tensors with batched tensor ops. On GPU, up to
+    5000 candidates are suppressed with a single `torchvision.ops.nms` call, with boxes offset by class along x and by
+    image along y so that only boxes of the same image and class overlap. On CPU, or for more candidates, where the
+    quadratic cost of NMS favours smaller calls, NMS runs per image on the grouped candidates. Arguments and outputs
+    are the same as for `non_max_suppression`, which is used instead for rotated boxes, end-to-end models and apriori
+    labels.
+
+    Args:
+        prediction (torch.Tensor): A tensor of shape (batch_size, num_classes + 4 + num_masks, num_boxes)
+            containing the predicted boxes, classes, and masks.
+        conf_thres (float): The confidence threshold below which boxes will be filtered out.
+        iou_thres (float): The IoU threshold below which boxes will be filtered out during NMS.
+        classes (List[int]): A list of class indices to consider. If None, all classes will be considered.
+        agnostic (bool): If True, the model is agnostic to the number of classes, and all
+            classes will be considered as one.
+        multi_label (bool): If True, each box may have multiple labels.
+        labels (List[List[Union[int, float, torch.Tensor]]]): Apriori labels per image for autolabelling.
+        max_det (int): The maximum number of boxes to keep per image after NMS.
+        nc (int): The number of classes output by the model. Any indices after this will be considered masks.
+        max_time_img (float): The maximum time (seconds) for processing one image with per-image NMS.
+        max_nms (int): The maximum number of boxes per image into NMS.
+        max_wh (int): The maximum box width and height in pixels.
+        in_place (bool): If True, the input prediction tensor will be modified in place.
+        rotated (bool): If Oriented Bounding Boxes (OBB) are being passed for NMS.
+        end2end (bool): If the model doesn't require NMS.
+        return_idxs (bool): Return the indices of the detections that were kept.
+
+    Returns:
+        (List[torch.Tensor]): A list of length batch_size, where each element is a tensor of
+            shape (num_boxes, 6 + num_masks) containing the kept boxes, with columns
+            (x1, y1, x2, y2, confidence, class, mask1, mask2, ...).
+
+    Examples:
+        >>> preds = torch.rand(64, 84, 8400)
+        >>> output = batched_non_max_suppression(preds, conf_thres=0.25, iou_thres=0.7)
+        >>> len(output)
+        64
+    """
+    import torchvision  # scope for faster 'import ultralytics'
+
+    if isinstance(prediction, (list, tuple)):  # YOLOv8 model in validation model, output = (inference_out, loss_out)
+        prediction = prediction[0]  # select only inference output
+    if rotated or end2end or prediction.shape[-1] == 6 or any(len(lb) for lb in labels):
+        return non_max_suppression(
+            prediction,
+            conf_thres,
+            iou_thres,
+            classes,
+            agnostic,
+            multi_label,
+            labels,
+            max_det,
+            nc,
+            max_time_img,
+            max_nms,
+            max_wh,
+            in_place,
+            rotated,
+            end2end,
+            return_idxs,
+        )
+
+    # Checks
+    assert 0 <= conf_thres <= 1, f"Invalid Confidence threshold {conf_thres}, valid values are between 0.0 and 1.0"
+    assert 0 <= iou_thres <= 1, f"Invalid IoU {iou_thres}, valid values are between 0.0 and 1.0"
+
+    bs = prediction.shape[0]  # batch size (BCN, i.e. 1,84,6300)
+    nc = nc or (prediction.shape[1] - 4)  # number of classes
+    nm = prediction.shape[1] - nc - 4  # number of masks
+    mi = 4 + nc  # mask start index
+    xc = prediction[:, 4:mi].amax(1) > conf_thres  # candidates
+    multi_label &= nc > 1  # multiple labels per box
+
+    prediction = prediction.transpose(-1, -2)  # shape(1,84,6300) to shape(1,6300,84)
+    if in_place:
+        prediction[..., :4] = xywh2xyxy(prediction[..., :4])  # xywh to xyxy
+
+    # Candidates of the whole batch, with their image and box indices
+    b, k = torch.nonzero(xc, as_tuple=True)
+    x = prediction[b, k]
+    box, cls, mask = x.split((4, nc, nm), 1)
+    if not in_place:
+        box = xywh2xyxy(box)  # xywh to xyxy
+    if multi_label:
+        i, j = torch.where(cls > conf_thres)
+        x = torch.cat((box[i], x[i, 4 + j, None], j[:, None].float(), mask[i]), 1)
+        b, k = b[i], k[i]
+    else:  # best class only
+        conf, j = cls.max(1, keepdim=True)
+        filt = conf.view(-1) > conf_thres
+        x = torch.cat((box, conf, j.float(), mask), 1)[filt]
+        b, k = b[filt], k[filt]
+
+    # Filter by class
+    if classes is not None:
+        filt = (x[:, 5:6] == torch.tensor(classes, device=x.device)).any(1)
+        x, b, k = x[filt], b[filt], k[filt]
+
+    # Keep the max_nms most confident boxes of each image
+    if len(x) > max_nms and torch.bincount(b).max() > max_nms:  # excess boxes
+        i = x[:, 4].argsort(descending=True)
+        i = i[torch.sort(b[i], stable=True).indices]  # group by image, keeping the confidence order
+        filt = i[_rank_per_image(b[i], bs) < max_nms].sort().values
+        x, b, k = x[filt], b[filt], k[filt]
+
+    # NMS with boxes offset by class
+    c = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
+    if x.device.type != "cpu" and len(x) <= 5000:  # single call, offsetting classes along x and images along y
+        boxes = x[:, :4] + torch.cat((c, b[:, None] * max_wh), 1).repeat(1, 2)
+        i = torchvision.ops.nms(boxes, x[:, 4], iou_thres)  # NMS, sorted by decreasing confidence
+        i = i[torch.sort(b[i], stable=True).indices]  # group by image, keeping the confidence order
+    else:  # NMS cost grows quadratically with the number of boxes, run it per image on the grouped candidates
+        n = torch.bincount(b, minlength=bs).tolist()
+        offsets = np.cumsum([0, *n]).tolist()
+        boxes, scores = (x[:, :4] + c).split(n), x[:, 4].split(n)
+        time_limit, t = 2.0 + max_time_img * bs, time.time()  # seconds to quit after
+        i = []
+        for bx, s, o in zip(boxes, scores, offsets):
+            i.append(torchvision.ops.nms(bx, s, iou_thres) + o)
+            if (time.time() - t) > time_limit:
+                LOGGER.warning(f"NMS time limit {time_limit:.3f}s exceeded")
+                break  # time limit exceeded
+        i = torch.cat(i)
+    i = i[_rank_per_image(b[i], bs) < max_det]  # limit detections
+
+    n = torch.bincount(b[i], minlength=bs).tolist()
+    output = list(x[i].split(n))
+    return (output, list(k[i].split(n))) if return_idxs else output
+
+
+def _rank_per_image(b, bs):
+    """Return the rank of each element within its image for image indices `b` sorted by image."""
+    n = torch.bincount(b, minlength=bs)
+    return torch.arange(len(b), device=b.device) - (n.cumsum(0) - n)[b]
+
+
 def clip_boxes(boxes, shape):
     """
     Takes a list of bounding boxes and a shape (height, width) and clips the bounding boxes to the shape.
@@ -25,6 +25,7 @@ class TaskAlignedAssigner(nn.Module):
         alpha (float): The alpha parameter for the classification component of the task-aligned metric.
         beta (float): The beta parameter for the localization component of the task-aligned metric.
         eps (float): A small value to prevent division by zero.
+        chunk_size (int): Element budget of the dense tensors of each chunk of ground truths in sparse assignment.
     """
 
     def __init__(self, topk=13, num_classes=80, alpha=1.0, beta=6.0, eps=1e-9):
@@ -36,6 +37,7 @@ class TaskAlignedAssigner(nn.Module):
         self.alpha = alpha
         self.beta = beta
         self.eps = eps
+        self.chunk_size = 1 << 22  # 4M elements, i.e. 16 MB per float32 tensor
 
     @torch.no_grad()
     def forward(self, pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt):
@@ -73,14 +75,19 @@ class TaskAlignedAssigner(nn.Module):
                 torch.zeros_like(pd_scores[..., 0]),
             )
 
+        # Sparse on CPU, on CUDA only if the dense tensors (~64 bytes per gt-anchor pair) exceed 1/4 of device memory
+        sparse = device.type == "cpu"
+        if device.type == "cuda":
+            memory = torch.cuda.get_device_properties(device).total_memory
+            sparse = self.bs * self.n_max_boxes * pd_scores.shape[1] * 64 > memory / 4
+        if sparse:
+            return self._forward_sparse(pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt)
         try:
             return self._forward(pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt)
         except torch.cuda.OutOfMemoryError:
-            # Move tensors to CPU, compute, then move back to original device
-            LOGGER.warning("CUDA OutOfMemoryError in TaskAlignedAssigner, using CPU")
-            cpu_tensors = [t.cpu() for t in (pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt)]
-            result = self._forward(*cpu_tensors)
-            return tuple(t.to(device) for t in result)
+            # Assign on the sparse candidates with bounded memory instead of the dense tensors
+            LOGGER.warning("CUDA OutOfMemoryError in TaskAlignedAssigner, using sparse assignment")
+            return self._forward_sparse(pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt)
 
     def _forward(self, pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt):
         """
@@ -119,6 +126,127 @@ class TaskAlignedAssigner(nn.Module):
 
         return target_labels, target_bboxes, target_scores, fg_mask.bool(), target_gt_idx
 
+    def _forward_sparse(self, pd_scores, pd_bboxes, anc_points, gt_labels, gt_bboxes, mask_gt):
+        """
+        Compute the task-aligned assignment on the sparse set of anchors inside the ground truths.
+
+        Gives the same assignment as `_forward` without its dense (bs, n_max_boxes, num_total_anchors) tensors. The
+        alignment metrics are only computed for (gt, anchor) pairs whose anchor center lies inside the gt, and the
+        candidate search and top-k selection run over chunks of ground truths, so peak memory stays bounded for images
+        with hundreds of objects. Candidates with a zero alignment metric are never selected, while the dense top-k
+        may pick some of them arbitrarily when a gt has fewer than `topk` positive candidates.
+
+        Args:
+            pd_scores (torch.Tensor): Predicted classification scores with shape (bs, num_total_anchors, num_classes).
+            pd_bboxes (torch.Tensor): Predicted bounding boxes with shape (bs, num_total_anchors, 4).
+            anc_points (torch.Tensor): Anchor points with shape (num_total_anchors, 2).
+            gt_labels (torch.Tensor): Ground truth labels with shape (bs, n_max_boxes, 1).
+            gt_bboxes (torch.Tensor): Ground truth boxes with shape (bs, n_max_boxes, 4).
+            mask_gt (torch.Tensor): Mask for valid ground truth boxes with shape (bs, n_max_boxes, 1).
+
+        Returns:
+            target_labels (torch.Tensor): Target labels with shape (bs, num_total_anchors).
+            target_bboxes (torch.Tensor): Target bounding boxes with shape (bs, num_total_anchors, 4).
+            target_scores (torch.Tensor): Target scores with shape (bs, num_total_anchors, num_classes).
+            fg_mask (torch.Tensor): Foreground mask with shape (bs, num_total_anchors).
+            target_gt_idx (torch.Tensor): Target ground truth indices with shape (bs, num_total_anchors).
+        """
+        bs, na = pd_scores.shape[:2]
+        device = pd_scores.device
+        gt_idx = mask_gt.view(-1).nonzero().squeeze(-1)  # flat (batch, gt) index of the valid gts
+        boxes = gt_bboxes.view(bs * self.n_max_boxes, -1)[gt_idx]
+        labels = gt_labels.view(-1).long()[gt_idx]
+        gt_batch = gt_idx // self.n_max_boxes
+        if not len(gt_idx):  # only padded gts, all anchors are background
+            target_gt_idx = torch.zeros((bs, na), dtype=torch.long, device=device)
+            fg_mask = torch.zeros((bs, na), dtype=torch.bool, device=device)
+            target_labels, target_bboxes, target_scores = self.get_targets(gt_labels, gt_bboxes, target_gt_idx, fg_mask)
+            dtype = torch.promote_types(pd_scores.dtype, pd_bboxes.dtype)
+            return target_labels, target_bboxes, target_scores.to(dtype), fg_mask, target_gt_idx
+
+        # Candidate (gt, anchor) pairs, their overlaps and alignment metrics and the top-k pairs of each gt
+        chunk = max(1, self.chunk_size // na)
+        pair_gt, pair_anchor, overlaps, align_metric, pos = [], [], [], [], []
+        n_pairs = 0
+        for i in range(0, len(gt_idx), chunk):
+            g, a = self.select_candidates_in_gts(anc_points, boxes[None, i : i + chunk])[0].nonzero(as_tuple=True)
+            g = g + i
+            b = gt_batch[g]
+            iou = self.iou_calculation(boxes[g], pd_bboxes[b, a])
+            metric = pd_scores[b, a, labels[g]].pow(self.alpha) * iou.pow(self.beta)
+            padded, start = self._pad_segments(metric, g - i, len(boxes[i : i + chunk]), -1)
+            values, idx = padded.topk(min(self.topk, padded.shape[1]), dim=1)
+            pos.append((start[:, None] + idx)[values > 0] + n_pairs)
+            pair_gt.append(g)
+            pair_anchor.append(b * na + a)
+            overlaps.append(iou)
+            align_metric.append(metric)
+            n_pairs += len(g)
+        pair_gt, pair_anchor, overlaps, align_metric = (
+            torch.cat(x) for x in (pair_gt, pair_anchor, overlaps, align_metric)
+        )
+        pos = torch.cat(pos).sort()[0]
+
+        # Anchors selected by several gts are assigned to the gt with the highest overlap among all their candidates
+        fg_count = torch.bincount(pair_anchor[pos], minlength=bs * na)
+        multi = fg_count[pair_anchor[pos]] > 1
+        if multi.any():
+            multi_anchors = pair_anchor[pos[multi]].unique()
+            cand = (fg_count[pair_anchor] > 1).nonzero().squeeze(-1)  # all candidate pairs of these anchors
+            rows = torch.searchsorted(multi_anchors, pair_anchor[cand])
+            cols = gt_idx[pair_gt[cand]] % self.n_max_boxes
+            best = []
+            chunk = max(1, self.chunk_size // self.n_max_boxes)
+            for i in range(0, len(multi_anchors), chunk):
+                j = ((rows >= i) & (rows < i + chunk)).nonzero().squeeze(-1)
+                n = min(chunk, len(multi_anchors) - i)
+                ov = torch.zeros((n, self.n_max_boxes), dtype=overlaps.dtype, device=device)
+                ov[rows[j] - i, cols[j]] = overlaps[cand[j]]
+                pair = torch.full((n, self.n_max_boxes), -1, dtype=torch.long, device=device)
+                pair[rows[j] - i, cols[j]] = cand[j]
+                best.append(pair.gather(1, ov.argmax(1, keepdim=True)).squeeze(1))
+            pos = torch.cat((pos[~multi], *best)).sort()[0]
+
+        # Normalize the alignment metric of each gt by its highest overlap among the final positives
+        g = pair_gt[pos]
+        pos_align_metrics = self._pad_segments(align_metric[pos], g, len(gt_idx), 0)[0].amax(1)
+        pos_overlaps = self._pad_segments(overlaps[pos], g, len(gt_idx), 0)[0].amax(1)
+        norm_align_metric = torch.zeros(bs * na, dtype=align_metric.dtype, device=device)
+        norm_align_metric[pair_anchor[pos]] = align_metric[pos] * pos_overlaps[g] / (pos_align_metrics[g] + self.eps)
+
+        target_gt_idx = torch.zeros(bs * na, dtype=torch.long, device=device)
+        target_gt_idx[pair_anchor[pos]] = gt_idx[g] % self.n_max_boxes
+        fg_mask = torch.zeros(bs * na, dtype=pd_scores.dtype, device=device)
+        fg_mask[pair_anchor[pos]] = 1
+        target_gt_idx, fg_mask = target_gt_idx.view(bs, na), fg_mask.view(bs, na)
+
+        # Assigned target
+        target_labels, target_bboxes, target_scores = self.get_targets(gt_labels, gt_bboxes, target_gt_idx, fg_mask)
+        target_scores = target_scores * norm_align_metric.view(bs, na, 1)
+
+        return target_labels, target_bboxes, target_scores, fg_mask.bool(), target_gt_idx
+
+    @staticmethod
+    def _pad_segments(values, segments, n, fill):
+        """
+        Scatter values grouped by sorted segment ids into a padded (n, max_segment_length) matrix.
+
+        Args:
+            values (torch.Tensor): Values with shape (N,), ordered by segment.
+            segments (torch.Tensor): Sorted segment id in range [0, n) of each value with shape (N,).
+            n (int): Number of segments.
+            fill (float): Value of the padding.
+
+        Returns:
+            padded (torch.Tensor): Padded values with shape (n, max_segment_length).
+            start (torch.Tensor): Index of the first value of each segment with shape (n,).
+        """
+        counts = torch.bincount(segments, minlength=n)
+        start = counts.cumsum(0) - counts
+        padded = values.new_full((n, int(counts.max()) if len(values) else 0), fill)
+        padded[segments, torch.arange(len(values), device=values.device) - start[segments]] = values
+        return padded, start
+
     def get_pos_mask(self, pd_scores, pd_bboxes, gt_labels, gt_bboxes, anc_points, mask_gt):
         """
         Get positive mask for each ground truth box.
@@ -4,6 +4,7 @@ import gc
 import math
 import os
 import random
+import threading
 import time
 from contextlib import contextmanager
 from copy import deepcopy
@@ -378,6 +379,7 @@ def model_info_for_loggers(trainer):
     if trainer.args.profile:  # profile ONNX and TensorRT times
         from ultralytics.utils.benchmarks import ProfileModels
 
+        trainer.ckpt_writer.wait()  # checkpoints are written in a background thread
         results = ProfileModels([trainer.last], device=trainer.device).profile()[0]
         results.pop("model/name")
     else:  # only return PyTorch times from most recent validation
@@ -625,20 +627,28 @@ class ModelEMA:
     Keeps a moving average of everything in the model state_dict (parameters and buffers).
     For EMA details see References.
 
+    Floating point EMA and model tensors are kept in flat lists and updated with fused `torch._foreach_*` ops instead
+    of two in-place ops per tensor. The EMA can be updated every `every` steps with the decay compounded over those
+    steps, and kept on another device such as the CPU. In that case model tensors are copied asynchronously into
+    staging buffers and the update is applied on the EMA device at the next update or `flush`.
+
     To disable EMA set the `enabled` attribute to `False`.
 
     Attributes:
         ema (nn.Module): Copy of the model in evaluation mode.
-        updates (int): Number of EMA updates.
+        updates (int): Number of EMA update calls, i.e. optimizer steps.
+        every (int): Number of update calls between EMA updates.
+        device (torch.device | None): Device the EMA is kept on, or None for the model device.
         decay (function): Decay function that determines the EMA weight.
         enabled (bool): Whether EMA is enabled.
+        pending (tuple | None): Decay and CUDA event of an asynchronous update waiting to be applied.
 
     References:
         - https://github.com/rwightman/pytorch-image-models
         - https://www.tensorflow.org/api_docs/python/tf/train/ExponentialMovingAverage
     """
 
-    def __init__(self, model, decay=0.9999, tau=2000, updates=0):
+    def __init__(self, model, decay=0.9999, tau=2000, updates=0, every=1, device=None):
         """
         Initialize EMA for 'model' with given arguments.
 
@@ -647,13 +657,36 @@ class ModelEMA:
             decay (float, optional): Maximum EMA decay rate. Defaults to 0.9999.
             tau (int, optional): EMA decay time constant. Defaults to 2000.
             updates (int, optional): Initial number of updates. Defaults to 0.
+            every (int, optional): Update the EMA every n update calls. Defaults to 1.
+            device (str | torch.device, optional): Device to keep the EMA on, i.e. 'cpu'. Defaults to the model device.
         """
         self.ema = deepcopy(de_parallel(model)).eval()  # FP32 EMA
+        self.device = None if device is None else torch.device(device)
+        if self.device is not None:
+            self.ema.to(self.device)
         self.updates = updates  # number of EMA updates
+        self.every = max(int(every), 1)
         self.decay = lambda x: decay * (1 - math.exp(-x / tau))  # decay exponential ramp (to help early epochs)
         for p in self.ema.parameters():
             p.requires_grad_(False)
         self.enabled = True
+        self.pending = None
+        self._tensors = None  # cached (key, EMA tensors, model tensors, staging tensors)
+
+    def _flat(self, model):
+        """Return cached flat lists of floating point EMA, model and staging tensors, rebuilt after any conversion."""
+        model = de_parallel(model)
+        key = (id(model), next(model.parameters()).data_ptr(), next(self.ema.parameters()).data_ptr())
+        if self._tensors is None or self._tensors[0] != key:
+            esd, msd = self.ema.state_dict(), model.state_dict()
+            keys = [k for k, v in esd.items() if v.dtype.is_floating_point]  # true for FP16 and FP32
+            ema, src = [esd[k] for k in keys], [msd[k].detach() for k in keys]
+            staging = None
+            if self.device is not None and src and src[0].device != self.device:  # EMA on another device
+                pin = self.device.type == "cpu" and src[0].is_cuda
+                staging = [torch.empty(x.shape, dtype=x.dtype, device=self.device, pin_memory=pin) for x in src]
+            self._tensors = key, ema, src, staging
+        return self._tensors[1:]
 
     def update(self, model):
         """
@@ -664,14 +697,33 @@ class ModelEMA:
         """
         if self.enabled:
             self.updates += 1
-            d = self.decay(self.updates)
-
-            msd = de_parallel(model).state_dict()  # model state_dict
-            for k, v in self.ema.state_dict().items():
-                if v.dtype.is_floating_point:  # true for FP16 and FP32
-                    v *= d
-                    v += (1 - d) * msd[k].detach()
-                    # assert v.dtype == msd[k].dtype == torch.float32, f'{k}: EMA {v.dtype},  model {msd[k].dtype}'
+            if self.updates % self.every:
+                return
+            d = self.decay(self.updates) ** self.every  # decay compounded over the steps since the last update
+
+            self.flush()
+            ema, src, staging = self._flat(model)
+            if staging is None:
+                torch._foreach_mul_(ema, d)
+                torch._foreach_add_(ema, src, alpha=1 - d)
+            else:  # copy asynchronously and apply at the next update or flush
+                for x, y in zip(staging, src):
+                    x.copy_(y, non_blocking=True)
+                event = None
+                if src[0].is_cuda:
+                    event = torch.cuda.Event()
+                    event.record()
+                self.pending = d, event
+
+    def flush(self):
+        """Apply a pending asynchronous update so that the EMA on another device is up to date."""
+        if self.pending is not None:
+            (d, event), self.pending = self.pending, None
+            if event is not None:
+                event.synchronize()
+            _, ema, _, staging = self._tensors
+            torch._foreach_mul_(ema, d)
+            torch._foreach_add_(ema, staging, alpha=1 - d)
 
     def update_attr(self, model, include=(), exclude=("process_group", "reducer")):
         """
@@ -764,6 +816,109 @@ def convert_optimizer_state_dict_to_fp16(state_dict):
     return state_dict
 
 
+class CheckpointWriter:
+    """
+    Asynchronous checkpoint writer that serializes and writes checkpoints in a background thread.
+
+    Saving first snapshots all tensors of the checkpoint into reusable CPU buffers, pinned when copying from CUDA so the
+    copies run asynchronously, with float32 tensors stored as FP16 like `convert_optimizer_state_dict_to_fp16`.
+    Modules are snapshotted into a cached FP16 CPU copy of the module. Serialization and file writes then run in a
+    background thread, and every file is written to a temporary path and atomically renamed into place. At most one
+    save is in flight, a new save first waits for the previous one to finish.
+
+    Attributes:
+        buffers (dict): Reusable CPU snapshot tensors and modules keyed by their path in the checkpoint.
+        thread (threading.Thread | None): Background thread of the save in flight.
+        error (Exception | None): Exception raised by the last background save, re-raised by `wait`.
+        saves (int): Number of saves started.
+        stall (float): Total seconds the calling thread was blocked by `save`.
+
+    Examples:
+        >>> writer = CheckpointWriter()
+        >>> writer.save({"model": model, "epoch": 3}, ["last.pt", "epoch3.pt"])
+        >>> writer.wait()  # flush before reading the files
+    """
+
+    def __init__(self):
+        """Initialize the checkpoint writer without a save in flight."""
+        self.buffers = {}
+        self.thread = None
+        self.error = None
+        self.saves = 0
+        self.stall = 0.0
+
+    def save(self, ckpt, files):
+        """
+        Snapshot a checkpoint and write it to one or more files in a background thread.
+
+        Args:
+            ckpt (dict): Checkpoint to save. Containers are copied, tensors and modules are snapshotted, other values
+                are saved as they are and should not be modified afterwards.
+            files (List[str | Path]): Files to write the serialized checkpoint to.
+        """
+        t = time.time()
+        self.wait()
+        ckpt = self._snapshot(ckpt, ())
+        event = None
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            event = torch.cuda.Event()
+            event.record()  # the background thread waits for the device to host copies
+        self.thread = threading.Thread(target=self._write, args=(ckpt, [Path(f) for f in files], event))
+        self.thread.start()  # not a daemon, so the interpreter flushes the save on exit
+        self.saves += 1
+        self.stall += time.time() - t
+
+    def wait(self):
+        """Block until the save in flight has been written, re-raising any exception from the background thread."""
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _snapshot(self, x, key):
+        """Return a copy of 'x' with tensors and modules copied into the CPU buffer registered under 'key'."""
+        if isinstance(x, nn.Module):
+            m = self.buffers.get(key)
+            if m is None:
+                m = self.buffers[key] = deepcopy(x).cpu().half()
+                if next(x.parameters()).is_cuda:
+                    m._apply(lambda t: t.pin_memory())
+            for dst, src in zip(m.state_dict().values(), x.state_dict().values()):
+                dst.copy_(src, non_blocking=True)
+            copy_attr(m, x)  # attributes updated during training, i.e. 'names' and 'args'
+            return m
+        if isinstance(x, torch.Tensor):
+            dtype = torch.float16 if x.dtype is torch.float32 and key[-1:] != ("step",) else x.dtype
+            buf = self.buffers.get(key)
+            if buf is None or buf.shape != x.shape or buf.dtype != dtype:
+                buf = self.buffers[key] = torch.empty(x.shape, dtype=dtype, pin_memory=x.is_cuda)
+            return buf.copy_(x.detach(), non_blocking=True)
+        if isinstance(x, dict):
+            return {k: self._snapshot(v, key + (k,)) for k, v in x.items()}
+        if isinstance(x, (list, tuple)):
+            return type(x)(self._snapshot(v, key + (i,)) for i, v in enumerate(x))
+        return x
+
+    def _write(self, ckpt, files, event):
+        """Serialize 'ckpt' once and atomically write it to all 'files'."""
+        import io
+
+        try:
+            if event is not None:
+                event.synchronize()
+            buffer = io.BytesIO()
+            torch.save(ckpt, buffer)
+            serialized_ckpt = buffer.getvalue()
+            for f in files:
+                tmp = f.with_name(f"{f.name}.tmp")
+                tmp.write_bytes(serialized_ckpt)
+                os.replace(tmp, f)  # atomic, readers never see a partial checkpoint
+        except Exception as e:
+            self.error = e
+
+
 @contextmanager
 def cuda_memory_usage(device=None):
     """